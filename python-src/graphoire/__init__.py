@@ -5,7 +5,7 @@ Created on Sun Feb 21 10:22:57 2021
 
 @author: mathaes
 """
-__all__ = ["graph", "graphfactory", "digraph", "digraphfactory", "embedding", "block", "component", "labels", "numbers", "tree"]
+__all__ = ["graph", "graphfactory", "digraph", "digraphfactory", "embedding", "block", "component", "labels", "numbers", "tree", "unionfind", "adjacencyindex", "distance", "traversal"]
 from graphoire.graph import Graph
 from graphoire.graphfactory import GraphFactory
 
@@ -44,11 +44,5 @@ Things that would be interesting to implement:
     - create a DeBruijn graph with symbolic labels
     - efficiently find all leaves in an acyclic (or other) graph
     - find minimum-length path from u to v
-    - return distance from u to v (length of min-length path)
-    - find diameter of G
-    - find eccentricity of vertex in G
-    - find radius (min eccentricity) of G
-    - find center of G (induced on vertices of min eccentricity)
-    - find the Wiener index of a graph
     - 
 """
\ No newline at end of file
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:02:17 2026
+
+@author: mathaes
+"""
+
+import numpy as np
+
+class AdjacencyIndex:
+    """
+    AdjacencyIndex is a compressed-sparse-row (CSR) view of an edge list,
+    for algorithms that need to walk neighborhoods many times.
+
+    The neighbors of vertex v are indices[indptr[v]:indptr[v+1]], in
+    ascending order. The parallel edge_ids array holds, for every entry
+    (or 'slot'), the position in the source edge list of the edge that
+    produced it, so per-edge data can be looked up or laid out per slot.
+
+    An index is built for one direction: 'out' lists edge[1] as a neighbor
+    of edge[0], 'in' lists edge[0] as a neighbor of edge[1], and 'both'
+    does both (each edge fills two slots). Undirected graphs always use
+    'both'. See Graph.adjacencyIndex() for the cached per-graph index.
+    """
+
+    def fromEdgeArray(n: int, edges, direction='both'):
+        """
+        Build an index over vertices [0, n-1] from an (m, 2) edge array.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        edgeIds = np.arange(len(edges), dtype=np.int64)
+        if direction == 'out':
+            src, dst, ids = edges[:, 0], edges[:, 1], edgeIds
+        elif direction == 'in':
+            src, dst, ids = edges[:, 1], edges[:, 0], edgeIds
+        elif direction == 'both':
+            src = np.concatenate((edges[:, 0], edges[:, 1]))
+            dst = np.concatenate((edges[:, 1], edges[:, 0]))
+            ids = np.concatenate((edgeIds, edgeIds))
+        else:
+            raise Exception(f"Unknown adjacency direction '{direction}'")
+
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return AdjacencyIndex(n, indptr, dst[order], ids[order], direction)
+
+    def __init__(self, n, indptr, indices, edge_ids, direction='both'):
+        self.n = n
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids
+        self.direction = direction
+
+    def __repr__(self):
+        return f"AdjacencyIndex .n={self.n} .direction={self.direction} .slots={len(self.indices)}"
+
+    def degrees(self):
+        """
+        Return an array with the number of neighbor slots of every vertex.
+        """
+        return np.diff(self.indptr)
+
+    def neighbors(self, vertex):
+        """
+        Return the neighbors of one vertex as an array view.
+        """
+        return self.indices[self.indptr[vertex]:self.indptr[vertex+1]]
+
+    def expand(self, vertices):
+        """
+        Gather the neighborhoods of many vertices at once.
+
+        Parameters
+        ----------
+        vertices : numpy integer array
+            The vertices to expand.
+
+        Returns
+        -------
+        A tuple (sources, slots): for every neighbor slot of every vertex
+        given, the vertex it belongs to and its position in the index
+        arrays, so indices[slots] are the neighbors themselves and
+        edge_ids[slots] their edges.
+        """
+        vertices = np.asarray(vertices, dtype=np.int64)
+        starts = self.indptr[vertices]
+        counts = self.indptr[vertices + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        ends = np.cumsum(counts)
+        slots = np.arange(total, dtype=np.int64) + np.repeat(starts - (ends - counts), counts)
+        return np.repeat(vertices, counts), slots
@@ -5,9 +5,13 @@ Created on Wed Mar 24 12:43:31 2021
 
 @author: Christopher Corbell
 """
-__all__ = ["dijkstra", "fordfulkerson", "galeshapley", "prufer", "welshpowell"]
+__all__ = ["bellmanford", "contraction", "deltastepping", "dijkstra", "floydwarshall", "fordfulkerson", "galeshapley", "prufer", "welshpowell"]
 
+from graphoire.algorithm.bellmanford import *
+from graphoire.algorithm.contraction import *
+from graphoire.algorithm.deltastepping import *
 from graphoire.algorithm.dijkstra import *
+from graphoire.algorithm.floydwarshall import *
 from graphoire.algorithm.fordfulkerson import *
 from graphoire.algorithm.galeshapley import *
 from graphoire.algorithm.prufer import *
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 18:40:26 2026
+
+@author: mathaes
+
+graphoire.algorithm.contraction builds contraction hierarchies for fast
+repeated least-cost path queries on graphs whose edges and weights do
+not change.
+
+Preprocessing contracts the vertices one at a time, least important
+first. Contracting v removes it from the remaining graph and, for each
+pair of remaining neighbors u -> v -> w, adds a shortcut edge u -> w
+unless a witness search finds another path from u to w that is no more
+costly. The position at which v is contracted is its rank. Every least-cost
+path then has an equally cheap counterpart that climbs to higher ranks
+and then descends, so a query is a bidirectional Dijkstra that only
+follows edges toward higher ranks from both ends. Such a query settles a
+small neighborhood instead of a large part of the graph.
+"""
+
+from graphoire.graph import Graph
+
+import heapq
+import math
+import time
+
+import numpy as np
+
+class ContractionHierarchy:
+    """
+    A contraction hierarchy of a Graph or Digraph, with its preprocessing
+    state and query engine.
+
+    Parameters
+    ----------
+    G : Graph
+        The graph; its adjacencyWeights() are the edge costs, which must
+        not be negative.
+    witnessLimit : int, optional
+        The maximum number of vertices a witness search may settle. A
+        search that gives up adds a shortcut that may not be needed,
+        which costs space but never correctness. The default is 64.
+
+    Behavior
+    --------
+    Construction only sets up the remaining graph. contract() does the
+    preprocessing. It can be given a vertex count or time limit and called
+    again to continue, and save() stores the state at any point, so long
+    preprocessing runs can be resumed with ContractionHierarchy.load().
+    fromGraph() does all of it in one call.
+
+    Vertices are ordered by the lazy-update heuristic: a vertex's priority
+    is twice the number of shortcuts its contraction would add, minus the
+    number of edges it would remove, plus the number of its neighbors
+    already contracted and its depth (one more than the deepest
+    contracted neighbor). The last two terms spread contraction evenly
+    through the graph and keep the hierarchy shallow. The popped vertex's
+    priority is recomputed, and it is pushed back if it is no longer the
+    smallest.
+
+    Once every vertex is contracted, the hierarchy is stored as two CSR
+    arrays over the vertices: up (edges x -> w with rank[w] > rank[x])
+    and down (edges u -> x with rank[u] > rank[x], listed at x). Each
+    edge has a weight and a middle vertex (-1 for an original edge; v for
+    a shortcut made by contracting v). Queries use those arrays and do
+    not need the graph.
+    """
+
+    def fromGraph(G: Graph, witnessLimit=64):
+        """
+        Build and return the complete contraction hierarchy of G.
+        """
+        hierarchy = ContractionHierarchy(G, witnessLimit)
+        hierarchy.contract()
+        return hierarchy
+
+    def __init__(self, G: Graph, witnessLimit=64):
+        self.n = G.order()
+        self.witnessLimit = witnessLimit
+        self.fingerprint = G.fingerprint()
+        self.rank = [-1] * self.n
+        self.level = 0
+        self.deleted = [0] * self.n
+        self.depth = [0] * self.n
+        # edges recorded when a vertex is contracted: at x, upward edges
+        # x -> w and downward edges u -> x, as {other: (weight, middle)}
+        self.upEdges = {}
+        self.downEdges = {}
+        # the remaining graph, as out- and in-adjacency dicts
+        self.outEdges = [{} for v in range(0, self.n)]
+        self.inEdges = [{} for v in range(0, self.n)]
+        index = G.adjacencyIndex('out')
+        weights = G.adjacencyWeights('out')
+        if len(weights) > 0 and weights.min() < 0:
+            raise Exception("Contraction hierarchies need non-negative edge weights")
+        indptr = index.indptr.tolist()
+        indices = index.indices.tolist()
+        weights = weights.tolist()
+        for u in range(0, self.n):
+            for slot in range(indptr[u], indptr[u + 1]):
+                self.addEdge(u, indices[slot], weights[slot], -1)
+        self.queue = None
+        self.query = None
+        self.middles = None
+        self.settledCount = 0
+
+    def __repr__(self):
+        return f"ContractionHierarchy .n={self.n} .contracted={self.level} .shortcuts={self.shortcutCount()}"
+
+    def addEdge(self, u, w, weight, middle):
+        """
+        Add u -> w to the remaining graph, keeping the cheaper of any
+        existing parallel edge. Loops are dropped.
+        """
+        if u == w:
+            return
+        existing = self.outEdges[u].get(w)
+        if None == existing or weight < existing[0]:
+            self.outEdges[u][w] = (weight, middle)
+            self.inEdges[w][u] = (weight, middle)
+
+    def isComplete(self):
+        return self.level == self.n
+
+    def shortcutCount(self):
+        count = 0
+        for edges in (self.upEdges, self.downEdges):
+            for recorded in edges.values():
+                count += sum(1 for weight, middle in recorded.values() if middle >= 0)
+        for edges in self.outEdges:
+            count += sum(1 for weight, middle in edges.values() if middle >= 0)
+        return count
+
+    # ------------------------------ preprocessing
+
+    def witnessCosts(self, u, excluded, targets, maxCost):
+        """
+        Run a Dijkstra search from u in the remaining graph, skipping the
+        vertex being contracted. It stops once every target is settled,
+        the cost passes maxCost or witnessLimit vertices are settled, and
+        it returns the costs found.
+        """
+        costs = {u: 0}
+        heap = [(0, u)]
+        remaining = len(targets)
+        settled = 0
+        done = set()
+        while len(heap) > 0 and remaining > 0 and settled < self.witnessLimit:
+            cost, x = heapq.heappop(heap)
+            if x in done:
+                continue
+            if cost > maxCost:
+                break
+            done.add(x)
+            settled += 1
+            if x in targets:
+                remaining -= 1
+            for y, (weight, middle) in self.outEdges[x].items():
+                if y == excluded:
+                    continue
+                newCost = cost + weight
+                if newCost < costs.get(y, math.inf):
+                    costs[y] = newCost
+                    heapq.heappush(heap, (newCost, y))
+        return costs
+
+    def findShortcuts(self, v):
+        """
+        Return the shortcuts that contracting v would add, as a list of
+        (u, w, weight) triples.
+        """
+        shortcuts = []
+        outgoing = self.outEdges[v]
+        if len(outgoing) == 0:
+            return shortcuts
+        for u, (inWeight, inMiddle) in self.inEdges[v].items():
+            targets = set(w for w in outgoing if w != u)
+            if len(targets) == 0:
+                continue
+            maxCost = inWeight + max(outgoing[w][0] for w in targets)
+            costs = self.witnessCosts(u, v, targets, maxCost)
+            for w in targets:
+                viaCost = inWeight + outgoing[w][0]
+                if costs.get(w, math.inf) > viaCost:
+                    shortcuts.append((u, w, viaCost))
+        return shortcuts
+
+    def priority(self, v):
+        shortcuts = self.findShortcuts(v)
+        removed = len(self.outEdges[v]) + len(self.inEdges[v])
+        return 2 * len(shortcuts) - removed + self.deleted[v] + self.depth[v], shortcuts
+
+    def contractVertex(self, v, shortcuts):
+        self.rank[v] = self.level
+        self.level += 1
+        self.upEdges[v] = dict(self.outEdges[v])
+        self.downEdges[v] = dict(self.inEdges[v])
+        neighbors = set(self.outEdges[v]) | set(self.inEdges[v])
+        for w in self.outEdges[v]:
+            del self.inEdges[w][v]
+        for u in self.inEdges[v]:
+            del self.outEdges[u][v]
+        self.outEdges[v] = {}
+        self.inEdges[v] = {}
+        for u, w, weight in shortcuts:
+            self.addEdge(u, w, weight, v)
+        for neighbor in neighbors:
+            self.deleted[neighbor] += 1
+            self.depth[neighbor] = max(self.depth[neighbor], self.depth[v] + 1)
+        return neighbors
+
+    def contract(self, maxVertices=None, timeLimit=None):
+        """
+        Contract vertices until all are contracted, maxVertices more have
+        been contracted, or timeLimit seconds have passed. Return True
+        once the hierarchy is complete; call again to continue otherwise.
+        """
+        started = time.time()
+        if None == self.queue:
+            self.queue = []
+            for v in range(0, self.n):
+                if self.rank[v] < 0:
+                    heapq.heappush(self.queue, (self.priority(v)[0], v))
+        count = 0
+        queue = self.queue
+        while len(queue) > 0:
+            if None != maxVertices and count >= maxVertices:
+                break
+            if None != timeLimit and time.time() - started > timeLimit:
+                break
+            oldPriority, v = heapq.heappop(queue)
+            if self.rank[v] >= 0:
+                continue
+            newPriority, shortcuts = self.priority(v)
+            if len(queue) > 0 and newPriority > queue[0][0]:
+                heapq.heappush(queue, (newPriority, v))
+                continue
+            neighbors = self.contractVertex(v, shortcuts)
+            count += 1
+            for neighbor in neighbors:
+                heapq.heappush(queue, (self.priority(neighbor)[0], neighbor))
+        if self.isComplete():
+            self.outEdges = [{} for v in range(0, self.n)]
+            self.inEdges = [{} for v in range(0, self.n)]
+            self.queue = []
+        return self.isComplete()
+
+    # ------------------------------ compact arrays
+
+    def recordedArrays(self, edges):
+        """
+        Return recorded edges as (vertex, other, weight, middle) arrays,
+        sorted by vertex.
+        """
+        rows = [(x, other, weight, middle)
+                for x in sorted(edges) for other, (weight, middle) in sorted(edges[x].items())]
+        if len(rows) == 0:
+            return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                    np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int64))
+        vertex, other, weight, middle = zip(*rows)
+        return (np.array(vertex, dtype=np.int64), np.array(other, dtype=np.int64),
+                np.array(weight, dtype=np.float64), np.array(middle, dtype=np.int64))
+
+    def hierarchyArrays(self, edges):
+        """
+        Return recorded edges as CSR arrays (indptr, indices, weights,
+        middles) over all vertices.
+        """
+        vertex, other, weight, middle = self.recordedArrays(edges)
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(vertex, minlength=self.n), out=indptr[1:])
+        return indptr, other, weight, middle
+
+    def queryArrays(self):
+        """
+        Return the up and down CSR arrays as Python lists for the query
+        engine, building them on first use.
+        """
+        if not self.isComplete():
+            raise Exception(f"Contraction hierarchy is incomplete ({self.level} of {self.n} vertices contracted)")
+        if None == self.query:
+            self.query = tuple(tuple(array.tolist() for array in self.hierarchyArrays(edges))
+                               for edges in (self.upEdges, self.downEdges))
+        return self.query
+
+    # ------------------------------ queries
+
+    def search(self, s, t):
+        """
+        Run the bidirectional upward search between s and t. Returns
+        (cost, meet, forwardParents, backwardParents), where the parent
+        dicts map a vertex to (previous vertex, middle) along its search.
+        """
+        up, down = self.queryArrays()
+        self.settledCount = 0
+        if s == t:
+            return 0, s, {}, {}
+        searches = [(up, {s: 0}, {}, [(0, s)], set()), (down, {t: 0}, {}, [(0, t)], set())]
+        best = math.inf
+        meet = -1
+        side = 0
+        while len(searches[0][3]) > 0 or len(searches[1][3]) > 0:
+            tops = [search[3][0][0] if len(search[3]) > 0 else math.inf for search in searches]
+            if min(tops) >= best:
+                break
+            side = 0 if tops[0] <= tops[1] else 1
+            (indptr, indices, weights, middles), costs, parents, heap, done = searches[side]
+            otherCosts = searches[1 - side][1]
+            cost, x = heapq.heappop(heap)
+            if x in done:
+                continue
+            done.add(x)
+            self.settledCount += 1
+            if x in otherCosts and cost + otherCosts[x] < best:
+                best = cost + otherCosts[x]
+                meet = x
+            for slot in range(indptr[x], indptr[x + 1]):
+                y = indices[slot]
+                newCost = cost + weights[slot]
+                if newCost < costs.get(y, math.inf):
+                    costs[y] = newCost
+                    parents[y] = (x, middles[slot])
+                    heapq.heappush(heap, (newCost, y))
+                    if y in otherCosts and newCost + otherCosts[y] < best:
+                        best = newCost + otherCosts[y]
+                        meet = y
+        return best, meet, searches[0][2], searches[1][2]
+
+    def findLeastCost(self, s, t):
+        """
+        Return the least cost of a path from s to t, or math.inf if there
+        is none.
+        """
+        return self.search(s, t)[0]
+
+    def findLeastCostPath(self, s, t):
+        """
+        Return a least-cost path from s to t as a vertex list, with
+        shortcuts unpacked into original edges, or None if t is not
+        reachable from s.
+        """
+        cost, meet, forwardParents, backwardParents = self.search(s, t)
+        if math.inf == cost:
+            return None
+        path = [meet]
+        vertex = meet
+        while vertex != s:
+            previous, middle = forwardParents[vertex]
+            path[:0] = self.unpackEdge(previous, vertex, middle)[:-1]
+            vertex = previous
+        vertex = meet
+        while vertex != t:
+            following, middle = backwardParents[vertex]
+            path.extend(self.unpackEdge(vertex, following, middle)[1:])
+            vertex = following
+        return path
+
+    def edgeMiddle(self, u, w):
+        """
+        Return the middle vertex of hierarchy edge u -> w (-1 for an
+        original edge), using a dict over all hierarchy edges built on
+        first use.
+        """
+        if None == self.middles:
+            self.middles = {}
+            for x, recorded in self.upEdges.items():
+                for w2, (weight, middle) in recorded.items():
+                    self.middles[(x, w2)] = middle
+            for x, recorded in self.downEdges.items():
+                for u2, (weight, middle) in recorded.items():
+                    self.middles[(u2, x)] = middle
+        return self.middles[(u, w)]
+
+    def unpackEdge(self, u, w, middle):
+        """
+        Return the original-graph vertex list for hierarchy edge u -> w
+        with the given middle vertex. A shortcut made by contracting v
+        stands for u -> v -> w, whose two halves were recorded at v.
+        """
+        path = [u]
+        stack = [(u, w, middle)]
+        while len(stack) > 0:
+            a, b, m = stack.pop()
+            if m < 0:
+                path.append(b)
+                continue
+            stack.append((m, b, self.edgeMiddle(m, b)))
+            stack.append((a, m, self.edgeMiddle(a, m)))
+        return path
+
+    # ------------------------------ serialization
+
+    def save(self, path):
+        """
+        Save the hierarchy, complete or not, to a .npz file (e.g. next to
+        the graph file), with the fingerprint of the graph it was built
+        for. An incomplete hierarchy keeps its remaining graph, so
+        contract() can resume after load().
+        """
+        arrays = {'rank': np.array(self.rank, dtype=np.int64),
+                  'deleted': np.array(self.deleted, dtype=np.int64),
+                  'depth': np.array(self.depth, dtype=np.int64),
+                  'witnessLimit': np.array(self.witnessLimit),
+                  'fingerprint': np.array(self.fingerprint)}
+        remaining = {u: edges for u, edges in enumerate(self.outEdges) if len(edges) > 0}
+        for name, edges in (('up', self.upEdges), ('down', self.downEdges), ('remaining', remaining)):
+            vertex, other, weight, middle = self.recordedArrays(edges)
+            arrays[name + 'Vertex'] = vertex
+            arrays[name + 'Other'] = other
+            arrays[name + 'Weight'] = weight
+            arrays[name + 'Middle'] = middle
+        np.savez_compressed(path, **arrays)
+
+    def load(path, G: Graph = None):
+        """
+        Load a hierarchy saved by save(). If G is given, raise an
+        Exception unless it was built for this graph.
+        """
+        with np.load(path) as data:
+            fingerprint = str(data['fingerprint'])
+            if None != G and fingerprint != G.fingerprint():
+                raise Exception(f"Contraction hierarchy in {path} was built for a different graph")
+            hierarchy = ContractionHierarchy.__new__(ContractionHierarchy)
+            hierarchy.n = len(data['rank'])
+            hierarchy.witnessLimit = int(data['witnessLimit'])
+            hierarchy.fingerprint = fingerprint
+            hierarchy.rank = data['rank'].tolist()
+            hierarchy.level = sum(1 for r in hierarchy.rank if r >= 0)
+            hierarchy.deleted = data['deleted'].tolist()
+            hierarchy.depth = data['depth'].tolist()
+            hierarchy.outEdges = [{} for v in range(0, hierarchy.n)]
+            hierarchy.inEdges = [{} for v in range(0, hierarchy.n)]
+            tables = {}
+            for name in ('up', 'down', 'remaining'):
+                table = {}
+                columns = [data[name + key].tolist() for key in ('Vertex', 'Other', 'Weight', 'Middle')]
+                for x, other, weight, middle in zip(*columns):
+                    if name == 'remaining':
+                        hierarchy.addEdge(x, other, weight, middle)
+                    else:
+                        table.setdefault(x, {})[other] = (weight, middle)
+                tables[name] = table
+            hierarchy.upEdges = tables['up']
+            hierarchy.downEdges = tables['down']
+            hierarchy.queue = None
+            hierarchy.query = None
+            hierarchy.middles = None
+            hierarchy.settledCount = 0
+            return hierarchy
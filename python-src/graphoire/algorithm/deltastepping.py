@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 11:05:48 2026
+
+@author: mathaes
+
+graphoire.algorithm.deltastepping is a single-source least-cost search
+(delta-stepping) that relaxes whole batches of edges with NumPy instead
+of one vertex at a time, and can shard each batch across a thread or
+process pool.
+"""
+
+from graphoire.graph import Graph
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import math
+
+import numpy as np
+
+def splitIndex(indptr, indices, weights, light):
+    """
+    Return the CSR arrays (indptr, indices, weights) of the slots
+    selected by the boolean mask light.
+    """
+    part = np.zeros(len(light) + 1, dtype=np.int64)
+    np.cumsum(light, out=part[1:])
+    return part[indptr], indices[light], weights[light]
+
+def gatherEdges(frontier, indptr, indices, weights):
+    """
+    Return (tails, heads, weights) for every slot of the frontier
+    vertices in the given CSR arrays.
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=weights.dtype)
+    ends = np.cumsum(counts)
+    slots = np.repeat(starts - ends + counts, counts) + np.arange(0, total)
+    return np.repeat(frontier, counts), indices[slots], weights[slots]
+
+def relaxChunk(tails, tailCosts, weights, heads):
+    """
+    Return the best candidate per head vertex in one chunk of edges, as
+    (heads, candidates, tails) with each head once. This is the unit of
+    work sent to pool workers.
+    """
+    candidates = tailCosts + weights
+    order = np.lexsort((candidates, heads))
+    heads = heads[order]
+    first = np.ones(len(heads), dtype=bool)
+    first[1:] = heads[1:] != heads[:-1]
+    return heads[first], candidates[order][first], tails[order][first]
+
+class DeltaStepping:
+    """
+    Delta-stepping single-source least costs.
+
+    Parameters
+    ----------
+    G : Graph
+        Edge weights (adjacencyWeights('out')) must not be negative.
+    delta : float, optional
+        The bucket width. Edges of weight at most delta are light and are
+        relaxed repeatedly within a bucket; heavier edges are relaxed once
+        per bucket. A small delta approaches Dijkstra (many small
+        buckets), a large one approaches Bellman-Ford (few buckets with
+        many rounds). The default is the mean edge weight.
+    workers : int, optional
+        If greater than 1, each batch of edges large enough to be worth
+        it (at least chunkSize edges) is split into chunks relaxed in a
+        pool of this many workers. The default is 1.
+    pool : str, optional
+        'thread' (the default) or 'process'.
+    chunkSize : int, optional
+        The minimum number of edges per pool task. The default is 65536.
+
+    Behavior
+    --------
+    Vertices are grouped into buckets of cost width delta. The lowest
+    non-empty bucket is emptied by relaxing the light edges of all its
+    vertices at once (one gather and one np.minimum.at per round), until
+    no vertex re-enters the bucket. Then the heavy edges of every vertex
+    removed from the bucket are relaxed once. Every vertex is settled
+    with its least cost, as with Dijkstra, and parents record a least-cost
+    tree.
+
+    With a pool, workers reduce their chunk to the best candidate per
+    head vertex (relaxChunk()) and the main thread merges the results,
+    so the shared cost array is only written by one thread. Threads
+    share the arrays. Processes receive each chunk pickled, which only
+    pays off for very large batches.
+    """
+    def __init__(self, G: Graph, delta=None, workers=1, pool='thread', chunkSize=65536):
+        if pool != 'thread' and pool != 'process':
+            raise Exception(f"Unknown pool kind '{pool}'")
+        self.graph = G
+        index = G.adjacencyIndex('out')
+        weights = G.adjacencyWeights('out').astype(np.float64)
+        if len(weights) > 0 and weights.min() < 0:
+            raise Exception("Delta-stepping needs non-negative edge weights")
+        if None == delta:
+            delta = float(weights.mean()) if len(weights) > 0 else 1.0
+        if delta <= 0:
+            delta = 1.0
+        self.delta = delta
+        self.workers = workers
+        self.pool = pool
+        self.chunkSize = chunkSize
+        light = weights <= delta
+        self.light = splitIndex(index.indptr, index.indices, weights, light)
+        self.heavy = splitIndex(index.indptr, index.indices, weights, ~light)
+        self.costs = None
+        self.parents = None
+        self.bucketCount = 0
+        self.roundCount = 0
+
+    def __repr__(self):
+        return f"DeltaStepping .delta={self.delta} .workers={self.workers} .pool={self.pool}"
+
+    def relax(self, frontier, arrays, executor):
+        """
+        Relax the edges of the frontier vertices in one CSR part (light
+        or heavy); return the vertices whose cost improved.
+        """
+        tails, heads, weights = gatherEdges(frontier, *arrays)
+        if len(heads) == 0:
+            return heads
+        costs = self.costs
+        tailCosts = costs[tails]
+        if None == executor or len(heads) < 2 * self.chunkSize:
+            results = [relaxChunk(tails, tailCosts, weights, heads)]
+        else:
+            chunks = max(2, min(self.workers, len(heads) // self.chunkSize))
+            bounds = np.linspace(0, len(heads), chunks + 1).astype(np.int64)
+            futures = [executor.submit(relaxChunk, tails[a:b], tailCosts[a:b], weights[a:b], heads[a:b])
+                       for a, b in zip(bounds[:-1], bounds[1:])]
+            results = [future.result() for future in futures]
+        heads = np.concatenate([result[0] for result in results])
+        candidates = np.concatenate([result[1] for result in results])
+        tails = np.concatenate([result[2] for result in results])
+        before = costs[heads]
+        np.minimum.at(costs, heads, candidates)
+        improving = (candidates < before) & (candidates == costs[heads])
+        self.parents[heads[improving]] = tails[improving]
+        return np.unique(heads[improving])
+
+    def findAllLeastCosts(self, s):
+        """
+        Run the search from s. Returns (costs, parents): a float64 array
+        of least costs (math.inf where unreachable) and an int64 parent
+        array (-1 for s and unreached vertices); both are also kept as
+        .costs and .parents.
+        """
+        n = self.graph.order()
+        self.costs = np.full(n, math.inf)
+        self.parents = np.full(n, -1, dtype=np.int64)
+        self.costs[s] = 0
+        self.bucketCount = 0
+        self.roundCount = 0
+        pending = np.zeros(n, dtype=bool)
+        pending[s] = True
+        executor = None
+        if self.workers > 1:
+            executor = (ThreadPoolExecutor if self.pool == 'thread' else ProcessPoolExecutor)(self.workers)
+        try:
+            while True:
+                candidates = np.flatnonzero(pending)
+                if len(candidates) == 0:
+                    break
+                bucket = math.floor(self.costs[candidates].min() / self.delta)
+                bucketEnd = (bucket + 1) * self.delta
+                frontier = candidates[self.costs[candidates] < bucketEnd]
+                removed = []
+                while len(frontier) > 0:
+                    self.roundCount += 1
+                    pending[frontier] = False
+                    removed.append(frontier)
+                    improved = self.relax(frontier, self.light, executor)
+                    pending[improved] = True
+                    frontier = improved[self.costs[improved] < bucketEnd]
+                improved = self.relax(np.unique(np.concatenate(removed)), self.heavy, executor)
+                pending[improved] = True
+                self.bucketCount += 1
+        finally:
+            if None != executor:
+                executor.shutdown()
+        return self.costs, self.parents
+
+    def getPath(self, t):
+        """
+        Return the least-cost path from the last source to t as a vertex
+        list, or None if t was not reached.
+        """
+        if math.inf == self.costs[t]:
+            return None
+        path = [int(t)]
+        while self.parents[path[-1]] >= 0:
+            path.append(int(self.parents[path[-1]]))
+        path.reverse()
+        return path
+
+def deltaStepping(G: Graph, s, delta=None, workers=1, pool='thread'):
+    """
+    Return (costs, parents) arrays of least costs from s, computed by
+    DeltaStepping; see there for the parameters.
+    """
+    return DeltaStepping(G, delta, workers, pool).findAllLeastCosts(s)
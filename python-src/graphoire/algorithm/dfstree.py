@@ -6,13 +6,16 @@ Created on Fri Apr 23 14:17:47 2021
 @author: mathaes
 """
 
+import numpy as np
+
 from graphoire.graph import Graph
+from graphoire.traversal import Traversal
 
 class DFSTreeVisitor:
     def __init__(self):
         self.stopSearch = False
         self.nextVertex = None
-        
+
     def visit(self, G: Graph, vertex, neighbors):
         # override to change this selection behavior or
         # to implement conditions to stop the search
@@ -20,26 +23,129 @@ class DFSTreeVisitor:
             self.nextVertex = neighbors[0]
         else:
             self.nextVertex = None
-        
+
+def dfsTreeParents(G: Graph, start=None, visitor=None, direction='both', verbose=False):
+    """
+    Do a depth-first search from the start vertex and return the search
+    tree as a parent array.
+
+    Parameters
+    ----------
+    G : Graph
+    start : int, optional
+        The vertex from which to start. The default is 0.
+    visitor : DFSTreeVisitor, optional
+        The visitor to invoke during the search, as for dfstree().
+    direction : str, optional
+        For a Digraph, 'out' follows edges forward, 'in' backward and
+        'both' (the default, matching Graph.getNeighbors) ignores direction.
+        Undirected graphs always use 'both'.
+
+    Returns
+    -------
+    A tuple (parent, order) of numpy integer arrays: parent[v] is the
+    vertex from which v was discovered (-1 for the start vertex and for
+    vertices not reached) and order lists the reached vertices in
+    discovery order.
+
+    Behavior
+    --------
+    The default DFSTreeVisitor always takes the lowest unvisited neighbor,
+    which is exactly the order of a depth-first Traversal, so it is not
+    called: the tree is read from the traversal's 'tree' events in
+    O(n + m).
+
+    Any other visitor may pick any unvisited neighbor, which a Traversal
+    (scanning neighbor slots in order) cannot follow, so the search then
+    runs its own loop: a visited array, an explicit stack and, for every
+    vertex, its position in its neighbor list of the graph's
+    AdjacencyIndex, so every slot is still skipped over only once.
+    visit() is called each time a vertex with unvisited neighbors is on
+    top of the stack, with those neighbors (ascending) as a numpy array.
+    Building that list costs O(degree) per call. The visitor may choose
+    any of them via nextVertex, or set nextVertex to None to finish the
+    vertex early; setting stopSearch ends the search, and the tree found
+    so far is returned.
+    """
+    if None == start:
+        start = 0
+    n = G.order()
+    if start < 0 or start >= n:
+        raise Exception(f"Start vertex {start} is not in a graph of order {n}")
+    if None == visitor or type(visitor).visit is DFSTreeVisitor.visit:
+        traversal = Traversal(G, start, 'dfs', direction, events=['tree'])
+        order = [start]
+        for kind, vertex, nextVertex in traversal:
+            if verbose:
+                print(f"tree edge {vertex} -> {nextVertex}")
+            order.append(nextVertex)
+        return np.array(traversal.parent, dtype=np.int64), np.array(order, dtype=np.int64)
+
+    index = G.adjacencyIndex(direction)
+    indptr = index.indptr.tolist()
+    indices = index.indices.tolist()
+
+    visited = bytearray(n)
+    parent = [-1] * n
+    order = [start]
+    position = indptr[:-1]
+    visited[start] = 1
+    stack = [start]
+    while len(stack) > 0:
+        vertex = stack[-1]
+        slot = position[vertex]
+        end = indptr[vertex + 1]
+        while slot < end and visited[indices[slot]]:
+            slot += 1
+        position[vertex] = slot
+        if slot == end:
+            stack.pop()
+            continue
+
+        neighbors = index.indices[slot:end]
+        neighbors = neighbors[np.frombuffer(visited, dtype=np.uint8)[neighbors] == 0]
+        visitor.visit(G, vertex, neighbors)
+        if visitor.stopSearch:
+            break
+        nextVertex = visitor.nextVertex
+        if None == nextVertex:
+            position[vertex] = end
+            stack.pop()
+            continue
+        if not np.any(neighbors == nextVertex):
+            raise Exception(f"Visitor chose {nextVertex}, which is not an unvisited neighbor of {vertex}")
+        nextVertex = int(nextVertex)
+
+        if verbose:
+            print(f"tree edge {vertex} -> {nextVertex}")
+        visited[nextVertex] = 1
+        parent[nextVertex] = vertex
+        order.append(nextVertex)
+        stack.append(nextVertex)
+
+    return np.array(parent, dtype=np.int64), np.array(order, dtype=np.int64)
+
 def dfstree(G: Graph, start=None, visitor=None, verbose=False):
     """
     The dfstree method does a depth-first search to find a spanning
-    tree of the graph G starting at the indicated start vertex. 
+    tree of the graph G starting at the indicated start vertex.
     The spanning tree is returned as a set of edges.
-    
+
     Note that if G is not connected then the returned tree will only
     span the component which contains the start vertex.
-    
+
     An optional visitor object can be passed in. Its visit()
-    method is invoked each time a new vertex is visited. The visitor
-    make set a stop flag to signal the algorithm to stop and exit.
-    The visitor may also indicate which unvisited neighbor to
-    search next. If visitor is omitted, the
+    method is invoked when a vertex with unvisited neighbors is
+    explored. The visitor may set a stop flag to signal the algorithm
+    to stop and exit. The visitor may also indicate which unvisited
+    neighbor to search next. If visitor is omitted, the lowest unvisited
+    neighbor is searched next. See dfsTreeParents() for details; the
+    search is O(n + m).
 
     Parameters
     ----------
     G : Graph
-        DESCRIPTION.
+        The graph to search; a Digraph is searched ignoring direction.
     start : int, optional
         The vertex from which to start. The default is 0.
     visitor : DFSTreeVisitor, optional
@@ -48,79 +154,11 @@ def dfstree(G: Graph, start=None, visitor=None, verbose=False):
     Returns
     -------
     Edges, as a list of edge-lists, with each edge-list containing two vertex integer values.
+    Edges are listed in the order they were found, each with the lower vertex first.
 
     """
-    if None == start:
-        start = 0
-    if None == visitor:
-        visitor = DFSTreeVisitor()
-        
-    searchComplete = False
-    searchInterrupt = False
-    edges = []
-    
-    visitedVertices = []
-    skippedNeighbors = {}
-    
-    currentVertex = start
-    
-    
-    while not searchComplete and not searchInterrupt:
-        if verbose:
-            print (f"currentVertex: {currentVertex}")
-        allNeighbors = G.getNeighbors(currentVertex)
-        
-        unexploredNeighbors = []
-        for neighbor in allNeighbors:
-            if not neighbor in visitedVertices:
-                unexploredNeighbors.append(neighbor)
-                
-        nextNeighbor = None
-        if len(unexploredNeighbors) > 0:
-            
-            visitor.visit(G, currentVertex, unexploredNeighbors)
-            visitedVertices.append(currentVertex)
-            if currentVertex in skippedNeighbors:
-                skippedNeighbors.pop(currentVertex)
-                
-            searchInterrupt = visitor.stopSearch
-            nextNeighbor = visitor.nextVertex
-
-            if not searchInterrupt:
-                for unexplored in unexploredNeighbors:
-                    if unexplored != nextNeighbor:
-                        if not unexplored in skippedNeighbors:
-                            skippedEdge = [currentVertex, unexplored]
-                            skippedNeighbors[unexplored] = skippedEdge
-        else:
-            if verbose:
-                print (" - no unexplored neighbors")
-            visitedVertices.append(currentVertex)
-            
-        if searchInterrupt:
-            break
-        
-        if None == nextNeighbor:
-            if len(skippedNeighbors) > 0:
-                item = skippedNeighbors.popitem()
-                if verbose:
-                    print (f" - going back to unexplored edge {item[1]} for neighbor {item[0]}")
-                currentVertex = item[1][0]    
-            else:
-                currentVertex = None
-        else:
-            nextEdge = [currentVertex, nextNeighbor]
-            nextEdge.sort()
-            if verbose:
-                print(f"appending edge {nextEdge}")
-            if nextEdge in edges:
-                print ("ERROR: edge is already in results!")
-                break
-            
-            edges.append(nextEdge)
-            currentVertex = nextNeighbor 
-            
-        if None == currentVertex:
-            searchComplete = True
-
-    return edges
+    parent, order = dfsTreeParents(G, start, visitor, verbose=verbose)
+    children = order[1:]
+    edges = np.stack((parent[children], children), axis=1)
+    edges.sort(axis=1)
+    return edges.tolist()
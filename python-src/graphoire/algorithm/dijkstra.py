@@ -8,56 +8,217 @@ Created on Tue Sep 14 10:10:02 2021
 
 from graphoire.graph import Graph
 
+from collections import OrderedDict
+import heapq
 import math
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra as csgraphDijkstra
 
 class VertexCostHeap:
+    """
+    VertexCostHeap is a min-priority queue of vertices keyed by cost,
+    backed by a binary heap (heapq) with lazy deletion.
+
+    decrease_key() pushes a new (cost, vertex) entry rather than moving
+    the old one; entries whose cost no longer matches the vertex's
+    current cost are discarded when they reach the top. So insert,
+    decrease_key and extract_min are all O(log n) amortized. Vertices
+    that were never inserted report a cost of math.inf.
+    """
     def __init__(self):
         self.reset()
         
     def initialize(self, graph: Graph, s):
         self.reset()
-        
-        for n in range(0, graph.order()):
-            self.insert(n, math.inf)
-        
-        self.decrease_key(s, 0)
+        self.insert(s, 0)
         
     def insert(self, vertex, cost):
         self.vtx_costs[vertex] = cost
+        heapq.heappush(self.entries, (cost, vertex))
         
     def cost(self, vertex):
-        return self.vtx_costs[vertex]
+        return self.vtx_costs.get(vertex, math.inf)
         
     def extract_min(self):
-        if len(self.vtx_costs) == 0:
+        if self.is_empty():
             return None
-        
-        keys = list(self.vtx_costs)
-        
-        min_value = self.vtx_costs[keys[0]]
-        min_key = keys[0]
-        
-        for n in range(1, len(keys)):
-            check_key = keys[n]
-            check_value = self.vtx_costs[check_key]
-            if check_value < min_value:
-                min_value = check_value
-                min_key = check_key
-        
-        return (min_key, self.vtx_costs.pop(min_key))
+        cost, vertex = heapq.heappop(self.entries)
+        return (vertex, self.vtx_costs.pop(vertex))
+    
+    def min_cost(self):
+        """
+        Return the least cost in the heap without removing it (math.inf if
+        the heap is empty).
+        """
+        if self.is_empty():
+            return math.inf
+        return self.entries[0][0]
     
     def is_empty(self):
-        return len(self.vtx_costs) == 0
+        # drop stale entries so the top entry, if any, is current
+        entries = self.entries
+        while len(entries) > 0:
+            cost, vertex = entries[0]
+            if self.vtx_costs.get(vertex) == cost:
+                return False
+            heapq.heappop(entries)
+        return True
     
     def decrease_key(self, vertex, cost):
-        self.vtx_costs[vertex] = cost
+        self.insert(vertex, cost)
         
     def reset(self):
         self.vtx_costs = {}
+        self.entries = []
     
+
+class BucketQueue:
+    """
+    BucketQueue is a monotone priority queue of vertices with integer
+    costs (Dial's algorithm): a circular array of maxWeight + 1 buckets,
+    one per cost value, indexed by cost modulo the bucket count.
+
+    It has the VertexCostHeap interface. It relies on Dijkstra's
+    monotonicity: every inserted cost is at least the last extracted
+    cost and at most maxWeight more, so the live costs always fit in one
+    turn of the array. extract_min scans forward from the last extracted
+    cost, so a full search is O(m + n * maxWeight) and in practice
+    O(m + largest cost). Stale entries left by decrease_key are dropped
+    when scanned.
+    """
+    def __init__(self, maxWeight):
+        self.bucketCount = int(maxWeight) + 1
+        self.reset()
+
+    def initialize(self, graph: Graph, s):
+        self.reset()
+        self.insert(s, 0)
+
+    def insert(self, vertex, cost):
+        # current only moves forward on extraction; an insert into an
+        # empty queue may move it back, never past a live cost
+        if len(self.vtx_costs) == 0 and cost < self.current:
+            self.current = cost
+        self.vtx_costs[vertex] = cost
+        self.buckets[cost % self.bucketCount].append(vertex)
+
+    def cost(self, vertex):
+        return self.vtx_costs.get(vertex, math.inf)
+
+    def extract_min(self):
+        if self.is_empty():
+            return None
+        vertex = self.buckets[self.current % self.bucketCount].pop()
+        return (vertex, self.vtx_costs.pop(vertex))
+
+    def min_cost(self):
+        if self.is_empty():
+            return math.inf
+        return self.current
+
+    def is_empty(self):
+        # advance to the first bucket whose last entry is current
+        vtx_costs = self.vtx_costs
+        if len(vtx_costs) == 0:
+            return True
+        buckets = self.buckets
+        current = self.current
+        bucket = buckets[current % self.bucketCount]
+        while True:
+            while len(bucket) > 0:
+                if vtx_costs.get(bucket[-1]) == current:
+                    self.current = current
+                    return False
+                bucket.pop()
+            current += 1
+            bucket = buckets[current % self.bucketCount]
+
+    def decrease_key(self, vertex, cost):
+        self.insert(vertex, cost)
+
+    def reset(self):
+        self.vtx_costs = {}
+        self.buckets = [[] for i in range(0, self.bucketCount)]
+        self.current = 0
+
+
+class RadixHeap:
+    """
+    RadixHeap is a monotone priority queue of vertices with non-negative
+    integer costs. An entry with cost c sits in bucket
+    (c XOR last).bit_length(), where last is the last extracted cost.
+    When bucket 0 runs dry, the lowest non-empty bucket is emptied into
+    lower buckets around its minimum. An entry only moves to lower
+    buckets, so a full search is O(m + n log C) for largest cost C.
+
+    It has the VertexCostHeap interface and, like BucketQueue, needs
+    inserted costs to be at least the last extracted cost.
+    """
+    def __init__(self):
+        self.reset()
+
+    def initialize(self, graph: Graph, s):
+        self.reset()
+        self.insert(s, 0)
+
+    def insert(self, vertex, cost):
+        self.vtx_costs[vertex] = cost
+        self.buckets[(cost ^ self.last).bit_length()].append((cost, vertex))
+
+    def cost(self, vertex):
+        return self.vtx_costs.get(vertex, math.inf)
+
+    def extract_min(self):
+        if self.is_empty():
+            return None
+        cost, vertex = self.buckets[0].pop()
+        del self.vtx_costs[vertex]
+        return (vertex, cost)
+
+    def min_cost(self):
+        if self.is_empty():
+            return math.inf
+        return self.last
+
+    def is_empty(self):
+        # make bucket 0 end with a current entry, redistributing if needed
+        vtx_costs = self.vtx_costs
+        buckets = self.buckets
+        first = buckets[0]
+        while len(first) > 0:
+            cost, vertex = first[-1]
+            if vtx_costs.get(vertex) == cost:
+                return False
+            first.pop()
+        if len(vtx_costs) == 0:
+            return True
+        for i in range(1, len(buckets)):
+            entries = [entry for entry in buckets[i] if vtx_costs.get(entry[1]) == entry[0]]
+            buckets[i] = []
+            if len(entries) > 0:
+                last = min(entries)[0]
+                self.last = last
+                for cost, vertex in entries:
+                    buckets[(cost ^ last).bit_length()].append((cost, vertex))
+                return False
+        return True
+
+    def decrease_key(self, vertex, cost):
+        self.insert(vertex, cost)
+
+    def reset(self):
+        self.vtx_costs = {}
+        self.buckets = [[] for i in range(0, 65)]
+        self.last = 0
+
         
 class Dijkstra:
-    def __init__(self, graph: Graph):
+    def __init__(self, graph: Graph, queue='auto'):
         self.graph = graph
         self.source = 0
         self.warnings = []
@@ -67,6 +228,8 @@ class Dijkstra:
         self.parents = {} # for reconstructing lightest paths from source
         self.source = None
         self.heap = VertexCostHeap()
+        self.settledCount = 0 # vertices settled by the last search
+        self.queue = queue # 'auto', 'heap', 'dial' or 'radix'
         
         if not self.graph.hasEdgeWeights():
             print("WARNING: graph for Dijkstra algorithm lacks edge weights, will treat each edge as cost=1")
@@ -80,34 +243,102 @@ class Dijkstra:
         self.costs = {}
         self.parents = {}
         self.source = None
+        self.settledCount = 0
         
+    # largest integer weight for which 'auto' picks a BucketQueue
+    DIAL_MAX_WEIGHT = 255
+
+    def queueKind(self):
+        """
+        Return the priority queue kind a search will use: self.queue, or
+        for 'auto', 'dial' when all weights are integers in
+        [0, DIAL_MAX_WEIGHT] and 'heap' (VertexCostHeap) otherwise.
+        'radix' is only used when asked for: its redistribution runs in
+        Python, so for large weights the C-implemented binary heap is
+        faster here.
+        """
+        if self.queue != 'auto':
+            return self.queue
+        weights = self.graph.edgeWeightArray()
+        if len(weights) == 0 or weights.min() < 0 or not np.all(weights == np.floor(weights)):
+            return 'heap'
+        if weights.max() <= Dijkstra.DIAL_MAX_WEIGHT:
+            return 'dial'
+        return 'heap'
+
+    def searchArrays(self, direction):
+        """
+        Return (queue, indptr, indices, weights) for one search: a new,
+        empty priority queue of the kind given by queueKind() and the
+        graph's adjacency arrays. Integer queues get int64 weights.
+        """
+        kind = self.queueKind()
+        index = self.graph.adjacencyIndex(direction)
+        weights = self.graph.adjacencyWeights(direction)
+        if kind == 'heap':
+            return VertexCostHeap(), index.indptr, index.indices, weights
+        if len(weights) > 0 and (weights.min() < 0 or not np.all(weights == np.floor(weights))):
+            raise Exception(f"Queue '{kind}' needs non-negative integer edge weights")
+        weights = weights.astype(np.int64)
+        if kind == 'dial':
+            queue = BucketQueue(weights.max() if len(weights) > 0 else 0)
+        elif kind == 'radix':
+            queue = RadixHeap()
+        else:
+            raise Exception(f"Unknown queue kind '{kind}'")
+        return queue, index.indptr, index.indices, weights
+
     def findLeastCostPathImpl(self, s, t=None):
+        """
+        Run Dijkstra's algorithm from s, stopping early once t (if given)
+        is settled. Fills self.costs (for every vertex when t is None,
+        math.inf where unreachable) and self.parents.
+
+        Neighbors come from the graph's AdjacencyIndex (out-neighbors for
+        a Digraph) and weights from the parallel Graph.adjacencyWeights()
+        array, so a run is O((n + m) log n) with the binary heap. Only the
+        neighborhoods of settled vertices are read, so a search that stops
+        early at t costs nothing for the rest of the graph. Edges without
+        a weight cost 1.
+
+        With queue='auto', integer weights in [0, DIAL_MAX_WEIGHT] use a
+        BucketQueue (O(m + nC) for largest weight C) and all other
+        weights the binary heap; a RadixHeap (O(m + n log C)) is only used
+        when asked for with queue='radix'. See queueKind(). With either
+        integer queue, costs are ints.
+        """
         self.source = s
+        self.costs = {}
+        self.parents = {}
+        self.heap, indptr, indices, slotWeights = self.searchArrays('out')
         self.heap.initialize(self.graph, self.source)
-        
-        while not self.heap.is_empty():
-            vtx, vtx_cost = self.heap.extract_min()
-            self.costs[vtx] = vtx_cost
+
+        heap = self.heap
+        costs = self.costs
+        parents = self.parents
+        while not heap.is_empty():
+            vtx, vtx_cost = heap.extract_min()
+            costs[vtx] = vtx_cost
+            self.settledCount = len(costs)
             
             if None != t and vtx == t:
                 # this is all we need for this method
                 return
             
-            if self.heap.is_empty():
-                break
-            
-            neighbors = self.graph.getNeighbors(vtx)
-            for neighbor in neighbors:
-                cur_cost = self.heap.cost(neighbor)
-                edge_cost = self.graph.getEdgeWeight(vtx, neighbor)
-                
-                if cur_cost > vtx_cost + edge_cost:
-                    neighbor_cost = vtx_cost + edge_cost
-                    self.parents[neighbor] = vtx
-                    self.heap.decrease_key(neighbor, neighbor_cost)
-        
-        
-    def findLeastCostPath(self, s, t):
+            start = indptr[vtx]
+            end = indptr[vtx + 1]
+            for neighbor, weight in zip(indices[start:end].tolist(), slotWeights[start:end].tolist()):
+                neighbor_cost = vtx_cost + weight
+                if neighbor_cost < heap.cost(neighbor) and not neighbor in costs:
+                    parents[neighbor] = vtx
+                    heap.decrease_key(neighbor, neighbor_cost)
+
+        if None == t:
+            for vtx in range(0, self.graph.order()):
+                if not vtx in costs:
+                    costs[vtx] = math.inf
+
+    def findLeastCostPath(self, s, t, bidirectional=False, heuristic=None):
         """
         Find the least-cost path from s to t in terms of edge weights
 
@@ -115,18 +346,188 @@ class Dijkstra:
         ----------
         s : the starting vertx.
         t : the ending vertex.
+        bidirectional : bool, optional
+            Search from both ends at once (see
+            findLeastCostPathBidirectional()). The default is False.
+        heuristic : callable, array or Landmarks, optional
+            If given, run an A* search guided by this lower bound on the
+            remaining cost to t (see findLeastCostPathAStar()).
 
-        Returns a path (list of vertices)
+        Returns a path (list of vertices), or None if t cannot be reached
+        from s.
         
         Implementation: this uses the same algorithm as that which
         determines lest-cost paths to all vertices, it just stops when the
         target vertex shortest path is determined.
 
         """
-        self.findLeastCostPathImpl(s, t)
-        return self.getLeastCostPath(t)
+        if None != heuristic:
+            self.findLeastCostPathAStar(s, t, heuristic)
+        elif bidirectional:
+            self.findLeastCostPathBidirectional(s, t)
+        else:
+            self.findLeastCostPathImpl(s, t)
+        if not t in self.costs:
+            return None
+        return self.getPath(t)
+
+    def findLeastCostPathBidirectional(self, s, t):
+        """
+        Run a bidirectional Dijkstra search for the least-cost path from s
+        to t: forward from s over out-neighbors and backward from t over
+        in-neighbors (the reverse index of a Digraph).
+
+        Behavior
+        --------
+        The side whose heap has the lower top cost advances. Whenever a
+        relaxation reaches a vertex already reached from the other side,
+        the best s-t cost found so far (mu) and its meeting vertex are
+        updated. The search stops once the two heap tops sum to at least
+        mu, since no path through an unsettled vertex can be cheaper.
+        Typically this settles far fewer vertices than a one-sided search,
+        roughly two balls of half the radius.
+
+        Afterwards getPathCost(t) and getPath(t) report the result as for
+        findLeastCostPath(): self.costs holds the forward-settled vertices
+        and every vertex of the path, and self.parents links the path
+        from s to t. If t cannot be reached, t is not in self.costs.
+        """
+        self.source = s
+        self.costs = {}
+        self.parents = {}
+        self.settledCount = 0
+        if s == t:
+            self.costs[s] = 0
+            self.settledCount = 1
+            return
+
+        sides = []
+        for direction, root in [('out', s), ('in', t)]:
+            heap, indptr, indices, weights = self.searchArrays(direction)
+            heap.insert(root, 0)
+            sides.append((indptr, indices, weights,
+                          heap, {root: 0}, {root: -1}, set()))
+
+        best = math.inf
+        meet = None
+        while True:
+            forwardTop = sides[0][3].min_cost()
+            backwardTop = sides[1][3].min_cost()
+            if forwardTop + backwardTop >= best:
+                break
+            side = 0 if forwardTop <= backwardTop else 1
+            indptr, indices, weights, heap, dist, parent, settled = sides[side]
+            otherDist = sides[1 - side][4]
+            vtx, vtx_cost = heap.extract_min()
+            settled.add(vtx)
+            self.settledCount += 1
+            start = indptr[vtx]
+            end = indptr[vtx + 1]
+            for neighbor, weight in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+                neighbor_cost = vtx_cost + weight
+                if neighbor_cost < dist.get(neighbor, math.inf) and not neighbor in settled:
+                    dist[neighbor] = neighbor_cost
+                    parent[neighbor] = vtx
+                    heap.decrease_key(neighbor, neighbor_cost)
+                if neighbor in otherDist:
+                    through = dist[neighbor] + otherDist[neighbor]
+                    if through < best:
+                        best = through
+                        meet = neighbor
+
+        forwardDist, forwardParent, forwardSettled = sides[0][4], sides[0][5], sides[0][6]
+        for vtx in forwardSettled:
+            self.costs[vtx] = forwardDist[vtx]
+            if vtx != s:
+                self.parents[vtx] = forwardParent[vtx]
+        if None == meet:
+            return
+
+        path = [meet]
+        while path[-1] != s:
+            path.append(forwardParent[path[-1]])
+        path.reverse()
+        meetPosition = len(path) - 1
+        backwardDist, backwardParent = sides[1][4], sides[1][5]
+        while path[-1] != t:
+            path.append(backwardParent[path[-1]])
+        for i in range(1, len(path)):
+            self.parents[path[i]] = path[i - 1]
+            if i <= meetPosition:
+                self.costs[path[i]] = forwardDist[path[i]]
+            else:
+                self.costs[path[i]] = best - backwardDist[path[i]]
     
     
+    def findLeastCostPathAStar(self, s, t, heuristic):
+        """
+        Run an A* search for the least-cost path from s to t.
+
+        Parameters
+        ----------
+        heuristic : callable, array or Landmarks
+            A lower bound h(v) on the cost from v to t: a callable taking a
+            vertex, an array indexed by vertex, or a Landmarks object (ALT
+            search; its bounds for target t are used). math.inf marks
+            vertices known not to reach t, which are pruned.
+
+        Behavior
+        --------
+        Vertices are expanded in order of g(v) + h(v), where g is the best
+        cost from s found so far. With an admissible heuristic (one that
+        never overestimates) the path found is a least-cost path; a vertex
+        is expanded again if a cheaper route to it turns up later, which
+        only happens when the heuristic is not consistent. Each h(v) is
+        evaluated once per search.
+
+        Afterwards self.costs holds the costs of the expanded vertices
+        and getPath(t) / getPathCost(t) work as for findLeastCostPath().
+        """
+        if isinstance(heuristic, Landmarks):
+            heuristic = heuristic.heuristic(t)
+        elif not callable(heuristic):
+            bounds = heuristic
+            heuristic = lambda v: bounds[v]
+
+        self.source = s
+        self.costs = {}
+        self.parents = {}
+        self.settledCount = 0
+        index = self.graph.adjacencyIndex('out')
+        indptr = index.indptr
+        indices = index.indices
+        slotWeights = self.graph.adjacencyWeights('out')
+
+        heap = VertexCostHeap()
+        self.heap = heap
+        best = {s: 0}
+        estimates = {}
+        heap.insert(s, heuristic(s))
+        costs = self.costs
+        parents = self.parents
+        while not heap.is_empty():
+            vtx, estimate = heap.extract_min()
+            vtx_cost = best[vtx]
+            costs[vtx] = vtx_cost
+            self.settledCount += 1
+            if vtx == t:
+                return
+
+            start = indptr[vtx]
+            end = indptr[vtx + 1]
+            for neighbor, weight in zip(indices[start:end].tolist(), slotWeights[start:end].tolist()):
+                neighbor_cost = vtx_cost + weight
+                if neighbor_cost < best.get(neighbor, math.inf):
+                    remaining = estimates.get(neighbor)
+                    if None == remaining:
+                        remaining = heuristic(neighbor)
+                        estimates[neighbor] = remaining
+                    if math.inf == remaining:
+                        continue
+                    best[neighbor] = neighbor_cost
+                    parents[neighbor] = vtx
+                    heap.decrease_key(neighbor, neighbor_cost + remaining)
+    
     def findAllLeastCostPaths(self, s, t=None):
         """
         Calcualte the minimum-cost paths from s to all other vertices;
@@ -176,14 +577,471 @@ class Dijkstra:
 
         """
         path = [t]
-        v = self.parents[t]
-        while None != v:
+        v = t
+        while v != self.source:
+            v = self.parents[v]
             path.append(v)
-            if v == self.source:
-                break
             
         path.reverse()
         return path
-    
-        
-        
\ No newline at end of file
+
+
+def weightMatrix(G: Graph, direction='out'):
+    """
+    Return the graph's AdjacencyIndex and adjacencyWeights() arrays as a
+    float64 scipy CSR matrix, the input of scipy's compiled searches.
+    """
+    index = G.adjacencyIndex(direction)
+    return csr_matrix((G.adjacencyWeights(direction).astype(np.float64), index.indices, index.indptr),
+                      shape=(index.n, index.n))
+
+def shortestPathArrays(G: Graph, sources, direction='out'):
+    """
+    Return full least-cost arrays from one or more sources.
+
+    Parameters
+    ----------
+    G : Graph
+    sources : int or list of ints
+    direction : str, optional
+        For a Digraph, 'out' measures costs along edges and 'in' against
+        them (so row i holds the costs from every vertex to source i).
+        The default is 'out'.
+
+    Returns
+    -------
+    A float array of costs (math.inf where unreachable): shape (n,) for a
+    single source, (k, n) for k sources.
+
+    Implementation: the graph's AdjacencyIndex and adjacencyWeights()
+    arrays are handed to scipy's compiled Dijkstra as a CSR matrix
+    (explicit zero weights remain edges there).
+    """
+    return csgraphDijkstra(weightMatrix(G, direction), directed=True, indices=sources)
+
+class ShortestPathTreeCache:
+    """
+    ShortestPathTreeCache keeps the shortest-path trees (cost and parent
+    arrays) of recently used sources, so repeated queries from the same
+    sources only walk a parent array.
+
+    Parameters
+    ----------
+    G : Graph
+    maxBytes : int, optional
+        The memory bound for the cached arrays. When adding a tree would
+        exceed it, the least recently used trees are evicted. A tree
+        larger than the bound is returned but not kept. The default is
+        64 MiB.
+    direction : str, optional
+        'out' (the default) for trees of paths leaving the sources; for a
+        Digraph, 'in' gives trees of paths into them.
+
+    Behavior
+    --------
+    Trees are keyed by (graph version, source, direction). The graph has
+    a single set of edge weights, and any change to its edges or weights
+    bumps Graph.version. Such a change drops every cached tree at the
+    next lookup. A tree costs 16 bytes per vertex: float64 costs and int64
+    parents, with -1 for the source and for unreachable vertices.
+    """
+    def __init__(self, G: Graph, maxBytes=64 * 2**20, direction='out'):
+        self.graph = G
+        self.maxBytes = maxBytes
+        self.direction = direction
+        self.trees = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"ShortestPathTreeCache .trees={len(self.trees)} .nbytes={self.nbytes} .hits={self.hits} .misses={self.misses}"
+
+    def clear(self):
+        self.trees.clear()
+        self.nbytes = 0
+
+    def tree(self, source):
+        """
+        Return (costs, parents) arrays for the shortest-path tree of
+        source, computing and caching it on a miss. Treat them as
+        read-only.
+        """
+        key = (self.graph.version, int(source), self.direction)
+        tree = self.trees.get(key)
+        if None is not tree:
+            self.hits += 1
+            self.trees.move_to_end(key)
+            return tree
+        self.misses += 1
+        if len(self.trees) > 0 and next(iter(self.trees))[0] != self.graph.version:
+            self.clear()
+
+        index = self.graph.adjacencyIndex(self.direction)
+        matrix = csr_matrix((self.graph.adjacencyWeights(self.direction).astype(np.float64),
+                             index.indices, index.indptr), shape=(index.n, index.n))
+        costs, parents = csgraphDijkstra(matrix, directed=True, indices=int(source), return_predecessors=True)
+        parents = parents.astype(np.int64)
+        parents[parents < 0] = -1
+        tree = (costs, parents)
+
+        size = costs.nbytes + parents.nbytes
+        if size <= self.maxBytes:
+            while self.nbytes + size > self.maxBytes:
+                evicted = self.trees.popitem(last=False)[1]
+                self.nbytes -= evicted[0].nbytes + evicted[1].nbytes
+            self.trees[key] = tree
+            self.nbytes += size
+        return tree
+
+    def getPathCost(self, s, t):
+        """
+        Return the least cost from s to t (math.inf if unreachable).
+        With direction 'in', s is the tree's source and the cost is that
+        of a path from t to s.
+        """
+        return float(self.tree(s)[0][t])
+
+    def findLeastCostPath(self, s, t):
+        """
+        Return a least-cost path from s to t as a vertex list, or None if
+        t is unreachable. With direction 'in', the path runs from t to s.
+        """
+        costs, parents = self.tree(s)
+        if math.inf == costs[t]:
+            return None
+        path = [int(t)]
+        vertex = t
+        while vertex != s:
+            vertex = int(parents[vertex])
+            path.append(vertex)
+        if self.direction == 'in':
+            return path
+        path.reverse()
+        return path
+
+# per-process state of findLeastCostMatrix() workers
+leastCostWorkerState = {}
+
+def allocateSharedArray(shape, dtype):
+    """
+    Create an uninitialized SharedMemory block for an array; return the
+    block and a spec (name, shape, dtype) from which a worker can attach
+    to it.
+    """
+    dtype = np.dtype(dtype)
+    block = SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+    return block, (block.name, tuple(shape), dtype.str)
+
+def shareArray(array):
+    """
+    Copy an array into a new SharedMemory block; return the block and its
+    spec, as for allocateSharedArray().
+    """
+    block, spec = allocateSharedArray(array.shape, array.dtype)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, spec
+
+def attachArray(spec, blocks):
+    name, shape, dtype = spec
+    block = SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+def shareCSRArrays(G: Graph, direction, blocks):
+    """
+    Copy the graph's CSR arrays (indptr, indices and float64 weights)
+    into SharedMemory blocks, appending the blocks to the given list, and
+    return their specs.
+
+    The index arrays are shared as int32 whenever n and the slot count
+    allow it. That is the index dtype scipy picks for such a matrix, so
+    csr_matrix(..., copy=False) in a worker keeps views of the shared
+    blocks instead of making a private downcast copy.
+    """
+    index = G.adjacencyIndex(direction)
+    indexDtype = np.int32 if max(index.n, len(index.indices)) < np.iinfo(np.int32).max else np.int64
+    arrays = [index.indptr.astype(indexDtype), index.indices.astype(indexDtype),
+              G.adjacencyWeights(direction).astype(np.float64)]
+    specs = []
+    for array in arrays:
+        block, spec = shareArray(np.ascontiguousarray(array))
+        blocks.append(block)
+        specs.append(spec)
+    return specs
+
+def initializeLeastCostWorker(n, arraySpecs, sources, outSpec):
+    """
+    Attach a worker process to the shared CSR arrays and to the output
+    matrix (a SharedMemory block or a .npy file opened as a memmap).
+    """
+    blocks = []
+    indptr, indices, weights = [attachArray(spec, blocks) for spec in arraySpecs]
+    leastCostWorkerState['blocks'] = blocks
+    leastCostWorkerState['arrays'] = (indptr, indices, weights)
+    leastCostWorkerState['matrix'] = csr_matrix((weights, indices, indptr), shape=(n, n), copy=False)
+    leastCostWorkerState['sources'] = sources
+    if outSpec[0] == 'memmap':
+        leastCostWorkerState['out'] = np.load(outSpec[1], mmap_mode='r+')
+    else:
+        leastCostWorkerState['out'] = attachArray(outSpec[1], blocks)
+
+def runLeastCostTask(rows):
+    """
+    Fill rows [start, stop) of the worker's output matrix.
+    """
+    start, stop = rows
+    state = leastCostWorkerState
+    out = state['out']
+    out[start:stop] = csgraphDijkstra(state['matrix'], directed=True, indices=state['sources'][start:stop])
+    if isinstance(out, np.memmap):
+        out.flush()
+    return stop - start
+
+def findLeastCostMatrix(G: Graph, sources=None, processes=None, path=None, direction='out', chunkSize=64):
+    """
+    Compute least costs from many sources, in parallel worker processes.
+
+    Parameters
+    ----------
+    G : Graph
+    sources : list or array of ints, optional
+        The source vertices; the default is every vertex.
+    processes : int, optional
+        The number of worker processes. The default is os.cpu_count();
+        with 1, or a single chunk of work, everything runs in this process.
+    path : str, optional
+        If given, the result is a .npy file at this path, created at full
+        size and returned as a memory map, so matrices larger than memory
+        can be filled and reused.
+    direction : str, optional
+        'out' (the default) or 'in', as for shortestPathArrays().
+    chunkSize : int, optional
+        The number of sources per task. The default is 64.
+
+    Returns
+    -------
+    A (len(sources), n) float64 matrix whose row i holds the costs from
+    sources[i] (math.inf where unreachable).
+
+    Behavior
+    --------
+    Each source is an independent single-source search (scipy's compiled
+    Dijkstra on the graph's AdjacencyIndex and adjacencyWeights()), and
+    the matrix is always filled chunkSize rows at a time, so apart from
+    the result only one chunk of rows is held in memory.
+
+    In this process, each chunk is written into the result (the
+    memory-mapped file is flushed at the end). With workers, the CSR
+    arrays are copied once into shared memory, and workers attach to
+    them when they start, so a task is just a pair of row numbers and
+    nothing else is pickled. Workers write their rows directly into the
+    memory-mapped file, or into a shared memory block of which a copy is
+    returned.
+    """
+    n = G.order()
+    if None is sources:
+        sources = np.arange(0, n, dtype=np.int64)
+    sources = np.asarray(sources, dtype=np.int64).reshape(-1)
+    k = len(sources)
+    out = None
+    if None != path:
+        out = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(k, n))
+    if None == processes:
+        processes = os.cpu_count() or 1
+    tasks = [(start, min(start + chunkSize, k)) for start in range(0, k, chunkSize)]
+    processes = min(processes, len(tasks))
+    if processes <= 1 or n == 0:
+        if None is out:
+            out = np.empty((k, n), dtype=np.float64)
+        if n > 0:
+            matrix = weightMatrix(G, direction)
+            for start, stop in tasks:
+                out[start:stop] = csgraphDijkstra(matrix, directed=True, indices=sources[start:stop])
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    blocks = []
+    try:
+        specs = shareCSRArrays(G, direction, blocks)
+        if None == path:
+            block, outSpec = allocateSharedArray((k, n), np.float64)
+            blocks.append(block)
+            outSpec = ('shared', outSpec)
+        else:
+            out.flush()
+            outSpec = ('memmap', path)
+        with multiprocessing.Pool(processes, initializeLeastCostWorker, (n, specs, sources, outSpec)) as pool:
+            for count in pool.imap_unordered(runLeastCostTask, tasks):
+                pass
+        if None == path:
+            out = np.ndarray((k, n), dtype=np.float64, buffer=blocks[-1].buf).copy()
+        else:
+            out = np.load(path, mmap_mode='r+')
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return out
+
+def compactDistanceTable(costs):
+    """
+    Store a float cost table compactly: as int32 (with -1 for math.inf)
+    when every finite cost is an integer below 2^31 - 1, otherwise as
+    float64. See expandDistanceTable().
+    """
+    finite = np.isfinite(costs)
+    values = costs[finite]
+    if np.all(values == np.floor(values)) and (len(values) == 0 or values.max() < 2**31 - 1):
+        return np.where(finite, costs, -1).astype(np.int32)
+    return costs.astype(np.float64)
+
+def expandDistanceTable(table):
+    """
+    Return a float64 copy of a table made by compactDistanceTable().
+    """
+    if table.dtype.kind == 'f':
+        return table.astype(np.float64)
+    costs = table.astype(np.float64)
+    costs[table < 0] = math.inf
+    return costs
+
+class Landmarks:
+    """
+    Landmarks holds the preprocessing for ALT (A*, landmarks, triangle
+    inequality) searches: a few landmark vertices and their full cost
+    tables.
+
+    For every landmark L, forward[v, i] is the cost from L to v and, for a
+    Digraph, backward[v, i] is the cost from v to L (backward is None for
+    an undirected graph). Tables are stored compactly (see
+    compactDistanceTable()), one row per vertex, so the costs for a
+    vertex are one contiguous read.
+
+    By the triangle inequality, for any vertex v and target t,
+
+        d(v, t) >= d(L, t) - d(L, v)   and   d(v, t) >= d(v, L) - d(t, L)
+
+    and heuristic(t) returns the greatest of these bounds as an A*
+    heuristic, which is consistent. Landmarks can be saved next to the
+    graph with save() and reloaded with Landmarks.load(), which checks
+    that they were built for the same graph (see Graph.fingerprint()).
+    """
+
+    def fromGraph(G: Graph, count=8, landmarks=None):
+        """
+        Choose landmarks and compute their tables.
+
+        Parameters
+        ----------
+        G : Graph
+        count : int, optional
+            The number of landmarks. The default is 8.
+        landmarks : list of ints, optional
+            Use these vertices instead of choosing.
+
+        Behavior
+        --------
+        Landmarks are chosen by farthest-point selection: the first is
+        the vertex farthest from vertex 0, and each next one is the vertex
+        farthest from all landmarks chosen so far (an unreachable vertex
+        counts as farthest, so other components get landmarks too). This
+        spreads landmarks toward the periphery, where their bounds are
+        tightest. Each landmark costs one or two full Dijkstra runs.
+        """
+        n = G.order()
+        if None == landmarks:
+            chosen = []
+            rows = []
+            nearest = shortestPathArrays(G, 0) if n > 0 else None
+            for i in range(0, min(count, n)):
+                candidates = nearest.copy()
+                candidates[chosen] = -1
+                landmark = int(np.argmax(candidates))
+                chosen.append(landmark)
+                row = shortestPathArrays(G, landmark)
+                rows.append(row)
+                nearest = row if i == 0 else np.minimum(nearest, row)
+            landmarks = chosen
+            forward = np.array(rows).reshape(-1, n)
+        else:
+            landmarks = [int(v) for v in landmarks]
+            forward = np.asarray(shortestPathArrays(G, landmarks)).reshape(-1, n)
+        backward = None
+        if G.directed:
+            backward = np.asarray(shortestPathArrays(G, landmarks, 'in')).reshape(-1, n).T
+            backward = compactDistanceTable(np.ascontiguousarray(backward))
+        forward = compactDistanceTable(np.ascontiguousarray(forward.T))
+        return Landmarks(np.array(landmarks, dtype=np.int64), forward, backward, G.fingerprint())
+
+    def __init__(self, landmarks, forward, backward=None, fingerprint=None):
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.fingerprint = fingerprint
+
+    def __repr__(self):
+        return f"Landmarks .landmarks={self.landmarks.tolist()} .dtype={self.forward.dtype}"
+
+    def costs(self, table, vertex):
+        row = table[vertex].astype(np.float64)
+        if table.dtype.kind != 'f':
+            row[table[vertex] < 0] = math.inf
+        return row
+
+    def heuristic(self, t):
+        """
+        Return the ALT heuristic for target t: a callable giving a lower
+        bound on the cost from a vertex to t (math.inf if the tables show
+        t cannot be reached from it).
+        """
+        toTarget = self.costs(self.forward, t)
+        fromTarget = None if None is self.backward else self.costs(self.backward, t)
+
+        def bound(v):
+            with np.errstate(invalid='ignore'):
+                gaps = toTarget - self.costs(self.forward, v)
+                if None is not fromTarget:
+                    gaps = np.concatenate((gaps, self.costs(self.backward, v) - fromTarget))
+                elif len(gaps) > 0:
+                    gaps = np.abs(gaps)
+            gaps = gaps[~np.isnan(gaps)]
+            if len(gaps) == 0:
+                return 0
+            return max(0.0, float(gaps.max()))
+        return bound
+
+    def save(self, path):
+        """
+        Save the landmark tables to a .npz file (e.g. next to the graph
+        file), with the fingerprint of the graph they were built for.
+        """
+        arrays = {'landmarks': self.landmarks, 'forward': self.forward,
+                  'fingerprint': np.array(self.fingerprint or '')}
+        if None is not self.backward:
+            arrays['backward'] = self.backward
+        np.savez_compressed(path, **arrays)
+
+    def load(path, G: Graph = None):
+        """
+        Load landmark tables saved by save(). If G is given, raise an
+        Exception unless the tables were built for this graph.
+        """
+        with np.load(path) as data:
+            fingerprint = str(data['fingerprint'])
+            if None != G and fingerprint != G.fingerprint():
+                raise Exception(f"Landmark tables in {path} were built for a different graph")
+            backward = data['backward'] if 'backward' in data else None
+            return Landmarks(data['landmarks'], data['forward'], backward, fingerprint)
+
+def findLandmarks(G: Graph, count=8):
+    """
+    Return Landmarks for G, cached on the graph until its edges or
+    weights change (see Graph.clearCaches()).
+    """
+    landmarks = G.landmark_cache.get(count)
+    if None == landmarks:
+        landmarks = Landmarks.fromGraph(G, count)
+        G.landmark_cache[count] = landmarks
+    return landmarks
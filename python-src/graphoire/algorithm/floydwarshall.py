@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 13:22:09 2026
+
+@author: mathaes
+
+graphoire.algorithm.floydwarshall computes all-pairs least-cost matrices
+with a blocked (tiled) Floyd-Warshall. The matrix is processed in square
+tiles small enough to stay in cache, each relaxed with NumPy
+broadcasting. It can be stored in a compact dtype and in a memory-mapped
+file, and an optional next-hop matrix allows path reconstruction.
+"""
+
+from graphoire.graph import Graph
+from graphoire.algorithm.bellmanford import relaxationArrays
+
+import math
+
+import numpy as np
+
+def unreachableCost(dtype):
+    """
+    Return the value that marks 'no path' in a cost matrix of the given
+    dtype: inf for floating point, the largest value for integers.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        return math.inf
+    return np.iinfo(dtype).max
+
+def nextHopDtype(n):
+    """
+    Return the smallest signed integer dtype that holds vertex numbers
+    below n and -1.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+class TiledMatrix:
+    """
+    Loads and stores square tiles of a stored cost matrix, converting to
+    and from the floating point dtype used for arithmetic (inf for no
+    path). Integer storage is checked for overflow on store.
+    """
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.sentinel = unreachableCost(matrix.dtype)
+        self.integral = matrix.dtype.kind != 'f'
+        self.computeDtype = np.float32 if matrix.dtype == np.float32 else np.float64
+
+    def load(self, rows, cols):
+        stored = self.matrix[rows, cols]
+        tile = stored.astype(self.computeDtype)
+        if self.integral:
+            tile[stored == self.sentinel] = math.inf
+        return tile
+
+    def store(self, rows, cols, tile):
+        if self.integral:
+            finite = np.isfinite(tile)
+            if np.any(tile[finite] >= self.sentinel):
+                raise Exception(f"Least costs do not fit in {self.matrix.dtype}")
+            tile = np.where(finite, tile, self.sentinel)
+        self.matrix[rows, cols] = tile
+
+def relaxTile(tile, left, top, nextTile=None, leftNext=None):
+    """
+    For every k, lower tile[i, j] to left[i, k] + top[k, j]. left and top
+    may be views of tile itself (the diagonal, row and column phases).
+    With next-hop tiles, an improved entry takes its next hop from
+    leftNext[i, k].
+    """
+    candidates = np.empty_like(tile)
+    for k in range(0, left.shape[1]):
+        np.add(left[:, k:k + 1], top[k:k + 1, :], out=candidates)
+        if None is nextTile:
+            np.minimum(tile, candidates, out=tile)
+        else:
+            better = candidates < tile
+            tile[better] = candidates[better]
+            nextTile[better] = np.broadcast_to(leftNext[:, k:k + 1], tile.shape)[better]
+
+def floydWarshall(G: Graph, dtype=np.float64, path=None, nextHop=False, nextPath=None, blockSize=256):
+    """
+    Compute the all-pairs least-cost matrix of G.
+
+    Parameters
+    ----------
+    G : Graph
+    dtype : numpy dtype, optional
+        The storage dtype: float64 (the default), float32, or an integer
+        dtype such as uint8 or uint16 for hop counts and other small
+        non-negative integer weights. Integer matrices mark 'no path'
+        with the dtype's largest value (see unreachableCost()), and an
+        Exception is raised if a least cost does not fit.
+    path : str, optional
+        If given, the matrix is a .npy file at this path, opened as a
+        memory map, so it may be larger than memory.
+    nextHop : bool, optional
+        Also compute the next-hop matrix (see nextHopPath()). The default
+        is False.
+    nextPath : str, optional
+        A .npy path for a memory-mapped next-hop matrix; implies nextHop.
+    blockSize : int, optional
+        The tile size. The default, 256, keeps a float64 tile at 512 KiB.
+
+    Returns
+    -------
+    A tuple (costs, next): the (n, n) cost matrix, and the next-hop
+    matrix (next[i, j] is the vertex after i on a least-cost path to j,
+    -1 if there is none) or None.
+
+    Behavior
+    --------
+    This is the three-phase blocked Floyd-Warshall. For each diagonal
+    tile kk it first closes kk itself, then the tiles of row kk and
+    column kk against it, then every other tile (i, j) against tiles
+    (i, kk) and (kk, j). Each tile update is blockSize broadcast
+    minimum operations over a blockSize x blockSize tile, so the n^3
+    work runs in NumPy in cache-sized pieces, and only the row and column
+    bands of the current kk are held outside the stored matrix.
+
+    Negative weights are allowed with a floating point dtype, but a
+    negative cycle raises an Exception.
+    """
+    n = G.order()
+    dtype = np.dtype(dtype)
+    tails, heads, weights = relaxationArrays(G)
+    if dtype.kind != 'f' and len(weights) > 0 and (weights.min() < 0 or not np.all(weights == np.floor(weights))):
+        raise Exception(f"Integer dtype {dtype} needs non-negative integer edge weights")
+
+    if None == path:
+        costs = np.empty((n, n), dtype=dtype)
+    else:
+        costs = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(n, n))
+    nextHops = None
+    if nextHop or None != nextPath:
+        nextDtype = nextHopDtype(n)
+        if None == nextPath:
+            nextHops = np.empty((n, n), dtype=nextDtype)
+        else:
+            nextHops = np.lib.format.open_memmap(nextPath, mode='w+', dtype=nextDtype, shape=(n, n))
+
+    # initialize one row band at a time: direct edges (cheapest of any
+    # parallel edges) and 0 on the diagonal
+    matrix = TiledMatrix(costs)
+    blocks = [slice(start, min(start + blockSize, n)) for start in range(0, n, blockSize)]
+    order = np.argsort(tails, kind='stable')
+    tails, heads, weights = tails[order], heads[order], weights[order]
+    for rows in blocks:
+        band = np.full((rows.stop - rows.start, n), math.inf, dtype=matrix.computeDtype)
+        first, last = np.searchsorted(tails, [rows.start, rows.stop])
+        bandTails = tails[first:last] - rows.start
+        np.minimum.at(band, (bandTails, heads[first:last]), weights[first:last])
+        diagonal = np.arange(rows.start, rows.stop)
+        band[diagonal - rows.start, diagonal] = np.minimum(band[diagonal - rows.start, diagonal], 0)
+        matrix.store(rows, slice(0, n), band)
+        if None is not nextHops:
+            hops = np.full(band.shape, -1, dtype=nextHops.dtype)
+            hops[np.isfinite(band)] = np.broadcast_to(np.arange(0, n), band.shape)[np.isfinite(band)]
+            hops[diagonal - rows.start, diagonal] = diagonal
+            nextHops[rows, :] = hops
+
+    withNext = None is not nextHops
+    for kk in blocks:
+        # phase 1: the diagonal tile
+        pivot = matrix.load(kk, kk)
+        pivotNext = nextHops[kk, kk].copy() if withNext else None
+        relaxTile(pivot, pivot, pivot, pivotNext, pivotNext)
+        if np.any(np.diagonal(pivot) < 0):
+            raise Exception("Graph has a negative cycle")
+        matrix.store(kk, kk, pivot)
+        if withNext:
+            nextHops[kk, kk] = pivotNext
+
+        # phase 2: row kk and column kk, kept as bands for phase 3
+        rowBand = {}
+        columnBand = {}
+        for other in blocks:
+            if other == kk:
+                continue
+            tile = matrix.load(kk, other)
+            tileNext = nextHops[kk, other].copy() if withNext else None
+            relaxTile(tile, pivot, tile, tileNext, pivotNext)
+            matrix.store(kk, other, tile)
+            rowBand[other.start] = tile
+            if withNext:
+                nextHops[kk, other] = tileNext
+            tile = matrix.load(other, kk)
+            tileNext = nextHops[other, kk].copy() if withNext else None
+            relaxTile(tile, tile, pivot, tileNext, tileNext)
+            matrix.store(other, kk, tile)
+            columnBand[other.start] = (tile, tileNext)
+            if withNext:
+                nextHops[other, kk] = tileNext
+
+        # phase 3: every other tile
+        for rows in blocks:
+            if rows == kk:
+                continue
+            left, leftNext = columnBand[rows.start]
+            for cols in blocks:
+                if cols == kk:
+                    continue
+                tile = matrix.load(rows, cols)
+                tileNext = nextHops[rows, cols].copy() if withNext else None
+                relaxTile(tile, left, rowBand[cols.start], tileNext, leftNext)
+                matrix.store(rows, cols, tile)
+                if withNext:
+                    nextHops[rows, cols] = tileNext
+
+    if isinstance(costs, np.memmap):
+        costs.flush()
+    if isinstance(nextHops, np.memmap):
+        nextHops.flush()
+    return costs, nextHops
+
+def nextHopPath(nextHops, s, t):
+    """
+    Return the least-cost path from s to t as a vertex list, read from a
+    next-hop matrix made by floydWarshall(), or None if there is none.
+    """
+    if nextHops[s, t] < 0:
+        return None
+    path = [int(s)]
+    vertex = s
+    while vertex != t:
+        vertex = int(nextHops[vertex, t])
+        path.append(vertex)
+    return path
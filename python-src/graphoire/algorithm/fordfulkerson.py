@@ -10,6 +10,7 @@ import copy
 
 from graphoire.labels import labelGraphVerticesWithIntegers
 from graphoire.component import findComponents
+from graphoire.traversal import Traversal
 
 class EdgeTolerance:
     def __init__(self, v1, v2, tol):
@@ -46,8 +47,6 @@ class FordFulkerson:
     def __init__(self, network):
         self.network = network
         self.edgeFlows = {}
-        self.R = [network.source]
-        self.S = []
         self.zeroEdgeFlows()
         self.enforceConstraints = False
         self.maxIterations = 1000
@@ -120,8 +119,6 @@ class FordFulkerson:
         foundMaxFlow = False
         while iteration < self.maxIterations:
             iteration += 1
-            self.R = [self.network.source]
-            self.S = []
             
             fpath = self.findAugmentingPath()
             if None == fpath:
@@ -138,110 +135,61 @@ class FordFulkerson:
             
         return foundMaxFlow
     
+    def residualTolerance(self, vtx, neighbor, edgeIndex):
+        """
+        Return the tolerance of network edge edgeIndex when crossed from
+        vtx to neighbor: its remaining capacity if it points that way,
+        otherwise its current flow (which could be pushed back).
+        """
+        edge = self.network.edges[edgeIndex]
+        if edge[0] == vtx:
+            return self.getEdgeTolerance(vtx, neighbor)
+        return self.getReverseEdgeTolerance(vtx, neighbor)
+
     def findAugmentingPath(self):
-        
-        availableEdgeTolerances = []
-        reachedSink = False
-        
-        while len(self.R) > 0 and False == reachedSink:
-            nextVertex = self.R.pop(0)
-            if nextVertex in self.S:
-                continue
-            
-            # Note as coded this is going to be breadth-first search
-            
-            adjacentTolerances = self.searchVertex(nextVertex)
-            
-            # note, nextVertex is now in S
-            if len(adjacentTolerances) > 0:
-                for adjVtx in adjacentTolerances:
-                    edgeTol = EdgeTolerance(nextVertex, adjVtx, adjacentTolerances[adjVtx])
-                    # save the edge vertices and tolerance found
-                    availableEdgeTolerances.append(edgeTol)
-                    
-                    if adjVtx == self.network.sink:
-                        reachedSink = True
-                    
-        if True == reachedSink:
-            # form a path from our edges connected to sink
-            fp = FeasiblePath()
-            fp.vertices.insert(0, self.network.sink)
-            
-            while len(availableEdgeTolerances) > 0:
-                nextEdgeTol = availableEdgeTolerances.pop()
-                if nextEdgeTol.v2 == fp.vertices[0]:
-                    
-                    fp.updateMinTolerance(nextEdgeTol.tol)
-                    fp.vertices.insert(0, nextEdgeTol.v1)
-                    if nextEdgeTol.v1 == self.network.source:
-                        break
-                        
-            return fp
-        else:
+        """
+        Return a FeasiblePath from source to sink along edges of positive
+        tolerance (forward or reversed), or None if there is none.
+
+        The search is a breadth-first Traversal ignoring edge direction,
+        filtered to edges with positive residual tolerance, and stopped
+        as soon as the sink is discovered; the path is read back from the
+        traversal's parent and tree-edge arrays.
+        """
+        source = self.network.source
+        sink = self.network.sink
+        traversal = Traversal(self.network, source, 'bfs', 'both', events=['discover'],
+                              edgeFilter=lambda u, v, e: self.residualTolerance(u, v, e) > 0)
+        for kind, vertex, parent in traversal:
+            if vertex == sink:
+                traversal.stop()
+        if not traversal.isDiscovered(sink) or sink == source:
             return None
-                    
-    def searchVertex(self, vtx):
-        foundEdgeTolerances = {}
-            
-        outNeighbors = self.network.getOutNeighbors(vtx)
-        for outNeighbor in outNeighbors:
-            if not outNeighbor in self.S: # don't check searched vertices
 
-                tol = self.getEdgeTolerance(vtx, outNeighbor)
-                if tol > 0:
-                    if not outNeighbor in self.R: 
-                        self.R.append(outNeighbor) # mark as reached
-                    foundEdgeTolerances[outNeighbor] = tol
-        
-        # also search for reverse-tolerances
-        inNeighbors = self.network.getInNeighbors(vtx)
-        for inNeighbor in inNeighbors:
-            if not inNeighbor in self.S: # don't check searched vertices
-                tol = self.getReverseEdgeTolerance(vtx, inNeighbor)
-                if tol > 0:
-                    if not inNeighbor in self.R: # mark as reached
-                        self.R.append(inNeighbor)
-                    foundEdgeTolerances[inNeighbor] = tol
-        
-        if vtx in self.S:
-            print (f"ERROR: unexpected, searchVertex called on {vtx} which is already in S")
-        else:
-            self.S.append(vtx)
-            
-        return foundEdgeTolerances
+        fp = FeasiblePath()
+        fp.vertices.insert(0, sink)
+        while fp.vertices[0] != source:
+            vertex = fp.vertices[0]
+            parent = traversal.parent[vertex]
+            fp.updateMinTolerance(self.residualTolerance(parent, vertex, traversal.parentEdge[vertex]))
+            fp.vertices.insert(0, parent)
+        return fp
      
     def findMinimumCutEdges(self):
-        # Find earliest edges at full capacity when traversing from source
-        tempR = [self.network.source]
-        tempS = []
-        
-        cutEdges = []
+        """
+        Return the saturated edges [tail, head] leading out of the set of
+        vertices reachable from the source along unsaturated forward
+        edges; with a maximum flow these form a minimum cut.
+        """
+        traversal = Traversal(self.network, self.network.source, 'dfs', 'out', events=['discover'],
+                              edgeFilter=lambda u, v, e: self.getEdgeTolerance(u, v) != 0)
+        reached = set(vertex for kind, vertex, parent in traversal)
 
-        while len(tempR) > 0:
-            vtx = tempR.pop()
-            
-            if vtx in tempS:
-                continue # already searched
-                
-            outNeighbors = self.network.getOutNeighbors(vtx)
-            for outNeighbor in outNeighbors:
-                if not outNeighbor in tempS: # don't check searched vertices
-                    tol = self.getEdgeTolerance(vtx, outNeighbor)
-                    if tol == 0:
-                        cutEdges.append([vtx, outNeighbor])
-                    else:
-                        tempR.append(outNeighbor)
-            tempS.append(vtx)
-        
-        # remove any edges that have both vertices in tempS
-        rmEdges = []
-        for edge in cutEdges:
-            if edge[0] in tempS and edge[1] in tempS:
-                rmEdges.append(edge)
-        
-        for edge in rmEdges:
-            cutEdges.remove(edge)
-            
+        cutEdges = []
+        for edge in self.network.edges:
+            if edge[0] in reached and not edge[1] in reached:
+                if self.getEdgeTolerance(edge[0], edge[1]) == 0:
+                    cutEdges.append([edge[0], edge[1]])
         return cutEdges
     
     def getTotalFlow(self):
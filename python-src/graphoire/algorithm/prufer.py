@@ -6,24 +6,26 @@ Created on Mon Mar  8 11:17:26 2021
 @author: Christopher Corbell
 """
 from graphoire.graph import Graph
-from graphoire.tree import findAllLeaves
-from graphoire.labels import labelGraphVerticesWithIntegers
+from graphoire.tree import isTree
+from graphoire.distance import breadthFirstLevels
 
-import copy
+import numpy as np
 
-def createPruferCode(G:Graph):
+def createPruferCode(G:Graph, asArray=False):
     """
     Create a Prüfer code for a given Graph object.
 
     Parameters
     ----------
     G : a Graph object.
+    asArray : bool, optional
+        Return the code as a numpy integer array instead of a list.
+        The default is False.
 
     Raises
     ------
     Exception
-        Raises if the algorithm cannot find leaves, which may happen if the 
-        graph is not a tree.
+        Raises if the graph is not a tree.
 
     Returns
     -------
@@ -31,54 +33,404 @@ def createPruferCode(G:Graph):
 
     Behavior
     --------
-    The algorithm creates a copy of the input graph on which it operates.
-    It first labels the graph using 1-based integer-value labels. Then
-    it applies the Prufer-code algorithm, finding lowest-label-valued leaf
-    and recording its neighbor's label, then deleting the leaf, etc.,
-    until only two vertices remain.
-    
-    So the return value is an integer sequence (returned as a python list)
-    built from one-based vertex labels.
-    """
-    # Make a copy of the graph that we can label and delete vertices
-    Gcopy = copy.copy(G)
-    
-    # we need one-based integer-incrementing labels on all the vertices
-    labelGraphVerticesWithIntegers(Gcopy, addValue=1)
-    
-    code = []
-    
-    while Gcopy.order() > 2:
-
-        # find the lowest-labeled leaf
-        leafIndices = findAllLeaves(Gcopy)
-        labelLeafTuples = []
-        for leafIndex in leafIndices:
-            leafLabel = Gcopy.getVertexLabel(leafIndex)
-            if None == leafLabel:
-                raise Exception(f"Error, no leaf label found for leaf index {leafIndex}")
-            labelLeafTuples.append((leafLabel, leafIndex))
-            
-        if len(labelLeafTuples) == 0:
-            # Error - maybe the graph was not a tree?
-            # No leaves found
-            raise Exception(f"Error, no leaves found in graph at size {Gcopy.order()}; it may not be a tree.")
-            
-        labelLeafTuples.sort()
-        # the first item is now the lowest-labeled leaf vertex
-        lowestLeafVertex = labelLeafTuples[0][1]
-        leafNeighbors = Gcopy.getNeighbors(lowestLeafVertex)
-        if len(leafNeighbors) != 1:
-            raise Exception(f"Unexpected error, {len(leafNeighbors)} neighbors found for leaf-vertex.")
-            
-        neighborLabel = Gcopy.getVertexLabel(leafNeighbors[0])
-        code.append(neighborLabel)
-        
-        # Now remove this leaf and continue
-        Gcopy.deleteVertex(lowestLeafVertex)
-        
+    Vertices are labeled with one-based integers (vertex index + 1).
+    The Prüfer code repeatedly removes the lowest-labeled leaf and
+    records its neighbor's label, until only two vertices remain.
+
+    So the return value is an integer sequence (returned as a python list
+    unless asArray is True) built from one-based vertex labels. The graph
+    is not modified.
+
+    Implementation: this is the linear-time pointer walk. The tree is
+    rooted at the highest vertex, which is never removed, so the neighbor
+    of each removed leaf is its parent. A pointer moves forward over the
+    degree array to find the next lowest leaf, except when removing a leaf
+    turns its parent into a lower-labeled leaf, which is then taken next.
+    Total time is O(n).
+    """
+    n = G.order()
+    if n <= 2:
+        if n > 0 and not isTree(G):
+            raise Exception(f"Error, graph of order {n} is not a tree.")
+        return np.zeros(0, dtype=np.int64) if asArray else []
+    if not isTree(G):
+        raise Exception(f"Error, graph of order {n} is not a tree.")
+
+    index = G.adjacencyIndex('both')
+    _, parentArray, _ = breadthFirstLevels(index, n - 1)
+    parent = parentArray.tolist()
+    degree = index.degrees().tolist()
+
+    code = [0] * (n - 2)
+    ptr = degree.index(1)
+    leaf = ptr
+    for i in range(0, n - 2):
+        neighbor = parent[leaf]
+        code[i] = neighbor + 1
+        degree[neighbor] -= 1
+        if degree[neighbor] == 1 and neighbor < ptr:
+            leaf = neighbor
+        else:
+            ptr += 1
+            while degree[ptr] != 1:
+                ptr += 1
+            leaf = ptr
+
+    if asArray:
+        return np.array(code, dtype=np.int64)
     return code
-    
+
+def pruferCodeToEdgeArray(code):
+    """
+    Decode a Prüfer code into the edges of its tree.
+
+    Parameters
+    ----------
+    code : list or numpy array of one-based vertex labels, as returned by
+        createPruferCode(). A code of length k describes a tree of order
+        k + 2.
+
+    Raises
+    ------
+    Exception
+        If a label is outside [1, k+2].
+
+    Returns
+    -------
+    A (k+1, 2) numpy integer array of zero-based edges, each with the
+    lower vertex index first, in the order the decoding produces them.
+
+    Implementation: the inverse pointer walk; vertex degrees are counted
+    from the code, and the lowest leaf is attached to each code entry in
+    turn, in O(n) total.
+    """
+    code = np.asarray(code, dtype=np.int64).reshape(-1) - 1
+    n = len(code) + 2
+    if len(code) > 0 and (code.min() < 0 or code.max() >= n):
+        raise Exception(f"Prüfer code labels must be in [1, {n}]")
+
+    degree = (np.bincount(code, minlength=n) + 1).tolist()
+    leaves = [0] * (n - 1)
+    ptr = degree.index(1)
+    leaf = ptr
+    for i, v in enumerate(code.tolist()):
+        leaves[i] = leaf
+        degree[v] -= 1
+        if degree[v] == 1 and v < ptr:
+            leaf = v
+        else:
+            ptr += 1
+            while degree[ptr] != 1:
+                ptr += 1
+            leaf = ptr
+    leaves[n - 2] = leaf
+    edges = np.column_stack((leaves, np.append(code, n - 1)))
+    edges.sort(axis=1)
+    return edges
+
 def graphFromPruferCode(code):
-    pass
+    """
+    Construct the tree for a Prüfer code.
 
+    Parameters
+    ----------
+    code : list or numpy array of one-based vertex labels.
+
+    Returns
+    -------
+    A Graph of order len(code) + 2 with sorted edges. Vertex index i
+    corresponds to code label i + 1; no vertex labels are set.
+    """
+    edges = pruferCodeToEdgeArray(code)
+    tree = Graph(len(edges) + 1)
+    tree.edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))].tolist()
+    return tree
+
+def pruferCodesToEdgeArrays(codes):
+    """
+    Decode a batch of Prüfer codes of equal length.
+
+    Parameters
+    ----------
+    codes : (K, k) integer array-like of one-based vertex labels, one code
+        per row; each row describes a tree of order k + 2.
+
+    Returns
+    -------
+    A (K, k+1, 2) numpy integer array of zero-based edges; row t holds the
+    edges of tree t, each with the lower vertex index first.
+
+    Implementation: the pointer walk of pruferCodeToEdgeArray() run in
+    lockstep over all K codes, so each step is a handful of array
+    operations over the batch. Small batches are decoded one at a time.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    if codes.ndim != 2:
+        raise Exception("Prüfer code batch must be a 2-dimensional array")
+    count, length = codes.shape
+    n = length + 2
+    if count < 32 or length == 0:
+        edges = np.empty((count, n - 1, 2), dtype=np.int64)
+        for t in range(0, count):
+            edges[t] = pruferCodeToEdgeArray(codes[t])
+        return edges
+    codes = codes - 1
+    if codes.min() < 0 or codes.max() >= n:
+        raise Exception(f"Prüfer code labels must be in [1, {n}]")
+
+    rows = np.arange(count, dtype=np.int64)
+    degree = np.bincount((codes + rows[:, None] * n).ravel(),
+                         minlength=count * n).reshape(count, n) + 1
+    leaves = np.empty((count, n - 1), dtype=np.int64)
+    ptr = np.argmax(degree == 1, axis=1)
+    leaf = ptr.copy()
+    for i in range(0, length):
+        v = codes[:, i]
+        leaves[:, i] = leaf
+        degree[rows, v] -= 1
+        take = (degree[rows, v] == 1) & (v < ptr)
+        leaf[take] = v[take]
+        pending = rows[~take]
+        advancing = pending
+        while len(pending) > 0:
+            ptr[pending] += 1
+            pending = pending[degree[pending, ptr[pending]] != 1]
+        leaf[advancing] = ptr[advancing]
+    leaves[:, n - 2] = leaf
+
+    parents = np.concatenate((codes, np.full((count, 1), n - 1, dtype=np.int64)), axis=1)
+    edges = np.stack((leaves, parents), axis=2)
+    edges.sort(axis=2)
+    return edges
+
+def truncatedPoissonRate(mean: float, cap: int):
+    """
+    Return the rate of the Poisson distribution truncated to [0, cap]
+    whose mean is the given value (which must be below cap).
+    """
+    k = np.arange(0, cap + 1)
+    logFactorial = np.cumsum(np.log(np.maximum(k, 1)))
+    low, high = 0.0, 1.0
+    while True:
+        weights = np.exp(k * np.log(high) - logFactorial)
+        if (k * weights).sum() / weights.sum() >= mean:
+            break
+        high *= 2.0
+    for i in range(0, 100):
+        mid = 0.5 * (low + high)
+        weights = np.exp(k * np.log(mid) - logFactorial)
+        if (k * weights).sum() / weights.sum() < mean:
+            low = mid
+        else:
+            high = mid
+    return 0.5 * (low + high)
+
+def randomDegreeBoundedPruferCodes(n: int, count: int, maxDegree: int, rng):
+    """
+    Draw count uniform random Prüfer codes of trees of order n whose
+    vertex degrees are at most maxDegree (2 <= maxDegree).
+
+    Returns a (count, n-2) array of one-based labels.
+
+    Behavior
+    --------
+    A vertex's degree is one more than its multiplicity in the code, so
+    the valid codes are the sequences of length n-2 with every
+    multiplicity at most maxDegree-1. Given the multiplicities, every
+    arrangement is equally likely, and the multiplicity vector of a
+    uniform valid code is distributed like independent Poisson(r) counts
+    truncated to [0, maxDegree-1], conditioned on summing to n-2 (for
+    any rate r). So the rate is tuned to make that sum typical, count
+    vectors are drawn in vectorized blocks and kept when they sum to
+    n-2, and each kept multiset is shuffled. The result is exactly
+    uniform; about sqrt(n) count vectors are drawn per accepted code.
+    """
+    length = n - 2
+    cap = maxDegree - 1
+    rate = truncatedPoissonRate(length / n, cap)
+    k = np.arange(0, cap + 1)
+    weights = np.exp(k * np.log(rate) - np.cumsum(np.log(np.maximum(k, 1))))
+    cdf = np.cumsum(weights / weights.sum())
+    cdf[-1] = 1.0
+
+    accepted = []
+    needed = count
+    while needed > 0:
+        block = max(1, min(int(needed * 3 * np.sqrt(n)) + 8, 4000000 // n))
+        multiplicity = np.searchsorted(cdf, rng.random((block, n)), side='right')
+        keep = multiplicity[multiplicity.sum(axis=1) == length][:needed]
+        accepted.append(keep)
+        needed -= len(keep)
+    multiplicity = np.concatenate(accepted)
+
+    labels = np.arange(1, n + 1, dtype=np.int64)
+    codes = np.empty((count, length), dtype=np.int64)
+    for t in range(0, count):
+        codes[t] = np.repeat(labels, multiplicity[t])
+    return rng.permuted(codes, axis=1)
+
+def randomPruferCodes(n: int, count: int = 1, seed=None, maxDegree=0):
+    """
+    Draw uniform random Prüfer codes of labeled trees.
+
+    Parameters
+    ----------
+    n : int
+        The tree order (at least 2).
+    count : int, optional
+        The number of codes to draw. The default is 1.
+    seed : None, int or numpy.random.Generator, optional
+        Seed for numpy.random.default_rng(); equal seeds give equal codes.
+    maxDegree : int, optional
+        If 2 or more, only codes of trees with no vertex degree above
+        maxDegree are drawn, uniformly among those. The default is 0
+        (no constraint).
+
+    Returns
+    -------
+    A (count, n-2) numpy array of one-based vertex labels.
+
+    Behavior
+    --------
+    Without a degree bound every code is an independent uniform draw.
+    With one, a block of unconstrained codes is drawn and the rows that
+    satisfy the bound are kept (rejection); when the bound is tight
+    enough that few rows survive, the remainder is drawn with
+    randomDegreeBoundedPruferCodes() instead. Both routes are uniform
+    over the constrained trees.
+    """
+    if n < 2:
+        raise Exception(f"Prüfer codes need a tree order of at least 2, got {n}")
+    rng = np.random.default_rng(seed)
+    length = n - 2
+    if maxDegree < 2 or maxDegree >= n - 1 or length == 0:
+        return rng.integers(1, n + 1, size=(count, length), dtype=np.int64)
+
+    codes = rng.integers(1, n + 1, size=(count, length), dtype=np.int64)
+    rows = np.arange(count, dtype=np.int64)
+    multiplicity = np.bincount(((codes - 1) + rows[:, None] * n).ravel(),
+                               minlength=count * n).reshape(count, n)
+    keep = codes[multiplicity.max(axis=1) < maxDegree]
+    if len(keep) == count:
+        return keep
+    if len(keep) * 4 >= count:
+        rest = randomPruferCodes(n, count - len(keep), rng, maxDegree)
+    else:
+        rest = randomDegreeBoundedPruferCodes(n, count - len(keep), maxDegree, rng)
+    return np.concatenate((keep, rest))
+
+def randomTreeEdgeArrays(n: int, count: int = 1, seed=None, maxDegree=0):
+    """
+    Sample uniform random labeled trees of order n as edge arrays.
+
+    Parameters are as for randomPruferCodes().
+
+    Returns
+    -------
+    A (count, n-1, 2) numpy integer array; row t holds the edges of tree
+    t in lexicographic order, each with the lower vertex index first.
+    """
+    edges = pruferCodesToEdgeArrays(randomPruferCodes(n, count, seed, maxDegree))
+    order = np.argsort(edges[:, :, 0] * n + edges[:, :, 1], axis=1)
+    return np.take_along_axis(edges, order[:, :, None], axis=1)
+
+def labeledTreeCount(n: int):
+    """
+    Return the number of labeled trees on n vertices, n^(n-2) (Cayley).
+    """
+    if n <= 2:
+        return 1 if n >= 1 else 0
+    return n ** (n - 2)
+
+def pruferCodeFromIndex(n: int, index: int):
+    """
+    Return the Prüfer code (as a list of one-based labels) of labeled tree
+    number index on n vertices, in the enumeration order of
+    enumerateLabeledTrees(): the code's digits, less one, are index
+    written in base n, most significant first.
+    """
+    if index < 0 or index >= labeledTreeCount(n):
+        raise Exception(f"Tree index {index} out of range for order {n}")
+    code = [0] * max(n - 2, 0)
+    for position in range(len(code) - 1, -1, -1):
+        index, digit = divmod(index, n)
+        code[position] = digit + 1
+    return code
+
+def pruferCodeIndex(code):
+    """
+    Return the enumeration index of a Prüfer code; the inverse of
+    pruferCodeFromIndex().
+    """
+    n = len(code) + 2
+    index = 0
+    for label in code:
+        index = index * n + (int(label) - 1)
+    return index
+
+def labeledTreeIndexRanges(n: int, parts: int):
+    """
+    Split the enumeration of labeled trees on n vertices into (at most)
+    parts contiguous (start, stop) index ranges of near-equal size, e.g.
+    one per worker process; each range can be passed to
+    enumerateLabeledTrees().
+    """
+    total = labeledTreeCount(n)
+    parts = max(1, min(parts, total))
+    bounds = [(total * i) // parts for i in range(0, parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(0, parts)]
+
+def enumerateLabeledTrees(n: int, start: int = 0, stop=None, batchSize: int = 8192):
+    """
+    Generate all labeled trees on n vertices, or a slice of them, as blocks
+    of compact edge arrays.
+
+    Parameters
+    ----------
+    n : int
+        The tree order.
+    start, stop : int, optional
+        The half-open range of tree indices to produce (see
+        pruferCodeFromIndex() for the numbering); by default all
+        n^(n-2) trees.
+    batchSize : int, optional
+        The number of trees per block. The default is 8192.
+
+    Yields
+    ------
+    Tuples (first, edges): first is the index of the block's first tree
+    and edges is a (B, n-1, 2) array of zero-based edges, tree first+t in
+    row t, with each edge's lower vertex first. The dtype is the smallest
+    unsigned integer type that holds n-1, to keep blocks compact.
+
+    Behavior
+    --------
+    Codes for a block are produced by adding the offsets 0..B-1 to the
+    digits of the first index with vectorized carries (so indices never
+    need to fit a machine integer), then decoded together with
+    pruferCodesToEdgeArrays(). No Graph objects are built. Disjoint
+    ranges from labeledTreeIndexRanges() can be enumerated independently
+    in separate processes.
+    """
+    total = labeledTreeCount(n)
+    stop = total if None == stop else min(stop, total)
+    if start < 0 or start > stop:
+        raise Exception(f"Invalid tree index range [{start}, {stop})")
+    length = max(n - 2, 0)
+    dtype = np.min_scalar_type(max(n - 1, 0))
+    first = start
+    while first < stop:
+        count = min(batchSize, stop - first)
+        base = pruferCodeFromIndex(n, first)
+        codes = np.empty((count, length), dtype=np.int64)
+        carry = np.arange(count, dtype=np.int64)
+        for position in range(length - 1, -1, -1):
+            digits = carry + (base[position] - 1)
+            codes[:, position] = digits % n
+            carry = digits // n
+        if n == 1:
+            edges = np.zeros((count, 0, 2), dtype=dtype)
+        else:
+            edges = pruferCodesToEdgeArrays(codes + 1).astype(dtype)
+        yield first, edges
+        first += count
@@ -6,72 +6,448 @@ Created on Fri Apr 16 22:45:48 2021
 @author: Christopher Corbell
 """
 
-from graphoire.graph import Graph, vertexNeighborFromEdge
-from graphoire.component import findComponents
+import numpy as np
 
+from graphoire.graph import Graph
+from graphoire.adjacencyindex import AdjacencyIndex
+from graphoire.traversal import Traversal
 
-def isCutVertex(vtx: int, G: Graph):
-    return False
+
+class BlockStructure:
+    """
+    BlockStructure holds the blocks (maximal biconnected subgraphs), cut
+    vertices and bridges of a graph, as found by findBlockStructure().
+
+    Every edge belongs to exactly one block, except that loops are
+    ignored, and an isolated vertex (one with no edges but loops) is a
+    block by itself. A vertex in more than one block is a cut vertex; a
+    block consisting of a single edge is a bridge. For a Digraph, edge
+    direction is ignored.
+
+    Blocks are numbered in ascending order of their sorted vertex lists.
+
+    Attributes
+    ----------
+    blocks : list of ascending vertex-index lists, one per block
+    edge_blocks : numpy array with the block number of every edge, in the
+        order of the graph's .edges list (-1 for a loop)
+    cut_vertex_mask : numpy boolean array, True at cut vertices
+    bridges : list of [v1, v2] bridge edges (lower vertex first)
+    vertex_block_ptr, vertex_blocks : CSR arrays listing the blocks that
+        contain each vertex, i.e. vertex_blocks[vertex_block_ptr[v]:
+        vertex_block_ptr[v+1]] are the block numbers containing v
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.edge_blocks = None
+        self.cut_vertex_mask = None
+        self.bridges = []
+        self.vertex_block_ptr = None
+        self.vertex_blocks = None
+
+    def __repr__(self):
+        return f"BlockStructure .blocks={self.blocks} .bridges={self.bridges}"
+
+    def blockCount(self):
+        return len(self.blocks)
+
+    def blocksWithVertex(self, vtx: int):
+        """
+        Return the block numbers of all blocks containing vertex vtx.
+        """
+        return self.vertex_blocks[self.vertex_block_ptr[vtx]:self.vertex_block_ptr[vtx+1]].tolist()
+
+    def cutVertices(self):
+        """
+        Return the cut vertices as an ascending list.
+        """
+        return np.flatnonzero(self.cut_vertex_mask).tolist()
+
+
+def findBlockStructure(G: Graph):
+    """
+    Return the BlockStructure of G, computing it if needed.
+
+    The structure is cached on the graph until the next change to its edge
+    list (see Graph.clearCaches()), so the other functions in this module
+    can be called repeatedly without recomputation.
+    """
+    if None == G.block_cache:
+        G.block_cache = computeBlockStructure(G)
+    return G.block_cache
+
+def computeBlockStructure(G: Graph):
+    """
+    Compute the BlockStructure of G without consulting the graph's cache.
+
+    Implementation: this is the Hopcroft-Tarjan low-link depth-first
+    search, driven by the events of a depth-first Traversal over a CSR
+    index of the simple graph, with an explicit edge stack, so it takes
+    O(n + m) time and has no recursion limit. Each time a tree edge
+    (u, v) finishes with low[v] >= disc[u], the edges above it on the edge
+    stack form one block.
+    """
+    n = G.n
+    # work on the underlying simple graph; the inverse maps each
+    # original edge to its position in the unique pair list
+    edges = G.edgeArray()
+    lowHigh = np.sort(edges, axis=1)
+    pairs, pairOfEdge = np.unique(lowHigh, axis=0, return_inverse=True)
+    pairs = pairs.reshape(-1, 2)
+    pairOfEdge = pairOfEdge.reshape(-1)
+    # loops take no part in blocks; their edges map to pair -1, and a
+    # vertex with only loops is isolated
+    notLoop = pairs[:, 0] != pairs[:, 1]
+    pairNumbers = np.cumsum(notLoop) - 1
+    pairOfEdge = np.where(notLoop[pairOfEdge], pairNumbers[pairOfEdge], -1) if len(pairOfEdge) > 0 else pairOfEdge
+    pairs = pairs[notLoop]
+    index = AdjacencyIndex.fromEdgeArray(n, pairs, 'both')
+    degrees = index.degrees()
+
+    disc = [-1] * n
+    low = [0] * n
+    pairBlocks = [-1] * len(pairs)
+    isolated = []
+    edgeStack = []
+    blockCount = 0
+    timer = 0
+
+    traversal = Traversal(index, events=['discover', 'tree', 'back', 'finish'])
+    parentPair = traversal.parentEdge
+    for kind, v, w in traversal:
+        if kind == 'discover':
+            disc[v] = low[v] = timer
+            timer += 1
+            if w == -1 and degrees[v] == 0:
+                isolated.append(v)
+        elif kind == 'tree':
+            edgeStack.append(traversal.edge)
+        elif kind == 'back':
+            # back edge to an ancestor
+            if disc[w] < low[v]:
+                low[v] = disc[w]
+            edgeStack.append(traversal.edge)
+        elif w != -1:
+            # v finished, w is its parent
+            if low[v] < low[w]:
+                low[w] = low[v]
+            if low[v] >= disc[w]:
+                # w separates v's subtree: pop its block
+                treePair = parentPair[v]
+                while True:
+                    pid = edgeStack.pop()
+                    pairBlocks[pid] = blockCount
+                    if pid == treePair:
+                        break
+                blockCount += 1
+
+    # (block, vertex) memberships, from block edges and isolated vertices
+    pairBlocks = np.array(pairBlocks, dtype=np.int64)
+    isolated = np.array(isolated, dtype=np.int64)
+    isolatedBlocks = np.arange(blockCount, blockCount + len(isolated), dtype=np.int64)
+    blockCount += len(isolated)
+    memberBlocks = np.concatenate((pairBlocks, pairBlocks, isolatedBlocks))
+    memberVertices = np.concatenate((pairs[:, 0], pairs[:, 1], isolated))
+    keys = np.unique(memberBlocks * n + memberVertices)
+    memberBlocks = keys // n
+    memberVertices = keys % n
+
+    splits = np.cumsum(np.bincount(memberBlocks, minlength=blockCount))[:-1]
+    blocks = [block.tolist() for block in np.split(memberVertices, splits)]
+
+    # renumber blocks in sorted order of their vertex lists
+    order = sorted(range(0, blockCount), key=lambda b: blocks[b])
+    renumber = np.empty(blockCount, dtype=np.int64)
+    renumber[order] = np.arange(blockCount, dtype=np.int64)
+
+    structure = BlockStructure()
+    structure.blocks = [blocks[b] for b in order]
+    pairBlocks = renumber[pairBlocks] if len(pairBlocks) > 0 else pairBlocks
+    structure.edge_blocks = np.full(len(pairOfEdge), -1, dtype=np.int64)
+    structure.edge_blocks[pairOfEdge >= 0] = pairBlocks[pairOfEdge[pairOfEdge >= 0]]
+
+    memberBlocks = renumber[memberBlocks]
+    byVertex = np.lexsort((memberBlocks, memberVertices))
+    structure.vertex_blocks = memberBlocks[byVertex]
+    structure.vertex_block_ptr = np.zeros(n + 1, dtype=np.int64)
+    blocksPerVertex = np.bincount(memberVertices, minlength=n)
+    np.cumsum(blocksPerVertex, out=structure.vertex_block_ptr[1:])
+    structure.cut_vertex_mask = blocksPerVertex > 1
+
+    pairsPerBlock = np.bincount(pairBlocks, minlength=blockCount)
+    structure.bridges = pairs[pairsPerBlock[pairBlocks] == 1].tolist()
+    return structure
+
+def isCutVertex(vtx, G: Graph):
+    """
+    Return True if vtx is a cut vertex of G, i.e., if deleting it would
+    increase the number of components.
+
+    Parameters
+    ----------
+    vtx : int, or a list / numpy array of ints
+        The vertex index, or many vertex indices for a batch query.
+    G : Graph
+
+    Returns
+    -------
+    A bool for a single vertex, or a numpy boolean array for a batch.
+    The block structure is computed once and cached on the graph.
+    """
+    mask = findBlockStructure(G).cut_vertex_mask
+    if np.ndim(vtx) == 0:
+        if vtx < 0 or vtx >= G.n:
+            raise Exception(f"Vertex index {vtx} out of range for graph order {G.n}")
+        return bool(mask[vtx])
+    return mask[np.asarray(vtx, dtype=np.int64)]
+
+def findCutVertices(G: Graph):
+    """
+    Return an ascending list of the cut vertices of G.
+    """
+    return findBlockStructure(G).cutVertices()
+
+def findBridges(G: Graph):
+    """
+    Return the bridges (cut edges) of G as a list of [v1, v2] edges with
+    the lower vertex index first.
+    """
+    return findBlockStructure(G).bridges
 
 def findBlocks(G: Graph):
-    
-    blocks = []
-    
-    comps = findComponents(G)
-    
-    for comp in comps:
-        if len(comp) == 1:
-            # isolated vertices are blocks
-            blocks.append(comp)
-            continue
-        
-        # find blocks in this component
-        
-        exploredEdges = []
-        visitedVertices = set()
-        
-        tree = {} # represented as dictionary of parent->immediate-child-list
-        treeV = set() # set of vertices in tree
-        
-        activeVertex = comp[0]
-        rootVertex = activeVertex
-        
-        while len(visitedVertices) < len(comp):
-            neighbor = None
-            unexploredEdge = None
-            
-            edges = G.getEdgesForVertex(activeVertex)
-            for edge in edges:
-                if not edge in exploredEdges:
-                    unexploredEdge = edge
-                    break
-            
-            if None != unexploredEdge:
-                neighbor = vertexNeighborFromEdge(activeVertex, edge)
-                exploredEdges.append(edge)
-                    
-                if not neighbor in treeV:
-                    if not activeVertex in tree:
-                        tree[activeVertex] = [neighbor]
-                        activeVertex = neighbor
-                    else:
-                        tree[activeVertex].append(neighbor)
-                    treeV.add(neighbor)
-                
-                        
-                        
-                
-                
-            
-        
-        
-                
-    return blocks
+    """
+    Find the blocks of G.
+
+    Returns
+    -------
+    A list of blocks, each an ascending list of vertex indices. Isolated
+    vertices are blocks of their own. See BlockStructure for ordering.
+    """
+    return findBlockStructure(G).blocks
 
+def findBlocksWithVertex(vtx: int, G: Graph):
+    """
+    Return all blocks (as vertex lists) containing vtx; there is more than
+    one exactly when vtx is a cut vertex.
+    """
+    structure = findBlockStructure(G)
+    return [structure.blocks[b] for b in structure.blocksWithVertex(vtx)]
 
 def findBlockWithVertex(vtx: int, G: Graph):
-    block = []
-    
-    return block
+    """
+    Return the lowest-numbered block (as a vertex list) containing vtx.
+    A cut vertex belongs to several blocks; use findBlocksWithVertex()
+    to get all of them.
+    """
+    if vtx < 0 or vtx >= G.n:
+        raise Exception(f"Vertex index {vtx} out of range for graph order {G.n}")
+    return findBlocksWithVertex(vtx, G)[0]
+
+
+class BlockCutTree:
+    """
+    BlockCutTree is the block-cut tree (forest, for a disconnected graph)
+    of a graph: it has one node per block and one node per cut vertex,
+    with an edge between a block node and a cut-vertex node whenever the
+    cut vertex belongs to the block.
+
+    Nodes 0 to B-1 are the blocks, numbered as in the graph's
+    BlockStructure; nodes B and up are the cut vertices in ascending order.
+    Every graph vertex maps to one node: its cut-vertex node if it is a
+    cut vertex, otherwise the single block containing it.
+
+    Every u-v path in the graph passes through exactly the blocks and cut
+    vertices on the tree path between the nodes of u and v, so separation
+    queries reduce to path tests in the tree. Each tree is rooted and a
+    binary-lifting ancestor table is kept, so the lowest common ancestor
+    of two nodes - and with it path membership - is found in O(log n).
+    The query methods accept single vertices or arrays of vertices.
+    """
+
+    def fromBlockStructure(structure: BlockStructure):
+        """
+        Build the block-cut tree for a BlockStructure.
+        """
+        B = structure.blockCount()
+        n = len(structure.cut_vertex_mask)
+        cutVertices = np.flatnonzero(structure.cut_vertex_mask)
+        C = len(cutVertices)
+        N = B + C
+
+        # vertex -> node: cut vertices get their own node, others their block
+        vertexNodes = structure.vertex_blocks[structure.vertex_block_ptr[:-1]].copy() if n > 0 else np.zeros(0, dtype=np.int64)
+        vertexNodes[cutVertices] = B + np.arange(C, dtype=np.int64)
+
+        counts = np.diff(structure.vertex_block_ptr)[cutVertices]
+        treeEdges = np.column_stack((np.repeat(B + np.arange(C, dtype=np.int64), counts),
+                                     np.concatenate([structure.blocksWithVertex(v) for v in cutVertices]) if C > 0 else np.zeros(0, dtype=np.int64)))
+        index = AdjacencyIndex.fromEdgeArray(N, treeEdges, 'both')
+
+        # root every tree at its lowest-numbered node, breadth first
+        parent = np.full(N, -1, dtype=np.int64)
+        treeIds = np.full(N, -1, dtype=np.int64)
+        traversal = Traversal(index, order='bfs', events=['discover'])
+        root = -1
+        for kind, node, above in traversal:
+            if above == -1:
+                root = above = node
+            parent[node] = above
+            treeIds[node] = root
+        depth = np.array(traversal.depth, dtype=np.int64)
+
+        tree = BlockCutTree()
+        tree.block_count = B
+        tree.cut_vertices = cutVertices
+        tree.vertex_nodes = vertexNodes
+        tree.parent = parent
+        tree.depth = depth
+        tree.tree_ids = treeIds
+        levels = max(1, int(depth.max()).bit_length()) if N > 0 else 1
+        tree.ancestors = [parent]
+        for _ in range(1, levels):
+            tree.ancestors.append(tree.ancestors[-1][tree.ancestors[-1]])
+        return tree
+
+    def __init__(self):
+        self.block_count = 0
+        self.cut_vertices = None
+        self.vertex_nodes = None
+        self.parent = None
+        self.depth = None
+        self.tree_ids = None
+        self.ancestors = []
+
+    def __repr__(self):
+        return f"BlockCutTree .block_count={self.block_count} .cut_vertices={self.cut_vertices.tolist()}"
+
+    def nodeCount(self):
+        return len(self.parent)
+
+    def isBlockNode(self, node):
+        return node < self.block_count
+
+    def nodeOf(self, vertices):
+        """
+        Map graph vertices to tree nodes.
+        """
+        vertices = np.asarray(vertices, dtype=np.int64)
+        if vertices.size > 0 and (vertices.min() < 0 or vertices.max() >= len(self.vertex_nodes)):
+            raise Exception(f"Vertex index out of range for graph order {len(self.vertex_nodes)}")
+        return self.vertex_nodes[vertices]
+
+    def lowestCommonAncestor(self, a, b):
+        """
+        Return the lowest common ancestor of tree nodes a and b (arrays of
+        nodes are accepted); the nodes must be in the same tree.
+        """
+        a = np.array(a, dtype=np.int64, ndmin=1)
+        b = np.array(b, dtype=np.int64, ndmin=1)
+        swap = self.depth[a] < self.depth[b]
+        a, b = np.where(swap, b, a), np.where(swap, a, b)
+        climb = self.depth[a] - self.depth[b]
+        for k in range(0, len(self.ancestors)):
+            jump = ((climb >> k) & 1) == 1
+            a = np.where(jump, self.ancestors[k][a], a)
+        for k in range(len(self.ancestors) - 1, -1, -1):
+            upA = self.ancestors[k][a]
+            upB = self.ancestors[k][b]
+            move = upA != upB
+            a = np.where(move, upA, a)
+            b = np.where(move, upB, b)
+        return np.where(a == b, a, self.parent[a])
+
+    def nodeDistance(self, a, b):
+        """
+        Return the number of tree edges between nodes a and b.
+        """
+        c = self.lowestCommonAncestor(a, b)
+        return self.depth[a] + self.depth[b] - 2 * self.depth[c]
+
+    def separates(self, v, u, w):
+        """
+        Return True if deleting vertex v would disconnect vertex u from
+        vertex w. Arrays of vertices are accepted for a batch query, in
+        which case a boolean array is returned.
+
+        Vertices u and w that are not connected in the first place are
+        never 'disconnected' by v, so the result is False for them.
+
+        Raises
+        ------
+        Exception if v equals u or w.
+        """
+        scalar = np.ndim(v) == 0 and np.ndim(u) == 0 and np.ndim(w) == 0
+        v, u, w = np.broadcast_arrays(np.atleast_1d(v), np.atleast_1d(u), np.atleast_1d(w))
+        if np.any(v == u) or np.any(v == w):
+            raise Exception("separates() requires v to differ from u and w")
+        x = self.nodeOf(v)
+        a = self.nodeOf(u)
+        b = self.nodeOf(w)
+        result = (x >= self.block_count) & (self.tree_ids[a] == self.tree_ids[b]) & (self.tree_ids[a] == self.tree_ids[x])
+        if result.any():
+            onPath = self.nodeDistance(a[result], x[result]) + self.nodeDistance(x[result], b[result]) == self.nodeDistance(a[result], b[result])
+            result[result] = onPath
+        if scalar:
+            return bool(result[0])
+        return result
+
+    def pathNodes(self, a, b):
+        """
+        Return the list of tree nodes on the path from node a to node b
+        (inclusive), which must be in the same tree.
+        """
+        c = int(self.lowestCommonAncestor(a, b)[0])
+        head = []
+        while a != c:
+            head.append(int(a))
+            a = self.parent[a]
+        tail = []
+        while b != c:
+            tail.append(int(b))
+            b = self.parent[b]
+        tail.reverse()
+        return head + [c] + tail
+
+    def blocksOnAllPaths(self, u, w):
+        """
+        Return the block numbers (ascending) of the blocks that every path
+        from vertex u to vertex w passes through. The result is empty if
+        u == w or if u and w are not connected.
+        """
+        a, b = self.nodeOf([u, w])
+        if u == w or self.tree_ids[a] != self.tree_ids[b]:
+            return []
+        nodes = self.pathNodes(a, b)
+        return sorted([node for node in nodes if node < self.block_count])
+
+    def cutVerticesOnAllPaths(self, u, w):
+        """
+        Return the cut vertices (ascending), other than u and w themselves,
+        that every path from vertex u to vertex w passes through. The
+        result is empty if u and w are not connected.
+        """
+        a, b = self.nodeOf([u, w])
+        if u == w or self.tree_ids[a] != self.tree_ids[b]:
+            return []
+        vertices = [int(self.cut_vertices[node - self.block_count]) for node in self.pathNodes(a, b) if node >= self.block_count]
+        return sorted([v for v in vertices if v != u and v != w])
+
 
+def findBlockCutTree(G: Graph):
+    """
+    Return the BlockCutTree of G. The tree is built from the graph's
+    BlockStructure and cached on the graph until the next change to its
+    edge list (see Graph.clearCaches()).
+    """
+    if None == G.block_cut_tree_cache:
+        G.block_cut_tree_cache = BlockCutTree.fromBlockStructure(findBlockStructure(G))
+    return G.block_cut_tree_cache
 
+def vertexSeparates(v, u, w, G: Graph):
+    """
+    Return True if deleting vertex v would disconnect vertex u from vertex
+    w in G, without modifying G. See BlockCutTree.separates(), which also
+    accepts arrays for batch queries.
+    """
+    return findBlockCutTree(G).separates(v, u, w)
@@ -6,7 +6,16 @@ Created on Sat Mar  6 11:28:27 2021
 @author: Christopher Corbell
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
 from graphoire.graph import Graph
+from graphoire.unionfind import UnionFind, minimumRootForest
+from graphoire.traversal import reachableVertices
 
 def isEulerian(G: Graph):
     """
@@ -25,13 +34,153 @@ def isConnected(G: Graph):
         # not possible to be connected
         return False
     
-    # get the component for the first vertex
-    comp0 = findComponentWithVertex(G, 0)
+    return componentCount(G) == 1
+
+def componentLabels(G: Graph, workers=None):
+    """
+    Return an array with the component label of every vertex.
+
+    Parameters
+    ----------
+    G : The Graph object.
+    workers : int, optional
+        Number of worker processes to use when the labels have to be
+        computed; see computeComponentLabelsParallel(). The default is
+        None (compute serially).
+
+    Behavior
+    --------
+    Components are numbered 0, 1, 2... in order of their lowest vertex
+    index, so vertex 0 is always in component 0, and the numbering matches
+    the order of the lists returned by findComponents(). As with
+    findComponentWithVertex(), edge direction is ignored for a Digraph.
+    
+    The labels are cached on the graph and reused until the next change
+    to its edge list (see Graph.clearCaches()), so repeated connectivity
+    queries against an unchanged graph cost one array lookup each.
+    Callers should treat the returned array as read-only. If an
+    IncrementalConnectivity structure is attached to the graph, the labels
+    are taken from it instead.
+
+    Returns
+    -------
+    A numpy integer array of length G.n.
+    """
+    if None != G.connectivity:
+        return G.connectivity.labels()
+    if G.component_label_cache is None:
+        if None != workers and workers > 1:
+            G.component_label_cache = computeComponentLabelsParallel(G, workers)
+        else:
+            G.component_label_cache = computeComponentLabels(G)
+    return G.component_label_cache
+
+def computeComponentLabels(G: Graph):
+    """
+    Compute component labels for G without consulting or updating the
+    graph's cache; see componentLabels().
+    """
+    if G.n == 0:
+        return np.zeros(0, dtype=np.int64)
     
-    # If this component is smaller than G, some
-    # vertex is not connected to v=0, so the graph
-    # is not connected
-    return len(comp0) == G.n
+    edges = G.edgeArray()
+    A = coo_matrix((np.ones(len(edges), dtype=np.int8), (edges[:, 0], edges[:, 1])), shape=(G.n, G.n))
+    _, labels = connected_components(A, directed=False)
+    return canonicalizeComponentLabels(labels)
+
+def computeComponentLabelsParallel(G: Graph, workers: int):
+    """
+    Compute component labels for G using a pool of worker processes,
+    without consulting or updating the graph's cache.
+
+    Parameters
+    ----------
+    G : The Graph object.
+    workers : int
+        The number of worker processes, which is also the number of
+        edge shards.
+
+    Behavior
+    --------
+    The edge array is copied once into shared memory and split into
+    contiguous shards. Each worker builds a union-find forest for its
+    shard (see unionfind.minimumRootForest) and writes the resulting
+    root array into its own row of a shared output block, so neither
+    edges nor results are pickled. The partial forests are then merged
+    by treating every (vertex, shard-root) pair as an edge of one final
+    forest. The returned labels are numbered exactly as by
+    computeComponentLabels().
+    """
+    edges = G.edgeArray()
+    n = G.n
+    m = len(edges)
+    workers = min(workers, m)
+    if workers <= 1 or n == 0:
+        return computeComponentLabels(G)
+    
+    edgeBlock = SharedMemory(create=True, size=edges.nbytes)
+    rootBlock = SharedMemory(create=True, size=workers * n * 8)
+    try:
+        np.ndarray(edges.shape, dtype=np.int64, buffer=edgeBlock.buf)[:] = edges
+        bounds = np.linspace(0, m, workers + 1).astype(np.int64)
+        tasks = [(edgeBlock.name, m, rootBlock.name, n, shard, int(bounds[shard]), int(bounds[shard+1]))
+                 for shard in range(0, workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(labelEdgeShardWorker, tasks))
+            
+        roots = np.ndarray((workers, n), dtype=np.int64, buffer=rootBlock.buf)
+        vertices = np.tile(np.arange(n, dtype=np.int64), workers)
+        forestEdges = np.column_stack((vertices, roots.reshape(-1)))
+        forestEdges = forestEdges[forestEdges[:, 0] != forestEdges[:, 1]]
+        parent = minimumRootForest(n, forestEdges)
+        del roots
+    finally:
+        edgeBlock.close()
+        edgeBlock.unlink()
+        rootBlock.close()
+        rootBlock.unlink()
+        
+    return canonicalizeComponentLabels(parent)
+
+def labelEdgeShardWorker(task):
+    """
+    Worker-process entry point for computeComponentLabelsParallel();
+    builds the forest for one edge shard and stores its root array.
+    """
+    edgeName, m, rootName, n, shard, lo, hi = task
+    edgeBlock = SharedMemory(name=edgeName)
+    rootBlock = SharedMemory(name=rootName)
+    try:
+        edges = np.ndarray((m, 2), dtype=np.int64, buffer=edgeBlock.buf)
+        roots = np.ndarray((n,), dtype=np.int64, buffer=rootBlock.buf, offset=shard * n * 8)
+        roots[:] = np.arange(n, dtype=np.int64)
+        minimumRootForest(n, edges[lo:hi], parent=roots)
+        del edges, roots
+    finally:
+        edgeBlock.close()
+        rootBlock.close()
+    return shard
+
+def canonicalizeComponentLabels(labels):
+    """
+    Renumber an array of component labels so that components are numbered 
+    0, 1, 2... in order of their lowest vertex index.
+    """
+    _, firstVertex, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    renumber = np.empty(len(firstVertex), dtype=np.int64)
+    renumber[np.argsort(firstVertex)] = np.arange(len(firstVertex))
+    return renumber[inverse.reshape(-1)]
+
+def componentCount(G: Graph):
+    """
+    Return the number of components of the graph.
+    """
+    if None != G.connectivity:
+        return G.connectivity.componentCount()
+    labels = componentLabels(G)
+    if len(labels) == 0:
+        return 0
+    return int(labels.max()) + 1
 
 def verticesAreConnected(G: Graph, vertices):
     """
@@ -51,26 +200,54 @@ def verticesAreConnected(G: Graph, vertices):
     -------
     True if all requested vertices are connected (in the same component).
     """
-    comps = findComponents(G)
-    vertexNotFound = True
-    for comp in comps:
-        if vertices[0] in comp:
-            for vi in range(1, len(vertices)):
-                if not vertices[vi] in comp:
-                    return False
-            # all vertices are in same component
-            return True
-    if vertexNotFound:
-        # if we get here's there's an input error
-        raise Exception(f"Bad vertex parameter - vertex {vertices[0]} not in any component")
-    
-def findComponents(G: Graph):
+    for vertex in vertices:
+        if vertex < 0 or vertex >= G.n:
+            raise Exception(f"Bad vertex parameter - vertex {vertex} not in any component")
+    if None != G.connectivity:
+        for vi in range(1, len(vertices)):
+            if not G.connectivity.connected(vertices[0], vertices[vi]):
+                return False
+        return True
+    labels = componentLabels(G)
+    return bool(np.all(labels[np.asarray(vertices)] == labels[vertices[0]]))
+
+def verticesAreConnectedMany(G: Graph, pairs):
+    """
+    Test many vertex pairs for connection at once.
+
+    Parameters
+    ----------
+    G : The Graph object.
+    pairs : a list of [u, v] vertex pairs, or an equivalent (k, 2) 
+      numpy integer array.
+
+    Raises
+    ------
+    Exception if a vertex index is invalid / out-of-range.
+
+    Returns
+    -------
+    A numpy boolean array of length k; entry i is True if the vertices
+    of pair i are in the same component.
+    """
+    labels = componentLabels(G)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if len(pairs) > 0 and (pairs.min() < 0 or pairs.max() >= G.n):
+        raise Exception(f"Bad vertex parameter - pairs contain vertices outside [0,{G.n-1}]")
+    return labels[pairs[:, 0]] == labels[pairs[:, 1]]
+    
+def findComponents(G: Graph, workers=None):
     """
     Find all the components of the Graph.
 
     Parameters
     ----------
     G : The graph
+    workers : int, optional
+        Number of worker processes used to label components over shards
+        of the edge array; see computeComponentLabelsParallel(). The
+        result is identical to the serial computation. The default is
+        None (serial).
 
     Behavior:
         A component is represented as a list of vertex integer indices.
@@ -83,31 +260,14 @@ def findComponents(G: Graph):
     -------
     components : list of vertex-index component lists. Components are sorted ascending.
     """
-    components = []
-    visited = set()
-    
-    vCursor = 0
+    labels = componentLabels(G, workers)
+    if len(labels) == 0:
+        return []
     
-    while len(visited) < G.n:
-        component = findComponentWithVertex(G, vCursor)
-        #print(f"DEBUG - got component for vertex {vCursor}: {component}")
-        components.append(component)
-        for v in component:
-            visited.add(v)
-        
-        if len(visited) < G.n:
-            # find next unused vertex index
-            for vNext in range(0, G.n):
-                if vNext in visited:
-                    continue
-                vCursor = vNext
-                #print(f"DEBUG - checking {vCursor} next loop...")
-                break
-            if vNext >= G.n:
-            	# raise exception?
-                print("UNEXPECTED: could not find available vertex from loop")
-                
-    return components
+    # a stable sort keeps each component's vertices ascending
+    vertices = np.argsort(labels, kind='stable')
+    sizes = np.bincount(labels)
+    return [component.tolist() for component in np.split(vertices, np.cumsum(sizes)[:-1])]
         
 def findComponentWithVertex(G: Graph, vertex: int):
     """
@@ -125,23 +285,152 @@ def findComponentWithVertex(G: Graph, vertex: int):
     Note this works the same for undirected and directed graphs,
     edge direction does not matter in determining component.
     """
-    componentSet = set()
-    componentSet.add(vertex)
-    
-    unprocessedVertices = set()
-    unprocessedVertices.add(vertex)
-    while len(unprocessedVertices) > 0:
-        nextVertex = unprocessedVertices.pop()
-        edges = G.getEdgesForVertex(nextVertex)
-        for edge in edges:
-            if not edge[0] in componentSet:
-                componentSet.add(edge[0])
-                unprocessedVertices.add(edge[0])
-                
-            if not edge[1] in componentSet:
-                componentSet.add(edge[1])
-                unprocessedVertices.add(edge[1])
+    return reachableVertices(G, vertex, direction='both')
+
+
+class ConnectivityClient:
+    """
+    Base class for objects that want to be notified of changes to an
+    IncrementalConnectivity structure; override the methods of interest.
+    """
+    def __init__(self):
+        pass
+    
+    def componentsMerged(self, connectivity, root, absorbed):
+        """
+        Called when an added edge joins two components. The component
+        represented by vertex absorbed is now part of the component
+        represented by vertex root.
+        """
+        pass
+    
+    def connectivityRebuilt(self, connectivity):
+        """
+        Called after the structure has been rebuilt from the graph's
+        edge list, e.g. on the first query following an edge deletion.
+        """
+        pass
+
+class IncrementalConnectivity:
+    """
+    IncrementalConnectivity keeps the components of a graph current while
+    edges are added to it. It attaches itself to the graph (as
+    G.connectivity); Graph.addEdge() then feeds every new edge into a
+    UnionFind forest, so the component count, component sizes and
+    same-component tests stay up to date in amortized near-constant time
+    per edge instead of being recomputed from scratch.
+    
+    Union-find cannot split components, so edge or vertex deletions just
+    mark the structure stale; it is rebuilt from the edge list on the next
+    query. While attached, componentLabels(), componentCount(),
+    findComponents() and verticesAreConnected() answer from this structure.
+    
+    An optional ConnectivityClient is notified when components merge and
+    when the structure is rebuilt.
+    """
+    
+    def __init__(self, G: Graph, client=None):
+        self.graph = G
+        self.client = client
+        self.unionFind = None
+        self.stale = True
+        self.label_cache = None
+        
+        G.connectivity = self
+        self.rebuild()
+        
+    def detach(self):
+        """
+        Stop receiving edge updates from the graph.
+        """
+        if self.graph.connectivity is self:
+            self.graph.connectivity = None
+        
+    def edgeAdded(self, v1, v2):
+        """
+        Update the structure for a newly added edge; called by the graph.
+        """
+        if self.stale:
+            # the next query rebuilds from the full edge list anyway
+            return
+        merged = self.unionFind.union(v1, v2)
+        if None != merged:
+            self.label_cache = None
+            if None != self.client:
+                self.client.componentsMerged(self, merged[0], merged[1])
                 
-    result = list(componentSet)
-    result.sort()
-    return result
+    def invalidate(self):
+        """
+        Mark the structure stale, e.g. after an edge deletion; called by
+        the graph.
+        """
+        self.stale = True
+        self.label_cache = None
+        
+    def rebuild(self):
+        """
+        Rebuild the union-find forest from the graph's current edge list.
+        """
+        labels = computeComponentLabels(self.graph)
+        uf = UnionFind(self.graph.n)
+        if self.graph.n > 0:
+            # point every vertex directly at the lowest vertex of its component
+            sizes = np.bincount(labels)
+            _, lowest = np.unique(labels, return_index=True)
+            uf.parent = lowest[labels]
+            uf.size[lowest] = sizes
+            uf.count = len(sizes)
+        
+        self.unionFind = uf
+        self.label_cache = labels
+        self.stale = False
+        if None != self.client:
+            self.client.connectivityRebuilt(self)
+            
+    def current(self):
+        """
+        Return the UnionFind forest, rebuilding it first if it is stale.
+        """
+        if self.stale or self.unionFind.n != self.graph.n:
+            self.rebuild()
+        return self.unionFind
+    
+    def checkVertex(self, vertex):
+        if vertex < 0 or vertex >= self.graph.n:
+            raise Exception(f"Vertex index {vertex} out of range for graph order {self.graph.n}")
+    
+    def componentCount(self):
+        """
+        Return the current number of components.
+        """
+        return self.current().count
+    
+    def find(self, vertex):
+        """
+        Return the representative vertex of the component containing vertex.
+        """
+        self.checkVertex(vertex)
+        return self.current().find(vertex)
+    
+    def connected(self, u, v):
+        """
+        Return True if vertices u and v are in the same component.
+        """
+        return self.find(u) == self.find(v)
+    
+    def componentSize(self, vertex):
+        """
+        Return the number of vertices in the component containing vertex.
+        """
+        self.checkVertex(vertex)
+        return self.current().setSize(vertex)
+    
+    def labels(self):
+        """
+        Return component labels numbered as by componentLabels(). The array
+        is rebuilt only after components have changed.
+        """
+        uf = self.current()
+        if self.label_cache is None:
+            self.label_cache = canonicalizeComponentLabels(uf.roots())
+        return self.label_cache
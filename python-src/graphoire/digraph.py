@@ -10,6 +10,8 @@ Things we can use here:
     - DigraphFactory to construct some interesting digraphs
 """
 
+import numpy as np
+
 from graphoire.graph import Graph
 
 class Digraph(Graph):
@@ -31,12 +33,13 @@ class Digraph(Graph):
         edge = [i, j]
         if not edge in self.edges:
             self.edges.append(edge)
+            if None != self.connectivity:
+                self.connectivity.edgeAdded(i, j)
         
         if True == sortEdges:
             self.sortEdges()
             
-        self.degree_cache.clear()
-        self.indegree_cache.clear()
+        self.clearCaches()
         
     def vertexDegree(self, n):
         return self.vertexOutDegree(n)
@@ -57,6 +60,19 @@ class Digraph(Graph):
         self.degree_cache[n] = degree
         return degree
     
+    def degreeArray(self):
+        """
+        Return the out-degrees of all vertices as a numpy integer array
+        (consistent with vertexDegree()).
+        """
+        return np.bincount(self.edgeArray()[:, 0], minlength=self.n)
+    
+    def inDegreeArray(self):
+        """
+        Return the in-degrees of all vertices as a numpy integer array.
+        """
+        return np.bincount(self.edgeArray()[:, 1], minlength=self.n)
+    
     def vertexInDegree(self, n):
         if n >= self.n:
             raise Exception(f"Vertex index {n} out of range for graph degree {self.n}")
@@ -7,6 +7,7 @@ Created on Sat Mar  6 10:07:47 2021
 """
 
 from graphoire.digraph import Digraph
+from graphoire.graphfactory import randomWeightedEdges
 
 class DigraphFactory:
     def makePath(n: int):
@@ -32,4 +33,17 @@ class DigraphFactory:
                 bip.edges.append([j, i])
         bip.edges.sort()
         return bip
-    
\ No newline at end of file
+
+    def makeRandomWeighted(n: int, m: int, low=1, high=10, integral=True, acyclic=False, seed=None):
+        """
+        Return a random Digraph with edge weights and no loops or
+        parallel edges, from m uniformly drawn (tail, head) pairs.
+
+        With acyclic, every edge goes from a lower to a higher vertex, so
+        there are no cycles (and negative weights are safe). low, high,
+        integral and seed are as for GraphFactory.makeRandomWeighted().
+        """
+        D = Digraph(n)
+        D.edges, weights = randomWeightedEdges(n, m, low, high, integral, seed, acyclic)
+        D.setEdgeWeights(None, weights)
+        return D
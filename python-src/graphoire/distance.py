@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:20:44 2026
+
+@author: mathaes
+
+graphoire.distance contains unweighted (hop-count) distance facilities
+built on breadth-first search over a graph's AdjacencyIndex. Searches are
+level-synchronous: each BFS level is expanded with whole-array numpy
+operations, so the Python-level work is per level rather than per edge.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from graphoire.graph import Graph
+from graphoire.adjacencyindex import AdjacencyIndex
+from graphoire.component import componentLabels
+
+def breadthFirstLevels(index: AdjacencyIndex, sources):
+    """
+    Run a breadth-first search from one or more sources over an index.
+
+    Parameters
+    ----------
+    index : AdjacencyIndex
+        The neighbor index to search (see Graph.adjacencyIndex()).
+    sources : int or list / numpy array of ints
+        The start vertices; all are at distance 0.
+
+    Returns
+    -------
+    A tuple (dist, parent, order) of numpy integer arrays: dist[v] is the
+    hop distance from the nearest source (-1 if unreached), parent[v] is
+    v's predecessor in a BFS forest (-1 for sources and unreached
+    vertices), and order lists the reached vertices by nondecreasing
+    distance, ascending within each level.
+    """
+    dist = np.full(index.n, -1, dtype=np.int64)
+    parent = np.full(index.n, -1, dtype=np.int64)
+    frontier = np.unique(np.atleast_1d(np.asarray(sources, dtype=np.int64)))
+    dist[frontier] = 0
+    levels = [frontier]
+    level = 0
+    while len(frontier) > 0:
+        level += 1
+        origins, slots = index.expand(frontier)
+        reached = index.indices[slots]
+        fresh = dist[reached] < 0
+        reached, first = np.unique(reached[fresh], return_index=True)
+        dist[reached] = level
+        parent[reached] = origins[fresh][first]
+        frontier = reached
+        levels.append(frontier)
+    return dist, parent, np.concatenate(levels)
+
+def bfsDistances(G: Graph, sources, direction='out'):
+    """
+    Return an array of hop distances from the nearest of the given source
+    vertices to every vertex of G (-1 where unreachable).
+
+    Parameters
+    ----------
+    G : Graph
+    sources : int or list / numpy array of ints
+    direction : str, optional
+        For a Digraph, 'out' follows edges forward, 'in' backward and
+        'both' ignores direction. The default is 'out'.
+    """
+    dist, _, _ = breadthFirstLevels(G.adjacencyIndex(direction), sources)
+    return dist
+
+def distance(G: Graph, u: int, v: int):
+    """
+    Return the distance (length of a minimum-length path) from u to v,
+    or -1 if there is no such path.
+    """
+    return int(bfsDistances(G, u)[v])
+
+class DistanceMetrics:
+    """
+    DistanceMetrics holds exact all-pairs (hop-count) distance statistics
+    of a graph, as found by findDistanceMetrics().
+
+    Attributes
+    ----------
+    eccentricity : numpy integer array
+        The greatest distance from each vertex to any vertex it reaches.
+    transmission : numpy integer array
+        The sum of distances from each vertex to the vertices it reaches.
+    reach : numpy integer array
+        The number of vertices each vertex reaches, itself included.
+    connected : bool
+        True if every vertex reaches every other (for a Digraph searched
+        with direction 'out' or 'in', strong connectivity).
+    diameter, radius : int or math.inf
+        The greatest and least eccentricity; infinite if not connected.
+    center : numpy integer array
+        The vertices of least eccentricity (all vertices if not connected,
+        since then every eccentricity is infinite).
+    wiener : int
+        The Wiener index: the sum of d(u, v) over unordered pairs of an
+        undirected graph, or over ordered pairs of a directed search.
+        Pairs with no path between them are left out.
+
+    When the graph is not connected, eccentricity and transmission are
+    taken over the reachable vertices only.
+    """
+
+    def __init__(self, eccentricity, transmission, reach, directed):
+        n = len(eccentricity)
+        self.eccentricity = eccentricity
+        self.transmission = transmission
+        self.reach = reach
+        self.connected = bool(np.all(reach == n))
+        if self.connected and n > 0:
+            self.diameter = int(eccentricity.max())
+            self.radius = int(eccentricity.min())
+            self.center = np.flatnonzero(eccentricity == self.radius)
+        else:
+            self.diameter = math.inf
+            self.radius = math.inf
+            self.center = np.arange(n, dtype=np.int64)
+        total = int(transmission.sum())
+        self.wiener = total if directed else total // 2
+
+    def __repr__(self):
+        return f"DistanceMetrics .diameter={self.diameter} .radius={self.radius} .wiener={self.wiener}"
+
+def bitParallelBFS(index: AdjacencyIndex, sources, reverse=None):
+    """
+    Run up to 64 breadth-first searches at once, one per bit of a uint64.
+
+    Parameters
+    ----------
+    index : AdjacencyIndex
+    sources : sequence of at most 64 vertices; source j owns bit j.
+    reverse : AdjacencyIndex, optional
+        The index for the opposite direction (e.g. 'in' for an 'out'
+        index), used for pull steps. A 'both' index is its own reverse;
+        without one, a directed search only pushes.
+
+    Yields
+    ------
+    For each BFS level L >= 1, a tuple (L, vertices, bits): the vertices
+    first reached at level L by at least one search, and for each of them
+    a uint64 whose bit j is set if search j reached it at level L.
+
+    Implementation: each level ORs the frontier's bit words into their
+    neighbors and masks out bits already seen, so one pass over the
+    frontier's edges advances all 64 searches. Small frontiers push their
+    words along their own edges (grouped by neighbor with a sort and
+    np.bitwise_or.reduceat); once the frontier's edges are a sizable
+    share of the graph, every vertex instead pulls the OR of its
+    predecessors' words in one reduceat over the whole reverse index.
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    if len(sources) > 64:
+        raise Exception("bitParallelBFS takes at most 64 sources")
+    n = index.n
+    visited = np.zeros(n, dtype=np.uint64)
+    words = np.left_shift(np.uint64(1), np.arange(len(sources), dtype=np.uint64))
+    np.bitwise_or.at(visited, sources, words)
+    frontier = np.unique(sources)
+    frontierBits = visited[frontier]
+    degrees = index.degrees()
+    if None == reverse and index.direction == 'both':
+        reverse = index
+    if None != reverse:
+        rows = np.flatnonzero(reverse.degrees() > 0)
+        rowStarts = reverse.indptr[rows]
+    words = np.zeros(n, dtype=np.uint64)
+    level = 0
+    while len(frontier) > 0:
+        level += 1
+        slotCount = int(degrees[frontier].sum())
+        if slotCount == 0:
+            break
+        if None != reverse and slotCount * 8 > len(index.indices):
+            words[frontier] = frontierBits
+            fresh = np.zeros(n, dtype=np.uint64)
+            fresh[rows] = np.bitwise_or.reduceat(words[reverse.indices], rowStarts)
+            words[frontier] = 0
+            fresh &= ~visited
+            reached = np.flatnonzero(fresh)
+            fresh = fresh[reached]
+        else:
+            origins, slots = index.expand(frontier)
+            targets = index.indices[slots]
+            bits = np.repeat(frontierBits, degrees[frontier])
+            order = np.argsort(targets, kind='stable')
+            targets = targets[order]
+            starts = np.flatnonzero(np.concatenate(([True], targets[1:] != targets[:-1])))
+            reached = targets[starts]
+            fresh = np.bitwise_or.reduceat(bits[order], starts) & ~visited[reached]
+        keep = fresh != 0
+        frontier = reached[keep]
+        frontierBits = fresh[keep]
+        visited[frontier] |= frontierBits
+        if len(frontier) > 0:
+            yield level, frontier, frontierBits
+
+def bitColumnSums(words, width):
+    """
+    Return, for each bit position j < width, how many of the given uint64
+    words have bit j set.
+    """
+    if len(words) == 0:
+        return np.zeros(width, dtype=np.int64)
+    bits = np.unpackbits(words.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    return bits[:, :width].sum(axis=0, dtype=np.int64)
+
+def findDistanceMetrics(G: Graph, direction='out'):
+    """
+    Compute exact eccentricities, diameter, radius, center and Wiener
+    index of G with bit-parallel all-pairs BFS.
+
+    Parameters
+    ----------
+    G : Graph
+    direction : str, optional
+        For a Digraph, 'out' measures distances along edges, 'in' against
+        them and 'both' ignores direction. The default is 'out'.
+
+    Returns
+    -------
+    A DistanceMetrics object.
+
+    Behavior
+    --------
+    Sources are taken 64 at a time and searched together with
+    bitParallelBFS(), so the graph is swept n/64 times instead of n
+    times. Per-source statistics come from the level at which each bit
+    last appears (eccentricity) and per-bit counts of newly reached
+    vertices (transmission and reach). Time is about n/64 BFS passes over
+    the edges, plus a Python step per BFS level, so graphs with small
+    diameters benefit most; memory is O(n + m).
+    """
+    index = G.adjacencyIndex(direction)
+    reverse = index
+    if index.direction != 'both':
+        reverse = G.adjacencyIndex('in' if index.direction == 'out' else 'out')
+    n = index.n
+    eccentricity = np.zeros(n, dtype=np.int64)
+    transmission = np.zeros(n, dtype=np.int64)
+    reach = np.ones(n, dtype=np.int64)
+    for first in range(0, n, 64):
+        batch = np.arange(first, min(first + 64, n), dtype=np.int64)
+        width = len(batch)
+        for level, vertices, bits in bitParallelBFS(index, batch, reverse):
+            counts = bitColumnSums(bits, width)
+            reached = counts > 0
+            eccentricity[batch[reached]] = level
+            transmission[batch] += level * counts
+            reach[batch] += counts
+    return DistanceMetrics(eccentricity, transmission, reach, index.direction != 'both')
+
+def eccentricities(G: Graph):
+    """
+    Return an array of the eccentricity of every vertex of G (taken over
+    the vertices each one reaches). See findDistanceMetrics().
+    """
+    return findDistanceMetrics(G).eccentricity
+
+def eccentricity(G: Graph, v: int):
+    """
+    Return the eccentricity of one vertex: its greatest distance to any
+    vertex, or math.inf if some vertex cannot be reached. This is a
+    single BFS.
+    """
+    dist = bfsDistances(G, v)
+    if np.any(dist < 0):
+        return math.inf
+    return int(dist.max())
+
+def diameter(G: Graph):
+    """
+    Return the diameter of G (math.inf if G is not connected).
+    """
+    return findDistanceMetrics(G).diameter
+
+def radius(G: Graph):
+    """
+    Return the radius of G (math.inf if G is not connected).
+    """
+    return findDistanceMetrics(G).radius
+
+def center(G: Graph):
+    """
+    Return the list of vertices of G with least eccentricity.
+    """
+    return findDistanceMetrics(G).center.tolist()
+
+def wienerIndex(G: Graph):
+    """
+    Return the Wiener index of G, the sum of distances over all pairs of
+    vertices joined by a path.
+    """
+    return findDistanceMetrics(G).wiener
+
+class EccentricityBounds:
+    """
+    EccentricityBounds holds certified per-vertex eccentricity bounds of
+    an undirected graph, as found by findEccentricityBounds():
+    lower[v] <= ecc(v) <= upper[v], where ecc(v) is taken within v's
+    component.
+
+    Attributes
+    ----------
+    lower, upper : numpy integer arrays
+        The bounds; they are equal where the eccentricity is known.
+    bfsCount : int
+        The number of BFS runs used.
+    connected : bool
+        Whether the graph is connected. If not, the diameter and radius
+        bounds below are those of the component eccentricities (the
+        largest component diameter, the least component radius), while
+        the graph's own diameter and radius are infinite.
+    """
+
+    def __init__(self, lower, upper, bfsCount, connected):
+        self.lower = lower
+        self.upper = upper
+        self.bfsCount = bfsCount
+        self.connected = connected
+
+    def __repr__(self):
+        return f"EccentricityBounds .diameter={self.diameterBounds()} .radius={self.radiusBounds()} .bfsCount={self.bfsCount}"
+
+    def isExact(self):
+        """
+        Return True if every eccentricity is known exactly.
+        """
+        return bool(np.all(self.lower == self.upper))
+
+    def resolvedCount(self):
+        return int(np.count_nonzero(self.lower == self.upper))
+
+    def diameterBounds(self):
+        """
+        Return (lower, upper) bounds on the greatest eccentricity.
+        """
+        if len(self.lower) == 0:
+            return 0, 0
+        return int(self.lower.max()), int(self.upper.max())
+
+    def radiusBounds(self):
+        """
+        Return (lower, upper) bounds on the least eccentricity.
+        """
+        if len(self.lower) == 0:
+            return 0, 0
+        return int(self.lower.min()), int(self.upper.min())
+
+def findEccentricityBounds(G: Graph, maxBFS=64, timeLimit=None):
+    """
+    Bound the eccentricity of every vertex, and so the diameter and
+    radius, with a limited number of BFS runs.
+
+    Parameters
+    ----------
+    G : Graph
+        The graph; direction is ignored for a Digraph.
+    maxBFS : int or None, optional
+        The most BFS runs to use (None for no limit). The default is 64.
+    timeLimit : float or None, optional
+        Stop starting new BFS runs after this many seconds.
+
+    Returns
+    -------
+    An EccentricityBounds object. If the budget allows, the search runs
+    until every eccentricity is exact.
+
+    Behavior
+    --------
+    The bounds start from component sizes: ecc(v) <= size - 1, and
+    ecc(v) >= 1 for a vertex with neighbors. A BFS from s gives ecc(s)
+    exactly and, for every v in its component, certified bounds from the
+    triangle inequality:
+
+        max(d(s, v), ecc(s) - d(s, v)) <= ecc(v) <= ecc(s) + d(s, v)
+
+    Sources are chosen as in Takes and Kosters' bounding algorithm,
+    alternating the unresolved vertex with the largest upper bound (the
+    first such choice after the initial BFS is the double sweep's
+    farthest vertex) and the one with the smallest lower bound (which
+    tends toward the center), breaking ties by degree. The first source
+    is a vertex of highest degree in the largest component.
+    """
+    start = time.perf_counter()
+    index = G.adjacencyIndex('both')
+    n = index.n
+    labels = componentLabels(G)
+    sizes = np.bincount(labels, minlength=n)
+    degrees = index.degrees()
+    lower = np.where(degrees > 0, 1, 0).astype(np.int64)
+    upper = (sizes[labels] - 1).astype(np.int64)
+    connected = n == 0 or sizes.max() == n
+
+    bfsCount = 0
+    pickHigh = True
+    largest = np.flatnonzero(labels == np.argmax(sizes)) if n > 0 else np.zeros(0, dtype=np.int64)
+    source = int(largest[np.argmax(degrees[largest])]) if n > 0 else -1
+    while source >= 0:
+        if None != maxBFS and bfsCount >= maxBFS:
+            break
+        if None != timeLimit and time.perf_counter() - start > timeLimit:
+            break
+        dist, _, order = breadthFirstLevels(index, source)
+        bfsCount += 1
+        d = dist[order]
+        ecc = d[-1]
+        lower[order] = np.maximum(lower[order], np.maximum(d, ecc - d))
+        upper[order] = np.minimum(upper[order], ecc + d)
+
+        unresolved = np.flatnonzero(lower < upper)
+        if len(unresolved) == 0:
+            break
+        if pickHigh:
+            best = unresolved[upper[unresolved] == upper[unresolved].max()]
+        else:
+            best = unresolved[lower[unresolved] == lower[unresolved].min()]
+        source = int(best[np.argmax(degrees[best])])
+        pickHigh = not pickHigh
+
+    return EccentricityBounds(lower, upper, bfsCount, connected)
+
+def pathMidpoint(parent, a, b, length):
+    """
+    Return the vertex halfway along the BFS-tree path from a to b, given
+    the parent array of a BFS from a and the path length.
+    """
+    vertex = b
+    for step in range(0, length // 2):
+        vertex = parent[vertex]
+    return int(vertex)
+
+def diameterBounds(G: Graph, maxBFS=None, timeLimit=None, start=None):
+    """
+    Bound, and given enough budget find exactly, the diameter of the
+    component of G containing the start vertex, using iFUB.
+
+    Parameters
+    ----------
+    G : Graph
+        The graph; direction is ignored for a Digraph.
+    maxBFS : int or None, optional
+        The most single-source BFS runs to use (a 64-source bit-parallel
+        run counts as 64). The default is None, no limit.
+    timeLimit : float or None, optional
+        Stop after this many seconds.
+    start : int, optional
+        A vertex of the component to measure; by default a vertex of
+        highest degree in the largest component.
+
+    Returns
+    -------
+    A tuple (lower, upper, bfsCount) of certified diameter bounds (equal
+    when exact) and the number of BFS runs used.
+
+    Behavior
+    --------
+    A 4-sweep (two double sweeps, the second from the midpoint of the
+    first one's path) gives a lower bound and a central vertex u. The
+    iFUB loop then takes the BFS levels of u from the farthest inward:
+    with lb the greatest eccentricity found so far, once every vertex at
+    levels above i has been measured the diameter is at most
+    max(lb, 2i), and it equals lb as soon as lb > 2(i - 1). The vertices
+    of each level are measured 64 at a time with bitParallelBFS().
+    """
+    begin = time.perf_counter()
+    index = G.adjacencyIndex('both')
+    n = index.n
+    if n == 0:
+        return 0, 0, 0
+    if None == start:
+        labels = componentLabels(G)
+        largest = np.flatnonzero(labels == np.argmax(np.bincount(labels)))
+        start = int(largest[np.argmax(index.degrees()[largest])])
+
+    def overBudget(extra):
+        if None != maxBFS and bfsCount + extra > maxBFS:
+            return True
+        return None != timeLimit and time.perf_counter() - begin > timeLimit
+
+    bfsCount = 0
+    lower = 0
+    upper = math.inf
+    sweepStart = start
+    center = start
+    for sweep in range(0, 2):
+        if overBudget(3):
+            return lower, upper, bfsCount
+        dist, _, order = breadthFirstLevels(index, sweepStart)
+        upper = min(upper, 2 * int(dist[order[-1]]))
+        a = int(order[-1])
+        dist, parent, order = breadthFirstLevels(index, a)
+        b = int(order[-1])
+        length = int(dist[b])
+        bfsCount += 2
+        lower = max(lower, length)
+        center = pathMidpoint(parent, a, b, length)
+        sweepStart = center
+
+    dist, _, order = breadthFirstLevels(index, center)
+    bfsCount += 1
+    level = int(dist[order[-1]])
+    upper = min(upper, 2 * level)
+    while upper > lower and level > 0:
+        fringe = order[dist[order] == level]
+        for first in range(0, len(fringe), 64):
+            batch = fringe[first:first + 64]
+            if overBudget(len(batch)):
+                return lower, min(upper, max(lower, 2 * level)), bfsCount
+            bfsCount += len(batch)
+            farthest = 0
+            for step, vertices, bits in bitParallelBFS(index, batch):
+                farthest = step
+            lower = max(lower, farthest)
+        if lower > 2 * (level - 1):
+            upper = lower
+        else:
+            upper = min(upper, max(lower, 2 * (level - 1)))
+        level -= 1
+    return lower, max(lower, upper), bfsCount
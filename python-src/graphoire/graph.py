@@ -6,9 +6,13 @@ Created on Sun Feb 21 10:42:13 2021
 @author: Christopher Corbell
 """
 
+import hashlib
+
 import numpy as np
 from scipy.sparse import coo_matrix
 
+from graphoire.adjacencyindex import AdjacencyIndex
+
 def vertexNeighborFromEdge(vertex, edge):
     if vertex == edge[0]:
         return edge[1]
@@ -98,6 +102,22 @@ class Graph:
         self.vertex_by_label_cache = None
         self.edge_by_label_cache = None
         
+        self.edge_array_cache = None
+        self.adjacency_index_cache = {}
+        self.component_label_cache = None
+        self.block_cache = None
+        self.block_cut_tree_cache = None
+        self.edge_weight_cache = None
+        self.adjacency_weight_cache = {}
+        self.landmark_cache = {}
+        # bumped whenever the caches are cleared, so results kept outside
+        # the graph can tell that its edges or weights have changed
+        self.version = 0
+        
+        # optional IncrementalConnectivity structure that is
+        # notified of edge changes (see graphoire.component)
+        self.connectivity = None
+        
 	
     
     def order(self):
@@ -112,6 +132,100 @@ class Graph:
         """
         return len(self.edges)
     
+    def edgeArray(self):
+        """
+        Return the edge list as an (m, 2) numpy integer array, in the
+        same order as the .edges list.
+        
+        The array is cached until the next change to the edge list
+        (see clearCaches()), so callers should treat it as read-only.
+        """
+        if self.edge_array_cache is None:
+            self.edge_array_cache = np.array(self.edges, dtype=np.int64).reshape(-1, 2)
+        return self.edge_array_cache
+    
+    def adjacencyIndex(self, direction='out'):
+        """
+        Return a cached AdjacencyIndex (CSR neighbor arrays) for the graph.
+
+        Parameters
+        ----------
+        direction : str, optional
+            'out', 'in' or 'both'. This only matters for a Digraph, where 
+            'out' lists out-neighbors, 'in' lists in-neighbors and 'both'
+            lists the neighbors in the underlying graph. An undirected
+            Graph always returns its symmetric index. The default is 'out'.
+
+        The index is cached until the next change to the edge list (see
+        clearCaches()); callers should treat its arrays as read-only.
+        """
+        if not self.directed:
+            direction = 'both'
+        index = self.adjacency_index_cache.get(direction)
+        if None == index:
+            index = AdjacencyIndex.fromEdgeArray(self.n, self.edgeArray(), direction)
+            self.adjacency_index_cache[direction] = index
+        return index
+    
+    def edgeWeightArray(self):
+        """
+        Return the weight of every edge as a numpy array, in the same order
+        as the .edges list. Edges without a weight get 1. The dtype is
+        integer if every weight is an integer, and floating point otherwise.
+
+        For an undirected graph a weight stored under either orientation
+        of the edge is found. The array is cached until the next change to
+        the edges or weights (see clearCaches()); treat it as read-only.
+        """
+        if self.edge_weight_cache is None:
+            if not self.hasEdgeWeights():
+                weights = np.ones(len(self.edges), dtype=np.int64)
+            else:
+                lookup = self.edge_weights
+                weights = []
+                for edge in self.edges:
+                    weight = lookup.get((edge[0], edge[1]))
+                    if None == weight and not self.directed:
+                        weight = lookup.get((edge[1], edge[0]))
+                    weights.append(1 if None == weight else weight)
+                weights = np.array(weights).reshape(-1)
+                if weights.dtype.kind not in 'iuf':
+                    weights = weights.astype(np.float64)
+            self.edge_weight_cache = weights
+        return self.edge_weight_cache
+
+    def adjacencyWeights(self, direction='out'):
+        """
+        Return the edge weights laid out parallel to the neighbor array of
+        adjacencyIndex(direction): entry k is the weight of the edge that
+        produced neighbor slot k, so both orientations of an undirected
+        edge carry its weight.
+
+        Weighted algorithms read this array directly instead of looking up
+        each edge; it is cached like the index itself.
+        """
+        if not self.directed:
+            direction = 'both'
+        weights = self.adjacency_weight_cache.get(direction)
+        if weights is None:
+            weights = self.edgeWeightArray()[self.adjacencyIndex(direction).edge_ids]
+            self.adjacency_weight_cache[direction] = weights
+        return weights
+    
+    def fingerprint(self):
+        """
+        Return a hex digest identifying the graph's structure and edge
+        weights (order, directedness, edge array and weight array), so
+        data saved alongside a graph can be checked against it on load.
+        """
+        digest = hashlib.sha1()
+        digest.update(f"{type(self).__name__} {self.n} {self.directed}".encode())
+        digest.update(np.ascontiguousarray(self.edgeArray()).tobytes())
+        weights = self.edgeWeightArray()
+        digest.update(weights.dtype.str.encode())
+        digest.update(np.ascontiguousarray(weights).tobytes())
+        return digest.hexdigest()
+
     # ------------------------------ vertex degrees
     
     def vertexDegree(self, vertex):
@@ -143,6 +257,14 @@ class Graph:
         self.degree_cache[vertex] = degree
         return degree
     
+    def degreeArray(self):
+        """
+        Return the degrees of all vertices as a numpy integer array,
+        computed in one pass over the edge array. Unlike vertexDegree(),
+        this does not require the edge list to be sorted.
+        """
+        return np.bincount(self.edgeArray().reshape(-1), minlength=self.n)
+    
     def degreeMin(self):
         """
         Return the minimum vertex degree of the graph
@@ -249,6 +371,8 @@ class Graph:
         edge = self.canonicalizeEdge([v1, v2])
         if not edge in self.edges:
             self.edges.append(edge)
+            if None != self.connectivity:
+                self.connectivity.edgeAdded(edge[0], edge[1])
         
         if True == sortEdges:
             self.sortEdges()
@@ -262,6 +386,8 @@ class Graph:
         list.
         """
         self.edges.sort()
+        # cached arrays refer to edges by list position
+        self.clearCaches()
         
     def deleteVertex(self, vertex):
         """
@@ -351,6 +477,9 @@ class Graph:
         # decrement graph order
         self.n -= 1
         
+        if None != self.connectivity:
+            self.connectivity.invalidate()
+        
         # Note there is no need to sort edges after a delete
         
         self.clearCaches()
@@ -411,6 +540,9 @@ class Graph:
         
         del self.edges[ei]
         
+        if None != self.connectivity:
+            self.connectivity.invalidate()
+        
         # Note there is no need to sort edges after a delete
         
         self.clearCaches()
@@ -691,17 +823,85 @@ class Graph:
     def setEdgeWeight(self, v1, v2, weight):
         if None == self.edge_weights:
             self.edge_weights = {}
-        self.edge_weights[(v1, v2)] = weight
+        edge = self.canonicalizeEdge([v1, v2])
+        self.edge_weights[(edge[0], edge[1])] = weight
+        self.clearWeightCaches()
         
+    def setEdgeWeights(self, edges, weights):
+        """
+        Set the weights of many edges at once.
+
+        Parameters
+        ----------
+        edges : (k, 2) array-like of vertex pairs, or None
+            The edges to weight; None means all edges, in .edges order.
+        weights : array-like of k numbers
+            The new weights.
+
+        Behavior
+        --------
+        The weight dictionary is updated in one pass. If the edge weight
+        array is already cached, the new weights are written into it in
+        place (edge positions are found with a sorted search over the
+        edge array) instead of rebuilding it; pairs that are not edges of
+        the graph only go into the dictionary.
+        """
+        weights = np.asarray(weights).reshape(-1)
+        if edges is None:
+            pairs = self.edgeArray()
+        else:
+            pairs = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+            if not self.directed:
+                pairs = np.sort(pairs, axis=1)
+        if len(pairs) != len(weights):
+            raise Exception(f"setEdgeWeights got {len(pairs)} edges but {len(weights)} weights")
+        if None == self.edge_weights:
+            self.edge_weights = {}
+        self.edge_weights.update(zip(map(tuple, pairs.tolist()), weights.tolist()))
+
+        cached = self.edge_weight_cache
+        self.clearWeightCaches()
+        if cached is None or len(pairs) == 0:
+            return
+        if np.result_type(cached, weights) != cached.dtype:
+            cached = cached.astype(np.result_type(cached, weights))
+        else:
+            cached = cached.copy()
+        if edges is None:
+            cached[:] = weights
+        else:
+            edgeArray = self.edgeArray()
+            keys = edgeArray[:, 0] * self.n + edgeArray[:, 1]
+            order = np.argsort(keys)
+            wanted = pairs[:, 0] * self.n + pairs[:, 1]
+            found = np.minimum(np.searchsorted(keys, wanted, sorter=order), len(keys) - 1)
+            present = keys[order[found]] == wanted
+            cached[order[found[present]]] = weights[present]
+        self.edge_weight_cache = cached
+
     def getEdgeWeight(self, v1, v2, default=None):
         if None == self.edge_weights:
             return default
         
-        key = (v1, v2)
+        edge = self.canonicalizeEdge([v1, v2])
+        key = (edge[0], edge[1])
         if key in self.edge_weights:
             return self.edge_weights[key]
+        if not self.directed and (v1, v2) in self.edge_weights:
+            return self.edge_weights[(v1, v2)]
         
         return default
+
+    def clearWeightCaches(self):
+        """
+        Clear the cached edge weight arrays (see edgeWeightArray()) and
+        bump .version. Code that modifies .edge_weights directly should
+        call this afterwards.
+        """
+        self.version += 1
+        self.edge_weight_cache = None
+        self.adjacency_weight_cache = {}
+        self.landmark_cache = {}
     
 	
     # ------------------------------ vertex colors
@@ -780,8 +980,19 @@ class Graph:
         Degree caches are used to avoid repeated calculation of vertex 
         degrees for a Graph that has not changed. Typically the caches are 
         cleared with any change to edge list, including vertex deletion etc.
+        
+        The edge-array, adjacency-index, component-label, block,
+        block-cut-tree and edge-weight caches follow the same rule.
+        Code that modifies .edges or .n directly (rather than through
+        addEdge(), deleteVertex() etc.) should call this method afterwards.
         """
         self.degree_cache.clear()
+        self.edge_array_cache = None
+        self.adjacency_index_cache = {}
+        self.component_label_cache = None
+        self.block_cache = None
+        self.block_cut_tree_cache = None
+        self.clearWeightCaches()
         
     def __repr__(self):
         gstr = type(self).__name__
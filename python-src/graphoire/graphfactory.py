@@ -8,12 +8,37 @@ Created on Sat Mar  6 10:07:28 2021
 
 from graphoire.graph import Graph
 from graphoire.labels import labelGraphVerticesWithBinaryStrings, binaryStringDigitDiff
+from graphoire.algorithm.prufer import randomTreeEdgeArrays
 
 import copy
-import random
 import math
 import itertools
 
+import numpy as np
+
+def randomWeightedEdges(n: int, m: int, low, high, integral, seed, lowerFirst):
+    """
+    Draw m random edges over vertices [0, n-1] and a weight for each.
+    Loops and repeated edges are dropped, so fewer than m may remain.
+    With lowerFirst, every edge is stored lower vertex first. Weights are
+    integers in [low, high), or floats there if integral is False.
+
+    Returns a tuple (edges, weights): a sorted list of [v1, v2] edges and
+    a numpy array of their weights. Edges are drawn before weights, from
+    numpy.random.default_rng(seed).
+    """
+    rand = np.random.default_rng(seed)
+    edges = rand.integers(0, n, size=(m, 2)) if n > 0 else np.zeros((0, 2), dtype=np.int64)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    if lowerFirst:
+        edges = np.sort(edges, axis=1)
+    edges = np.unique(edges, axis=0).reshape(-1, 2)
+    if integral:
+        weights = rand.integers(low, high, size=len(edges))
+    else:
+        weights = low + rand.random(len(edges)) * (high - low)
+    return edges.tolist(), weights
+
 class GraphFactory:
     def makeEmpty(n: int):
         """
@@ -252,35 +277,49 @@ class GraphFactory:
                     
         return g
         
-    def makeRandomTree(n: int, maxDegree=0):
-        usingMaxDegree = maxDegree >= 2
-        
-        tree = Graph(n)
-        isolated_v_set = [item for item in range(0, n)]
-        tree_v_set = []
-        
-        random.shuffle(isolated_v_set)
-        
-        # pick a vertex to start our tree from
-        tree_v_set.append(isolated_v_set.pop())
-        
-        # now add leaves to the tree until it's done
-        while len(isolated_v_set) > 0:
-            nextLeaf = isolated_v_set.pop()
-            leafNeighbor = random.choice(tree_v_set)
-            
-            tree.addEdge(nextLeaf, leafNeighbor, sortEdges=usingMaxDegree)
-            tree_v_set.append(nextLeaf)
-            
-            if usingMaxDegree:
-                deg = tree.vertexDegree(leafNeighbor)
-                if deg >= maxDegree:
-                    tree_v_set.remove(leafNeighbor)
-        
-        tree.sortEdges()
-        return tree
-        
+    def makeRandomTree(n: int, maxDegree=0, seed=None):
+        """
+        Return a uniformly random labeled tree with n vertices.
+
+        If maxDegree is 2 or more, the tree is uniform among the labeled
+        trees with no vertex degree above maxDegree. Pass a seed (int or
+        numpy.random.Generator) for a reproducible tree.
+        """
+        return GraphFactory.makeRandomTrees(n, 1, maxDegree, seed)[0]
+
+    def makeRandomTrees(n: int, count: int, maxDegree=0, seed=None):
+        """
+        Return a list of count independent uniformly random labeled trees
+        with n vertices each, with sorted edges.
+
+        Trees are sampled as random Prüfer codes and decoded together in
+        one batch (see graphoire.algorithm.prufer.randomTreeEdgeArrays);
+        maxDegree and seed are as for makeRandomTree().
+        """
+        if n <= 1:
+            return [Graph(n) for i in range(0, count)]
+        edges = randomTreeEdgeArrays(n, count, seed, maxDegree)
+        trees = []
+        for treeEdges in edges.tolist():
+            tree = Graph(n)
+            tree.edges = treeEdges
+            trees.append(tree)
+        return trees
         
+    def makeRandomWeighted(n: int, m: int, low=1, high=10, integral=True, seed=None):
+        """
+        Return a random simple Graph with edge weights, from m uniformly
+        drawn vertex pairs less any loops and repeats.
+
+        Weights are integers in [low, high), or floats there if integral
+        is False. Pass a seed (int or numpy.random.Generator) for a
+        reproducible graph; a Generator can be reused for further draws.
+        """
+        G = Graph(n)
+        G.edges, weights = randomWeightedEdges(n, m, low, high, integral, seed, True)
+        G.setEdgeWeights(None, weights)
+        return G
+
     def makeGrotzsch():
         C5 = GraphFactory.makeCycle(5)
         return GraphFactory.makeMycielski(C5)
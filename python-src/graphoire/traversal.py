@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 16:05:12 2026
+
+@author: mathaes
+
+graphoire.traversal is a shared breadth-first / depth-first traversal
+engine. A Traversal is iterated to get a lazy stream of events as tuples
+(kind, u, v):
+
+    ('discover', v, parent)  v is reached for the first time (parent is
+                             -1 for a root of the search)
+    ('tree', u, v)           edge u -> v discovers v
+    ('back', u, v)           DFS: edge to an ancestor still being explored
+    ('forward', u, v)        DFS on a digraph: edge to a finished descendant
+    ('cross', u, v)          any other edge to an already-discovered vertex
+    ('finish', v, parent)    all edges of v have been examined
+
+Each event costs O(1) and each neighbor slot of the graph's AdjacencyIndex
+is examined at most once, so a complete traversal is O(n + m). Nothing
+beyond per-vertex state is stored; callers that want visit lists collect
+them from the stream (or use reachableVertices()).
+
+Searches that expand a whole BFS level with numpy array operations (see
+graphoire.distance) do not use this engine, since their Python-level
+work is per level rather than per event.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from graphoire.graph import Graph
+from graphoire.adjacencyindex import AdjacencyIndex
+
+class Traversal:
+    """
+    A traversal of a Graph or Digraph from one or more source vertices.
+
+    Parameters
+    ----------
+    G : Graph or AdjacencyIndex
+        The graph to traverse, or an index to traverse directly (then
+        direction is ignored, and edge ids refer to the index's edge
+        list).
+    sources : int, list of ints or None, optional
+        The vertices to start from. With None (the default), every vertex
+        is used in ascending order, so the traversal covers the whole
+        graph as a forest.
+    order : str, optional
+        'dfs' (the default) or 'bfs'.
+    direction : str, optional
+        For a Digraph, 'out' (the default) follows edges forward, 'in'
+        backward and 'both' ignores direction. Undirected graphs always
+        use 'both'.
+    maxDepth : int, optional
+        If given, vertices at this depth are discovered (and finished)
+        but their edges are not examined.
+    events : collection of str, optional
+        The event kinds to yield; by default all of them. Unwanted kinds
+        are skipped without building a tuple.
+    edgeFilter : callable, optional
+        If given, edgeFilter(u, v, edge) is called for each neighbor slot
+        before it is examined, with edge the edge list position; a slot
+        for which it returns False is skipped as if it were absent. This
+        restricts the traversal to a subgraph, such as the residual
+        edges of a flow, without building it.
+
+    Behavior
+    --------
+    A depth-first traversal starts a new tree at every source not yet
+    discovered. A breadth-first traversal discovers all given sources at
+    depth 0 and grows one search from them together; with sources=None
+    it starts a new tree at each undiscovered vertex instead.
+
+    For undirected traversals (including a Digraph with direction
+    'both') every non-tree edge is reported once, and the edge back to a
+    vertex's parent is not reported. Breadth-first traversals report all
+    non-tree edges as 'cross', since separating back edges would need an
+    ancestor test.
+
+    While iterating, parent[v], depth[v] and parentEdge[v] (the edge
+    list position of the tree edge into v) are available for every
+    discovered vertex; they are -1 otherwise. During an edge event
+    (tree, back, forward or cross), edge holds that edge's list position.
+    Breaking out of the loop or calling stop() ends the traversal early.
+    """
+
+    def __init__(self, G: Graph, sources=None, order='dfs', direction='out', maxDepth=None, events=None, edgeFilter=None):
+        if order != 'dfs' and order != 'bfs':
+            raise Exception(f"Unknown traversal order '{order}'")
+        self.graph = G
+        self.order = order
+        self.index = G if isinstance(G, AdjacencyIndex) else G.adjacencyIndex(direction)
+        self.undirected = self.index.direction == 'both'
+        n = self.index.n
+        if None == sources:
+            self.sources = None
+        else:
+            self.sources = [int(sources)] if np.ndim(sources) == 0 else [int(s) for s in sources]
+            for source in self.sources:
+                if source < 0 or source >= n:
+                    raise Exception(f"Source vertex {source} is not in a graph of order {n}")
+        self.maxDepth = maxDepth
+        self.edgeFilter = edgeFilter
+        self.wanted = set(['discover', 'tree', 'back', 'forward', 'cross', 'finish'])
+        if None != events:
+            self.wanted = set(events)
+        self.parent = [-1] * n
+        self.depth = [-1] * n
+        self.parentEdge = [-1] * n
+        self.edge = -1
+        self.stopped = False
+
+    def __repr__(self):
+        return f"Traversal .order={self.order} .direction={self.index.direction} .n={self.index.n}"
+
+    def __iter__(self):
+        if self.order == 'dfs':
+            return self.depthFirstEvents()
+        return self.breadthFirstEvents()
+
+    def stop(self):
+        """
+        End the traversal; the event stream finishes at its next step.
+        """
+        self.stopped = True
+
+    def isDiscovered(self, vertex):
+        return self.depth[vertex] >= 0
+
+    def depthFirstEvents(self):
+        # the CSR arrays are read one slot at a time (item() returns a
+        # Python int), so nothing is converted before the first event
+        indptr = self.index.indptr
+        indices = self.index.indices
+        edgeIds = self.index.edge_ids
+        parent, depth, parentEdge = self.parent, self.depth, self.parentEdge
+        maxDepth = self.maxDepth
+        undirected = self.undirected
+        edgeFilter = self.edgeFilter
+        wantDiscover = 'discover' in self.wanted
+        wantTree = 'tree' in self.wanted
+        wantBack = 'back' in self.wanted
+        wantForward = 'forward' in self.wanted
+        wantCross = 'cross' in self.wanted
+        wantFinish = 'finish' in self.wanted
+
+        # state: 0 undiscovered, 1 on the stack, 2 finished; position[v]
+        # is v's next neighbor slot, set when v is discovered
+        state = bytearray(self.index.n)
+        discovery = [0] * self.index.n
+        position = [0] * self.index.n
+        clock = 0
+        roots = range(0, self.index.n) if None == self.sources else self.sources
+        for root in roots:
+            if state[root] != 0:
+                continue
+            state[root] = 1
+            depth[root] = 0
+            discovery[root] = clock
+            clock += 1
+            position[root] = indptr.item(root)
+            if wantDiscover:
+                yield ('discover', root, -1)
+            stack = [root]
+            while len(stack) > 0:
+                if self.stopped:
+                    return
+                u = stack[-1]
+                slot = position[u]
+                if slot < indptr.item(u + 1) and (None == maxDepth or depth[u] < maxDepth):
+                    position[u] = slot + 1
+                    v = indices.item(slot)
+                    edge = edgeIds.item(slot)
+                    if None != edgeFilter and not edgeFilter(u, v, edge):
+                        continue
+                    vState = state[v]
+                    if vState == 0:
+                        state[v] = 1
+                        parent[v] = u
+                        depth[v] = depth[u] + 1
+                        parentEdge[v] = edge
+                        discovery[v] = clock
+                        clock += 1
+                        position[v] = indptr.item(v)
+                        stack.append(v)
+                        if wantTree:
+                            self.edge = edge
+                            yield ('tree', u, v)
+                        if wantDiscover:
+                            yield ('discover', v, u)
+                    elif undirected:
+                        if vState == 1 and edge != parentEdge[u]:
+                            if wantBack:
+                                self.edge = edge
+                                yield ('back', u, v)
+                    elif vState == 1:
+                        if wantBack:
+                            self.edge = edge
+                            yield ('back', u, v)
+                    elif discovery[u] < discovery[v]:
+                        if wantForward:
+                            self.edge = edge
+                            yield ('forward', u, v)
+                    elif wantCross:
+                        self.edge = edge
+                        yield ('cross', u, v)
+                else:
+                    stack.pop()
+                    state[u] = 2
+                    if wantFinish:
+                        yield ('finish', u, parent[u])
+
+    def breadthFirstEvents(self):
+        indptr = self.index.indptr
+        indices = self.index.indices
+        edgeIds = self.index.edge_ids
+        parent, depth, parentEdge = self.parent, self.depth, self.parentEdge
+        maxDepth = self.maxDepth
+        undirected = self.undirected
+        edgeFilter = self.edgeFilter
+        wantDiscover = 'discover' in self.wanted
+        wantTree = 'tree' in self.wanted
+        wantCross = 'cross' in self.wanted
+        wantFinish = 'finish' in self.wanted
+
+        # state: 0 undiscovered, 1 queued, 2 finished
+        state = bytearray(self.index.n)
+        if None == self.sources:
+            groups = ([vertex] for vertex in range(0, self.index.n))
+        else:
+            groups = [self.sources]
+        for group in groups:
+            queue = deque()
+            for root in group:
+                if state[root] == 0:
+                    state[root] = 1
+                    depth[root] = 0
+                    queue.append(root)
+                    if wantDiscover:
+                        yield ('discover', root, -1)
+            while len(queue) > 0:
+                if self.stopped:
+                    return
+                u = queue.popleft()
+                if None == maxDepth or depth[u] < maxDepth:
+                    for slot in range(indptr.item(u), indptr.item(u + 1)):
+                        v = indices.item(slot)
+                        edge = edgeIds.item(slot)
+                        if None != edgeFilter and not edgeFilter(u, v, edge):
+                            continue
+                        vState = state[v]
+                        if vState == 0:
+                            state[v] = 1
+                            parent[v] = u
+                            depth[v] = depth[u] + 1
+                            parentEdge[v] = edge
+                            queue.append(v)
+                            if wantTree:
+                                self.edge = edge
+                                yield ('tree', u, v)
+                            if wantDiscover:
+                                yield ('discover', v, u)
+                        elif wantCross and (vState == 1 or not undirected):
+                            if not undirected or edge != parentEdge[u]:
+                                self.edge = edge
+                                yield ('cross', u, v)
+                        if self.stopped:
+                            return
+                state[u] = 2
+                if wantFinish:
+                    yield ('finish', u, parent[u])
+
+def traverse(G: Graph, sources=None, order='dfs', direction='out', maxDepth=None, events=None, edgeFilter=None):
+    """
+    Return a Traversal of G; iterate it for the event stream. See
+    Traversal for the parameters.
+    """
+    return Traversal(G, sources, order, direction, maxDepth, events, edgeFilter)
+
+def reachableVertices(G: Graph, sources, direction='out', maxDepth=None):
+    """
+    Return the ascending list of vertices reachable from the sources
+    (within maxDepth steps, if given), including the sources.
+    """
+    traversal = Traversal(G, sources, 'bfs', direction, maxDepth, events=['discover'])
+    result = [event[1] for event in traversal]
+    result.sort()
+    return result
@@ -7,9 +7,14 @@ Created on Mon Mar  8 11:21:49 2021
 """
 
 
+import numpy as np
+
 from graphoire.graph import Graph
+from graphoire.adjacencyindex import AdjacencyIndex
 
-from graphoire.component import isConnected
+from graphoire.component import isConnected, componentCount, componentLabels
+from graphoire.distance import breadthFirstLevels
+from graphoire.traversal import Traversal
 
 def isConnectedAcyclic(G: Graph):
     """
@@ -36,10 +41,10 @@ def findLeaf(G: Graph):
     A leaf vertex, as an int (index); returns -1 if no leaf is found.
 
     """
-    for vertex in range(0, G.order()):
-        if G.vertexDegree(vertex) == 1:
-            return vertex
-    return -1
+    leaves = np.flatnonzero(G.degreeArray() == 1)
+    if len(leaves) == 0:
+        return -1
+    return int(leaves[0])
     
 def findAllLeaves(G: Graph):
     """
@@ -58,12 +63,438 @@ def findAllLeaves(G: Graph):
     Note
     ----
     The graph need not be a tree; this just returns all vertices
-    with degree exactly equal to 1.
+    with degree exactly equal to 1. It takes one pass over the edge
+    array (see Graph.degreeArray()).
+    """
+    return np.flatnonzero(G.degreeArray() == 1).tolist()
+
+
+class RootedTree:
+    """
+    RootedTree is a compact rooted-tree representation backed by numpy
+    arrays, for trees that are queried many times.
+    
+    The tree on vertices [0, n-1] is stored as a parent array (with -1 at
+    the root), a depth array and a breadth-first vertex order. Structures
+    for particular queries are built lazily on first use and kept:
+    
+    - lowestCommonAncestor() uses an Euler tour of the tree and a sparse
+      table over it, so after O(n log n) preprocessing each query is O(1)
+      (two table lookups) and batches of queries are single numpy
+      operations. The table holds about 2n log2(2n) int32 entries.
+    - kthAncestor() uses a binary-lifting (jump pointer) table, O(log n)
+      per query.
+    - subtreeSize() uses subtree sizes accumulated level by level.
+    
+    Query methods accept either single vertices or arrays of vertices.
+    """
+    
+    def fromGraph(G: Graph, root=0):
+        """
+        Build a RootedTree from a tree Graph in O(n).
+
+        Parameters
+        ----------
+        G : Graph
+            A Graph that is a tree (connected and acyclic).
+        root : int, optional
+            The root vertex. The default is 0.
+
+        Raises
+        ------
+        Exception
+            If G is not a tree or root is out of range.
+        """
+        if root < 0 or root >= G.n:
+            raise Exception(f"Root {root} out of range for graph order {G.n}")
+        if not isTree(G):
+            raise Exception("RootedTree requires a graph that is a tree")
+        
+        dist, parent, order = breadthFirstLevels(G.adjacencyIndex('both'), root)
+        return RootedTree(parent, dist, order)
+    
+    def fromParentArray(parent):
+        """
+        Build a RootedTree from a parent array with -1 at the root, such
+        as one returned by dfstree or a BFS.
+        """
+        parent = np.asarray(parent, dtype=np.int64)
+        roots = np.flatnonzero(parent < 0)
+        if len(roots) != 1:
+            raise Exception(f"Parent array must have exactly one root, found {len(roots)}")
+        children = AdjacencyIndex.fromEdgeArray(len(parent), np.column_stack((parent[parent >= 0], np.flatnonzero(parent >= 0))), 'out')
+        depth, _, order = breadthFirstLevels(children, roots[0])
+        if len(order) != len(parent):
+            raise Exception("Parent array does not describe a tree")
+        return RootedTree(parent, depth, order)
+    
+    def __init__(self, parent, depth, order):
+        self.n = len(parent)
+        self.parent = parent
+        self.depth = depth
+        self.order = order
+        self.root = int(order[0])
+        
+        self.euler = None
+        self.euler_first = None
+        self.sparse_table = None
+        self.jump_table = None
+        self.subtree_sizes = None
+        
+    def __repr__(self):
+        return f"RootedTree .n={self.n} .root={self.root} .height={self.height()}"
+    
+    def height(self):
+        return int(self.depth.max())
+    
+    def toGraph(self):
+        """
+        Return the tree as a Graph with sorted edges.
+        """
+        G = Graph(self.n)
+        children = np.flatnonzero(self.parent >= 0)
+        G.edges = np.sort(np.column_stack((self.parent[children], children)), axis=1).tolist()
+        G.sortEdges()
+        return G
+    
+    def childIndex(self):
+        """
+        Return an AdjacencyIndex listing the children of each vertex.
+        """
+        children = np.flatnonzero(self.parent >= 0)
+        return AdjacencyIndex.fromEdgeArray(self.n, np.column_stack((self.parent[children], children)), 'out')
+    
+    # ------------------------------ lowest common ancestors
+    
+    def buildEulerTour(self):
+        """
+        Build the Euler tour (length 2n-1) and its sparse table.
+        """
+        # a vertex enters the tour when discovered and again each time
+        # one of its children finishes
+        first = [0] * self.n
+        euler = []
+        for kind, v, p in Traversal(self.childIndex(), self.root, events=['discover', 'finish']):
+            if kind == 'discover':
+                first[v] = len(euler)
+                euler.append(v)
+            elif p != -1:
+                euler.append(p)
+                
+        dtype = np.int32 if self.n < 2**31 else np.int64
+        self.euler = np.array(euler, dtype=dtype)
+        self.euler_first = np.array(first, dtype=dtype)
+        
+        # sparse_table[k][i] is the shallowest vertex in euler[i:i+2**k]
+        table = [self.euler]
+        span = 1
+        while 2 * span <= len(self.euler):
+            prev = table[-1]
+            left = prev[:len(prev) - span]
+            right = prev[span:]
+            table.append(np.where(self.depth[left] <= self.depth[right], left, right))
+            span *= 2
+        self.sparse_table = table
+        
+    def lowestCommonAncestor(self, u, v):
+        """
+        Return the lowest common ancestor of u and v; arrays of vertices
+        give an array of ancestors. Each query is O(1) after the first
+        call builds the Euler tour and sparse table.
+        """
+        if self.sparse_table is None:
+            self.buildEulerTour()
+        scalar = np.ndim(u) == 0 and np.ndim(v) == 0
+        lo = self.euler_first[u]
+        hi = self.euler_first[v]
+        lo, hi = np.minimum(lo, hi), np.maximum(lo, hi)
+        k = np.log2(hi - lo + 1).astype(np.int64) if not scalar else int(hi - lo + 1).bit_length() - 1
+        if scalar:
+            left = self.sparse_table[k][lo]
+            right = self.sparse_table[k][hi - (1 << k) + 1]
+            return int(left if self.depth[left] <= self.depth[right] else right)
+        
+        result = np.empty(np.broadcast(lo, hi).shape, dtype=np.int64)
+        for level in np.unique(k):
+            mask = k == level
+            left = self.sparse_table[level][lo[mask]]
+            right = self.sparse_table[level][hi[mask] - (1 << int(level)) + 1]
+            result[mask] = np.where(self.depth[left] <= self.depth[right], left, right)
+        return result
+    
+    def distance(self, u, v):
+        """
+        Return the number of edges on the path between u and v (arrays
+        accepted).
+        """
+        c = self.lowestCommonAncestor(u, v)
+        return self.depth[u] + self.depth[v] - 2 * self.depth[c]
+    
+    def path(self, u: int, v: int):
+        """
+        Return the list of vertices on the path from u to v.
+        """
+        c = self.lowestCommonAncestor(u, v)
+        head = []
+        while u != c:
+            head.append(int(u))
+            u = self.parent[u]
+        tail = []
+        while v != c:
+            tail.append(int(v))
+            v = self.parent[v]
+        tail.reverse()
+        return head + [c] + tail
+    
+    # ------------------------------ ancestors and subtrees
+    
+    def buildJumpTable(self):
+        """
+        Build the binary-lifting table: jump_table[k][v] is the 2**k-th
+        ancestor of v, or -1.
+        """
+        up = np.where(self.parent >= 0, self.parent, -1)
+        table = [up]
+        for _ in range(1, max(1, self.height().bit_length())):
+            prev = table[-1]
+            table.append(np.where(prev >= 0, prev[prev], -1))
+        self.jump_table = table
+        
+    def kthAncestor(self, v, k):
+        """
+        Return the k-th ancestor of v (v itself for k = 0), or -1 if v has
+        depth less than k. Arrays of v and/or k are accepted.
+        """
+        if self.jump_table is None:
+            self.buildJumpTable()
+        scalar = np.ndim(v) == 0 and np.ndim(k) == 0
+        v, k = np.broadcast_arrays(np.atleast_1d(np.asarray(v, dtype=np.int64)), np.atleast_1d(np.asarray(k, dtype=np.int64)))
+        result = np.where(k <= self.depth[v], v, -1)
+        for bit in range(0, len(self.jump_table)):
+            jump = (result >= 0) & (((k >> bit) & 1) == 1)
+            result = np.where(jump, self.jump_table[bit][np.maximum(result, 0)], result)
+        if scalar:
+            return int(result[0])
+        return result
+    
+    def subtreeSize(self, v):
+        """
+        Return the number of vertices in the subtree rooted at v (arrays
+        accepted).
+        """
+        if self.subtree_sizes is None:
+            sizes = np.ones(self.n, dtype=np.int64)
+            orderDepths = self.depth[self.order]
+            bounds = np.searchsorted(orderDepths, np.arange(self.height() + 2))
+            # accumulate sizes into parents one level at a time, deepest first
+            for level in range(self.height(), 0, -1):
+                levelVertices = self.order[bounds[level]:bounds[level+1]]
+                np.add.at(sizes, self.parent[levelVertices], sizes[levelVertices])
+            self.subtree_sizes = sizes
+        if np.ndim(v) == 0:
+            return int(self.subtree_sizes[v])
+        return self.subtree_sizes[np.asarray(v, dtype=np.int64)]
+
+
+def isForest(G: Graph):
+    """
+    Return True if the graph is acyclic (each component is a tree).
+    """
+    return len(G.edges) == G.order() - componentCount(G)
+
+def firstPerTree(labels, keys):
+    """
+    For each tree label, return the vertex with the largest key (lowest
+    vertex index among ties), as an array indexed by label.
+    """
+    vertices = np.arange(len(labels))
+    order = np.lexsort((vertices, -keys, labels))
+    starts = np.flatnonzero(np.r_[True, labels[order][1:] != labels[order][:-1]])
+    return order[starts]
+
+class TreeMetrics:
+    """
+    TreeMetrics holds distance metrics for every tree of a forest, as
+    computed by findTreeMetrics(). Per-vertex arrays are indexed by vertex;
+    per-tree arrays are indexed by tree label, where trees are labeled
+    as by component.componentLabels().
+
+    Attributes
+    ----------
+    tree_labels : tree label of every vertex
+    eccentricity : eccentricity of every vertex within its tree
+    diameter : diameter of every tree
+    diameter_ends : (k, 2) array with the endpoints of one diameter path
+        per tree
+    radius : radius of every tree
+    center_mask : True at center vertices (one or two per tree)
+    centroid_mask : True at centroid vertices (one or two per tree)
+    """
+    
+    def __init__(self):
+        self.tree_labels = None
+        self.eccentricity = None
+        self.diameter = None
+        self.diameter_ends = None
+        self.radius = None
+        self.center_mask = None
+        self.centroid_mask = None
+        self.diameter_parents = None
+        
+    def __repr__(self):
+        return f"TreeMetrics .diameter={self.diameter.tolist()} .radius={self.radius.tolist()}"
+    
+    def treeCount(self):
+        return len(self.diameter)
+    
+    def centers(self, tree=0):
+        """
+        Return the center vertices of a tree, ascending.
+        """
+        return np.flatnonzero(self.center_mask & (self.tree_labels == tree)).tolist()
+    
+    def centroids(self, tree=0):
+        """
+        Return the centroid vertices of a tree, ascending.
+        """
+        return np.flatnonzero(self.centroid_mask & (self.tree_labels == tree)).tolist()
+    
+    def diameterPath(self, tree=0):
+        """
+        Return the vertices of a longest path of a tree, from
+        diameter_ends[tree][0] to diameter_ends[tree][1].
+        """
+        a, b = self.diameter_ends[tree].tolist()
+        path = [b]
+        while path[-1] != a:
+            path.append(int(self.diameter_parents[path[-1]]))
+        path.reverse()
+        return path
+
+def findTreeMetrics(G: Graph):
+    """
+    Compute eccentricities, diameters, radii, centers and centroids for
+    every tree of a forest in O(n) array operations.
+
+    Parameters
+    ----------
+    G : Graph
+        An acyclic graph; direction is ignored for a Digraph.
+
+    Behavior
+    --------
+    All trees are processed together; no step loops over the trees.
+    
+    - Diameters and eccentricities use the double sweep: a BFS from any
+      vertex ends at an end a of some longest path, a BFS from a finds
+      the other end b, and ecc(v) = max(d(a, v), d(b, v)).
+    - Centers are found by leaf peeling from the degree array: all
+      current leaves are removed each round, and the vertices removed in
+      a tree's last round are its center.
+    - Centroids use subtree sizes from the first BFS: v is a centroid if
+      no component of T - v has more than half of T's vertices.
+
+    Raises
+    ------
+    Exception
+        If G has a cycle.
+
+    Returns
+    -------
+    A TreeMetrics object.
+    """
+    if not isForest(G):
+        raise Exception("findTreeMetrics requires an acyclic graph")
+    index = G.adjacencyIndex('both')
+    labels = componentLabels(G)
+    metrics = TreeMetrics()
+    metrics.tree_labels = labels
+    
+    # double sweep
+    _, roots = np.unique(labels, return_index=True)
+    d0, parent0, order0 = breadthFirstLevels(index, roots)
+    ends_a = firstPerTree(labels, d0)
+    dA, parentA, _ = breadthFirstLevels(index, ends_a)
+    ends_b = firstPerTree(labels, dA)
+    dB, _, _ = breadthFirstLevels(index, ends_b)
+    metrics.eccentricity = np.maximum(dA, dB)
+    metrics.diameter = dA[ends_b]
+    metrics.diameter_ends = np.column_stack((ends_a, ends_b))
+    metrics.diameter_parents = parentA
+    
+    # leaf peeling
+    degree = index.degrees().copy()
+    alive = np.ones(G.n, dtype=bool)
+    peelRound = np.zeros(G.n, dtype=np.int64)
+    current = np.flatnonzero(degree <= 1)
+    peel = 0
+    while len(current) > 0:
+        peelRound[current] = peel
+        alive[current] = False
+        _, slots = index.expand(current)
+        neighbors = index.indices[slots]
+        neighbors = neighbors[alive[neighbors]]
+        np.subtract.at(degree, neighbors, 1)
+        neighbors = np.unique(neighbors)
+        current = neighbors[degree[neighbors] <= 1]
+        peel += 1
+    lastRound = np.zeros(len(roots), dtype=np.int64)
+    np.maximum.at(lastRound, labels, peelRound)
+    metrics.center_mask = peelRound == lastRound[labels]
+    metrics.radius = (metrics.diameter + 1) // 2
+    
+    # subtree sizes in the BFS forest from the first sweep
+    sizes = np.ones(G.n, dtype=np.int64)
+    largestChild = np.zeros(G.n, dtype=np.int64)
+    bounds = np.searchsorted(d0[order0], np.arange(d0.max() + 2)) if G.n > 0 else [0]
+    for level in range(len(bounds) - 2, 0, -1):
+        levelVertices = order0[bounds[level]:bounds[level+1]]
+        np.add.at(sizes, parent0[levelVertices], sizes[levelVertices])
+        np.maximum.at(largestChild, parent0[levelVertices], sizes[levelVertices])
+    treeSizes = np.bincount(labels)
+    largestPart = np.maximum(largestChild, treeSizes[labels] - sizes)
+    metrics.centroid_mask = 2 * largestPart <= treeSizes[labels]
+    return metrics
+
+def requireTreeMetrics(G: Graph):
+    if not isTree(G):
+        raise Exception("This function requires a graph that is a tree")
+    return findTreeMetrics(G)
+
+def treeEccentricities(G: Graph):
+    """
+    Return a numpy array with the eccentricity of every vertex of a tree.
+    """
+    return requireTreeMetrics(G).eccentricity
+
+def treeDiameter(G: Graph):
+    """
+    Return the diameter (longest path length) of a tree.
+    """
+    return int(requireTreeMetrics(G).diameter[0])
+
+def treeDiameterPath(G: Graph):
+    """
+    Return a longest path of a tree, as a list of vertices.
     """
-    leaves = []
-    for vertex in range(0, G.order()):
-        if G.vertexDegree(vertex) == 1:
-            leaves.append(vertex)
-    return leaves
+    return requireTreeMetrics(G).diameterPath()
 
+def treeRadius(G: Graph):
+    """
+    Return the radius (minimum eccentricity) of a tree.
+    """
+    return int(requireTreeMetrics(G).radius[0])
 
+def treeCenter(G: Graph):
+    """
+    Return the center of a tree (the one or two vertices of minimum
+    eccentricity) as an ascending list.
+    """
+    return requireTreeMetrics(G).centers()
+
+def treeCentroid(G: Graph):
+    """
+    Return the centroid of a tree (the one or two vertices whose removal
+    leaves no component with more than n/2 vertices) as an ascending list.
+    """
+    return requireTreeMetrics(G).centroids()
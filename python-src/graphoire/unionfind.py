@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:05:31 2026
+
+@author: mathaes
+"""
+
+import numpy as np
+
+class UnionFind:
+    """
+    UnionFind is a disjoint-set forest over the integers [0, n-1], with
+    union by size and path halving, so a sequence of unions and finds
+    runs in amortized near-constant time per operation.
+
+    The forest is kept in numpy arrays (.parent and .size) so that it can
+    be bulk-loaded from and exported to edge and label arrays without
+    per-element Python objects; .size is only meaningful at root entries.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.parent = np.arange(n, dtype=np.int64)
+        self.size = np.ones(n, dtype=np.int64)
+        self.count = n
+
+    def find(self, x):
+        """
+        Return the root (representative) of the set containing x.
+        """
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return int(x)
+
+    def union(self, x, y):
+        """
+        Merge the sets containing x and y.
+
+        Returns
+        -------
+        None if x and y were already in the same set, otherwise a tuple
+        (root, absorbed) of the surviving root and the root that was
+        merged into it.
+        """
+        rx = self.find(x)
+        ry = self.find(y)
+        if rx == ry:
+            return None
+        if self.size[rx] < self.size[ry]:
+            rx, ry = ry, rx
+        self.parent[ry] = rx
+        self.size[rx] += self.size[ry]
+        self.count -= 1
+        return (rx, ry)
+
+    def unionEdges(self, edges):
+        """
+        Merge the endpoint sets of every edge in an (m, 2) edge array.
+        """
+        for x, y in np.asarray(edges).tolist():
+            self.union(x, y)
+
+    def setSize(self, x):
+        """
+        Return the number of elements in the set containing x.
+        """
+        return int(self.size[self.find(x)])
+
+    def roots(self):
+        """
+        Return an array with the root of every element, fully compressing
+        the forest as a side effect.
+        """
+        parent = self.parent
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        self.parent = parent
+        return parent
+
+def minimumRootForest(n: int, edges, parent=None):
+    """
+    Build a union-find forest for an (m, 2) edge array with whole-array
+    numpy operations, without a Python-level loop over the edges.
+
+    Parameters
+    ----------
+    n : int
+        The number of elements (vertices).
+    edges : numpy integer array of shape (m, 2)
+        The pairs to merge.
+    parent : numpy integer array, optional
+        A fully-compressed forest to extend, as returned by an earlier
+        call; it is updated in place. The default is None (start from
+        singletons).
+
+    Behavior
+    --------
+    Each round hooks the larger of the two roots of every unsettled
+    edge under the smaller (np.minimum.at), then compresses the forest
+    by pointer jumping, and drops edges whose endpoints now share a root.
+    Roots only ever decrease, so the forest stays acyclic.
+
+    Returns
+    -------
+    A numpy integer array in which entry v is the lowest element of the
+    set containing v.
+    """
+    if parent is None:
+        parent = np.arange(n, dtype=np.int64)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    u = edges[:, 0]
+    v = edges[:, 1]
+    while len(u) > 0:
+        pu = parent[u]
+        pv = parent[v]
+        unsettled = pu != pv
+        if not unsettled.any():
+            break
+        u = u[unsettled]
+        v = v[unsettled]
+        pu = pu[unsettled]
+        pv = pv[unsettled]
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent[:] = grandparent
+    return parent
@@ -6,17 +6,35 @@ Created on Sat Mar  6 16:18:01 2021
 @author: mathaes
 """
 __all__ = ["adjacencytests",
+           "bellmanfordtests",
+           "blocktests",
            "diagraphtests", 
+           "componenttests",
+           "contractiontests",
+           "deltasteppingtests",
+           "distancetests",
+           "floydwarshalltests",
            "fordfulkersontests", 
            "graphtests", 
            "graphfactorytests",
            "networktests", 
-           "prufertests"]
+           "prufertests",
+           "traversaltests",
+           "treetests"]
 
 from graphoiretests.adjacencytests import *
+from graphoiretests.bellmanfordtests import *
+from graphoiretests.blocktests import *
+from graphoiretests.componenttests import *
+from graphoiretests.contractiontests import *
+from graphoiretests.deltasteppingtests import *
+from graphoiretests.distancetests import *
 from graphoiretests.digraphtests import *
+from graphoiretests.floydwarshalltests import *
 from graphoiretests.fordfulkersontests import *
 from graphoiretests.graphtests import *
 from graphoiretests.graphfactorytests import *
 from graphoiretests.networktests import *
 from graphoiretests.prufertests import *
+from graphoiretests.traversaltests import *
+from graphoiretests.treetests import *
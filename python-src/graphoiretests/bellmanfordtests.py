@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:40:15 2026
+
+@author: mathaes
+"""
+
+import math
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import bellman_ford
+
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.digraphfactory import DigraphFactory
+from graphoire.algorithm.bellmanford import bellmanFord, findNegativeCycle, Johnson
+
+def RunAllBellmanFordTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestBellmanFord))
+    suite.addTest(unittest.makeSuite(TestJohnson))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+def bellmanfordtests_main():
+    unittest.main()
+
+def referenceCosts(D):
+    edges = D.edgeArray()
+    matrix = csr_matrix((D.edgeWeightArray().astype(float), (edges[:, 0], edges[:, 1])),
+                        shape=(D.order(), D.order()))
+    return bellman_ford(matrix, directed=True)
+
+class TestBellmanFord(unittest.TestCase):
+
+    def testSmall(self):
+        D = Digraph(4)
+        D.edges = [[0, 1], [1, 2], [0, 2], [2, 3]]
+        D.setEdgeWeights(None, [4, -3, 2, 1])
+        costs, parents, cycle = bellmanFord(D, 0)
+        self.assertEqual(None, cycle)
+        self.assertEqual([0, 4, 1, 2], costs.tolist())
+        self.assertEqual([-1, 0, 1, 2], parents.tolist())
+        costs, parents, cycle = bellmanFord(D, 3)
+        self.assertEqual([math.inf, math.inf, math.inf, 0], costs.tolist())
+
+    def testMatchesReference(self):
+        D = DigraphFactory.makeRandomWeighted(80, 300, -10, 20, acyclic=True, seed=4)
+        expected = referenceCosts(D)
+        for s in [0, 5, 40]:
+            costs, parents, cycle = bellmanFord(D, s)
+            self.assertEqual(None, cycle)
+            self.assertTrue(np.array_equal(expected[s], costs))
+            for v in range(0, 80):
+                if parents[v] >= 0:
+                    self.assertEqual(costs[v], costs[parents[v]] + D.getEdgeWeight(int(parents[v]), v))
+
+    def testNegativeCycle(self):
+        D = Digraph(5)
+        D.edges = [[0, 1], [1, 2], [2, 3], [3, 1], [3, 4]]
+        D.setEdgeWeights(None, [1, 2, -4, 1, 1])
+        cycle = findNegativeCycle(D)
+        self.assertEqual([1, 2, 3], sorted(cycle))
+        total = sum(D.getEdgeWeight(cycle[i], cycle[(i + 1) % len(cycle)]) for i in range(0, len(cycle)))
+        self.assertTrue(total < 0)
+        self.assertEqual(None, bellmanFord(D, 4)[2])
+        self.assertEqual([1, 2, 3], sorted(bellmanFord(D, 0)[2]))
+
+        G = GraphFactory.makePath(3)
+        G.setEdgeWeights(None, [2, -1])
+        self.assertEqual([1, 2], sorted(findNegativeCycle(G)))
+        G.setEdgeWeights(None, [2, 1])
+        self.assertEqual(None, findNegativeCycle(G))
+
+
+class TestJohnson(unittest.TestCase):
+
+    def testMatchesReference(self):
+        D = DigraphFactory.makeRandomWeighted(60, 240, -10, 20, acyclic=True, seed=9)
+        expected = referenceCosts(D)
+        johnson = Johnson(D)
+        self.assertTrue(np.all(johnson.reweighted.edgeWeightArray() >= 0))
+        self.assertTrue(np.allclose(expected, johnson.findLeastCostMatrix(processes=1)))
+        for s in [0, 7, 30]:
+            costs = johnson.findAllLeastCosts(s)
+            self.assertTrue(np.allclose(expected[s], costs))
+            for t in [59, 45, 3]:
+                path, cost = johnson.findLeastCostPath(s, t)
+                if math.inf == expected[s, t]:
+                    self.assertEqual(None, path)
+                    continue
+                self.assertAlmostEqual(expected[s, t], cost)
+                self.assertAlmostEqual(cost, sum(D.getEdgeWeight(path[i], path[i + 1]) for i in range(0, len(path) - 1)))
+
+    def testNegativeCycleRaises(self):
+        D = Digraph(3)
+        D.edges = [[0, 1], [1, 2], [2, 0]]
+        D.setEdgeWeights(None, [1, 1, -3])
+        with self.assertRaises(Exception):
+            Johnson(D)
+
+
+if __name__ == "__main__":
+    bellmanfordtests_main()
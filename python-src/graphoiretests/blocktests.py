@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:48:03 2026
+
+@author: mathaes
+"""
+
+import unittest
+
+import copy
+import random
+
+from graphoire.graph import Graph
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.component import componentCount, verticesAreConnected
+from graphoire.block import *
+
+def RunAllBlockTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestBlocks))
+    suite.addTest(unittest.makeSuite(TestBlockCutTree))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+    
+def blocktests_main():
+    unittest.main()
+    
+class TestBlocks(unittest.TestCase):
+    
+    def makeBowtieWithTail(self):
+        # triangles {0,1,2} and {2,3,4} share cut vertex 2;
+        # path 4-5-6 hangs off the second triangle; 7 is isolated
+        G = Graph(8)
+        for edge in [[0, 1], [0, 2], [1, 2], [2, 3], [2, 4], [3, 4], [4, 5], [5, 6]]:
+            G.addEdge(edge[0], edge[1])
+        return G
+    
+    def testBlocks(self):
+        G = self.makeBowtieWithTail()
+        self.assertEqual([[0, 1, 2], [2, 3, 4], [4, 5], [5, 6], [7]], findBlocks(G))
+        self.assertEqual([2, 4, 5], findCutVertices(G))
+        self.assertEqual([[4, 5], [5, 6]], findBridges(G))
+        
+        structure = findBlockStructure(G)
+        self.assertEqual([0, 0, 0, 1, 1, 1, 2, 3], structure.edge_blocks.tolist())
+        self.assertEqual([0, 1], structure.blocksWithVertex(2))
+        
+    def testIsCutVertex(self):
+        G = self.makeBowtieWithTail()
+        self.assertTrue(isCutVertex(2, G))
+        self.assertFalse(isCutVertex(0, G))
+        self.assertFalse(isCutVertex(7, G))
+        self.assertEqual([False, True, True, False], isCutVertex([3, 4, 5, 6], G).tolist())
+        with self.assertRaises(Exception):
+            isCutVertex(8, G)
+            
+    def testFindBlockWithVertex(self):
+        G = self.makeBowtieWithTail()
+        self.assertEqual([0, 1, 2], findBlockWithVertex(0, G))
+        self.assertEqual([0, 1, 2], findBlockWithVertex(2, G))
+        self.assertEqual([[0, 1, 2], [2, 3, 4]], findBlocksWithVertex(2, G))
+        self.assertEqual([7], findBlockWithVertex(7, G))
+        
+    def testCacheInvalidation(self):
+        G = self.makeBowtieWithTail()
+        self.assertTrue(isCutVertex(5, G))
+        G.addEdge(4, 6)
+        self.assertFalse(isCutVertex(5, G))
+        self.assertEqual([[0, 1, 2], [2, 3, 4], [4, 5, 6], [7]], findBlocks(G))
+        
+    def testSpecialGraphs(self):
+        self.assertEqual([list(range(0, 10))], findBlocks(GraphFactory.makePetersen()))
+        self.assertEqual([], findCutVertices(GraphFactory.makeCycle(6)))
+        P5 = GraphFactory.makePath(5)
+        self.assertEqual([1, 2, 3], findCutVertices(P5))
+        self.assertEqual(4, len(findBridges(P5)))
+        self.assertEqual([], findBlocks(Graph(0)))
+        
+    def testLoops(self):
+        B = Graph(4)
+        B.edges = [[0, 1], [1, 1], [1, 2], [3, 3]]
+        self.assertEqual([[0, 1], [1, 2], [3]], findBlocks(B))
+        self.assertEqual([1], findCutVertices(B))
+        self.assertEqual([[0, 1], [1, 2]], findBridges(B))
+        self.assertEqual([0, -1, 1, -1], findBlockStructure(B).edge_blocks.tolist())
+        L = Graph(1)
+        L.edges = [[0, 0]]
+        self.assertEqual([[0]], findBlocks(L))
+        
+    def testDigraphUsesUnderlyingGraph(self):
+        D = Digraph(3)
+        D.addEdge(0, 1)
+        D.addEdge(1, 0)
+        D.addEdge(1, 2)
+        self.assertEqual([[0, 1], [1, 2]], findBlocks(D))
+        self.assertEqual([[0, 1], [1, 2]], findBridges(D))
+        self.assertEqual([0, 0, 1], findBlockStructure(D).edge_blocks.tolist())
+        
+    def testAgainstVertexDeletion(self):
+        random.seed(11)
+        for trial in range(0, 5):
+            G = Graph(18)
+            for _ in range(0, 24):
+                u, v = random.sample(range(0, 18), 2)
+                G.addEdge(u, v)
+            G.sortEdges()
+            baseCount = componentCount(G)
+            for vtx in range(0, G.n):
+                H = copy.deepcopy(G)
+                H.deleteVertex(vtx)
+                isolatedLoss = 1 if G.vertexDegree(vtx) == 0 else 0
+                expected = componentCount(H) > baseCount - isolatedLoss
+                self.assertEqual(expected, isCutVertex(vtx, G))
+            for edge in G.edges:
+                H = copy.deepcopy(G)
+                H.deleteEdge(edge)
+                self.assertEqual(componentCount(H) > baseCount, edge in findBridges(G))
+        
+        
+class TestBlockCutTree(unittest.TestCase):
+    
+    def makeChain(self):
+        # triangle {0,1,2} - bridge 2-3 - square {3,4,5,6} - bridge 6-7; 8 isolated
+        G = Graph(9)
+        for edge in [[0, 1], [0, 2], [1, 2], [2, 3], [3, 4], [4, 5], [5, 6], [3, 6], [6, 7]]:
+            G.addEdge(edge[0], edge[1])
+        return G
+    
+    def testStructure(self):
+        G = self.makeChain()
+        bct = findBlockCutTree(G)
+        # blocks [0,1,2], [2,3], [3,4,5,6], [6,7], [8]; cut vertices 2, 3, 6
+        self.assertEqual(5, bct.block_count)
+        self.assertEqual([2, 3, 6], bct.cut_vertices.tolist())
+        self.assertEqual(8, bct.nodeCount())
+        self.assertEqual([0, 0, 5, 6, 2, 2, 7, 3, 4], bct.vertex_nodes.tolist())
+        self.assertTrue(bct is findBlockCutTree(G))
+        
+    def testSeparates(self):
+        G = self.makeChain()
+        self.assertTrue(vertexSeparates(2, 0, 7, G))
+        self.assertTrue(vertexSeparates(6, 4, 7, G))
+        self.assertFalse(vertexSeparates(4, 3, 6, G))
+        self.assertFalse(vertexSeparates(6, 0, 4, G))
+        self.assertFalse(vertexSeparates(3, 0, 8, G))
+        with self.assertRaises(Exception):
+            vertexSeparates(3, 3, 7, G)
+            
+        batch = findBlockCutTree(G).separates([2, 3, 5, 6], 0, [4, 1, 7, 7])
+        self.assertEqual([True, False, False, True], batch.tolist())
+        
+    def testPathQueries(self):
+        G = self.makeChain()
+        bct = findBlockCutTree(G)
+        self.assertEqual([0, 1, 2, 3], bct.blocksOnAllPaths(0, 7))
+        self.assertEqual([2, 3, 6], bct.cutVerticesOnAllPaths(0, 7))
+        self.assertEqual([2], bct.blocksOnAllPaths(4, 5))
+        self.assertEqual([1, 2], bct.blocksOnAllPaths(2, 5))
+        self.assertEqual([3], bct.cutVerticesOnAllPaths(2, 5))
+        self.assertEqual([], bct.blocksOnAllPaths(0, 8))
+        
+    def testCacheInvalidation(self):
+        G = self.makeChain()
+        self.assertTrue(vertexSeparates(3, 0, 5, G))
+        G.addEdge(1, 5)
+        self.assertFalse(vertexSeparates(3, 0, 5, G))
+        
+    def testAgainstVertexDeletion(self):
+        random.seed(5)
+        for trial in range(0, 4):
+            G = Graph(14)
+            for _ in range(0, 17):
+                u, v = random.sample(range(0, 14), 2)
+                G.addEdge(u, v)
+            G.sortEdges()
+            for vtx in range(0, G.n):
+                H = copy.deepcopy(G)
+                H.deleteVertex(vtx)
+                for u in range(0, G.n):
+                    for w in range(u + 1, G.n):
+                        if vtx == u or vtx == w:
+                            continue
+                        hu = u - 1 if u > vtx else u
+                        hw = w - 1 if w > vtx else w
+                        expected = verticesAreConnected(G, [u, w]) and not verticesAreConnected(H, [hu, hw])
+                        self.assertEqual(expected, vertexSeparates(vtx, u, w, G))
+        
+        
+if __name__ == "__main__":
+    blocktests_main()
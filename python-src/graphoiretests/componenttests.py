@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:12:40 2026
+
+@author: mathaes
+"""
+
+import unittest
+
+import numpy as np
+
+from graphoire.graph import Graph
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.component import *
+
+def RunAllComponentTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestComponents))
+    suite.addTest(unittest.makeSuite(TestIncrementalConnectivity))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+    
+def componenttests_main():
+    unittest.main()
+    
+class TestComponents(unittest.TestCase):
+    
+    def makeThreeComponentGraph(self):
+        # components {0, 2, 5}, {1, 4}, {3}
+        G = Graph(6)
+        G.addEdge(0, 5)
+        G.addEdge(2, 5)
+        G.addEdge(1, 4)
+        return G
+    
+    def testFindComponents(self):
+        G = self.makeThreeComponentGraph()
+        self.assertEqual([[0, 2, 5], [1, 4], [3]], findComponents(G))
+        self.assertEqual(3, componentCount(G))
+        self.assertEqual([0, 1, 0, 2, 1, 0], componentLabels(G).tolist())
+        self.assertEqual([], findComponents(Graph(0)))
+        
+    def testVerticesAreConnected(self):
+        G = self.makeThreeComponentGraph()
+        self.assertTrue(verticesAreConnected(G, [0, 5]))
+        self.assertTrue(verticesAreConnected(G, [2, 0, 5]))
+        self.assertFalse(verticesAreConnected(G, [0, 5, 1]))
+        self.assertFalse(verticesAreConnected(G, [3, 4]))
+        with self.assertRaises(Exception):
+            verticesAreConnected(G, [0, 6])
+            
+    def testVerticesAreConnectedMany(self):
+        G = self.makeThreeComponentGraph()
+        results = verticesAreConnectedMany(G, [[0, 5], [1, 4], [3, 3], [0, 1], [2, 3]])
+        self.assertEqual([True, True, True, False, False], results.tolist())
+        
+        pairs = np.array([[0, 2], [4, 5]])
+        self.assertEqual([True, False], verticesAreConnectedMany(G, pairs).tolist())
+        with self.assertRaises(Exception):
+            verticesAreConnectedMany(G, [[0, -1]])
+        
+    def testCacheInvalidation(self):
+        G = self.makeThreeComponentGraph()
+        self.assertFalse(verticesAreConnected(G, [0, 1]))
+        G.addEdge(2, 4)
+        self.assertTrue(verticesAreConnected(G, [0, 1]))
+        self.assertEqual([[0, 1, 2, 4, 5], [3]], findComponents(G))
+        
+        G.deleteEdge([2, 4])
+        self.assertFalse(verticesAreConnected(G, [0, 1]))
+        
+        G.deleteVertex(3)
+        self.assertEqual([[0, 2, 4], [1, 3]], findComponents(G))
+        
+    def testDigraphIgnoresDirection(self):
+        D = Digraph(4)
+        D.addEdge(1, 0)
+        D.addEdge(1, 2)
+        self.assertTrue(verticesAreConnected(D, [0, 2]))
+        self.assertEqual([[0, 1, 2], [3]], findComponents(D))
+        
+    def testParallelMatchesSerial(self):
+        rng = np.random.default_rng(7)
+        G = Graph(300)
+        for u, v in rng.integers(0, 300, size=(220, 2)).tolist():
+            if u != v:
+                G.addEdge(u, v)
+        serial = computeComponentLabels(G)
+        parallel = computeComponentLabelsParallel(G, 3)
+        self.assertEqual(serial.tolist(), parallel.tolist())
+        
+        serialComponents = findComponents(G)
+        G.clearCaches()
+        self.assertEqual(serialComponents, findComponents(G, workers=3))
+        
+    def testLargeRandomTree(self):
+        tree = GraphFactory.makeRandomTree(200)
+        self.assertTrue(isConnected(tree))
+        tree.deleteEdge(tree.edges[0])
+        self.assertEqual(2, componentCount(tree))
+        
+        
+class RecordingClient(ConnectivityClient):
+    def __init__(self):
+        self.merges = []
+        self.rebuilds = 0
+        
+    def componentsMerged(self, connectivity, root, absorbed):
+        self.merges.append((root, absorbed))
+        
+    def connectivityRebuilt(self, connectivity):
+        self.rebuilds += 1
+        
+class TestIncrementalConnectivity(unittest.TestCase):
+    
+    def testStreamingInsertions(self):
+        G = Graph(6)
+        client = RecordingClient()
+        ic = IncrementalConnectivity(G, client)
+        self.assertEqual(6, ic.componentCount())
+        self.assertEqual(1, client.rebuilds)
+        
+        G.addEdge(0, 1)
+        G.addEdge(2, 3)
+        G.addEdge(1, 3)
+        self.assertEqual(3, ic.componentCount())
+        self.assertEqual(4, ic.componentSize(2))
+        self.assertTrue(ic.connected(0, 2))
+        self.assertFalse(ic.connected(0, 4))
+        self.assertEqual(3, len(client.merges))
+        
+        # an edge inside a component does not merge anything
+        G.addEdge(0, 2)
+        self.assertEqual(3, len(client.merges))
+        self.assertEqual(1, client.rebuilds)
+        
+        # queries through component.py use the attached structure
+        self.assertEqual([0, 0, 0, 0, 1, 2], componentLabels(G).tolist())
+        self.assertEqual(3, componentCount(G))
+        self.assertTrue(verticesAreConnected(G, [3, 0, 1]))
+        
+    def testDeletionRebuildsLazily(self):
+        G = GraphFactory.makePath(5)
+        client = RecordingClient()
+        ic = IncrementalConnectivity(G, client)
+        self.assertEqual(1, ic.componentCount())
+        
+        G.deleteEdge([1, 2])
+        self.assertEqual(1, client.rebuilds)
+        self.assertEqual(2, ic.componentCount())
+        self.assertEqual(2, client.rebuilds)
+        self.assertEqual(3, ic.componentSize(4))
+        
+        G.deleteVertex(0)
+        self.assertEqual([[0], [1, 2, 3]], findComponents(G))
+        
+        ic.detach()
+        self.assertEqual(None, G.connectivity)
+        G.addEdge(0, 1)
+        self.assertEqual(1, componentCount(G))
+        
+    def testMatchesBatchLabels(self):
+        G = Graph(40)
+        ic = IncrementalConnectivity(G)
+        tree = GraphFactory.makeRandomTree(40)
+        for edge in tree.edges[:25]:
+            G.addEdge(edge[0], edge[1])
+        self.assertEqual(computeComponentLabels(G).tolist(), ic.labels().tolist())
+        self.assertEqual(15, ic.componentCount())
+        
+        
+if __name__ == "__main__":
+    componenttests_main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 19:58:42 2026
+
+@author: mathaes
+"""
+
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.digraphfactory import DigraphFactory
+from graphoire.algorithm.dijkstra import Dijkstra
+from graphoire.algorithm.contraction import ContractionHierarchy
+
+def RunAllContractionTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestContractionHierarchy))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+def contractiontests_main():
+    unittest.main()
+
+class TestContractionHierarchy(unittest.TestCase):
+
+    def assertMatchesDijkstra(self, G, hierarchy, queries, seed):
+        weights = {}
+        for (u, w), weight in zip(G.edgeArray().tolist(), G.edgeWeightArray().tolist()):
+            weights[(u, w)] = weight
+            if not G.directed:
+                weights[(w, u)] = weight
+        rand = np.random.default_rng(seed)
+        for query in range(0, queries):
+            s, t = [int(v) for v in rand.integers(0, G.order(), size=2)]
+            djk = Dijkstra(G)
+            expected = djk.findLeastCostPath(s, t)
+            path = hierarchy.findLeastCostPath(s, t)
+            if None == expected:
+                self.assertEqual(None, path)
+                self.assertEqual(math.inf, hierarchy.findLeastCost(s, t))
+                continue
+            cost = djk.getPathCost(t)
+            self.assertEqual(cost, hierarchy.findLeastCost(s, t))
+            self.assertEqual(s, path[0])
+            self.assertEqual(t, path[-1])
+            # the unpacked path uses original edges and has the least cost
+            self.assertEqual(cost, sum(weights[(path[i], path[i + 1])] for i in range(0, len(path) - 1)))
+
+    def testSmall(self):
+        C = GraphFactory.makeCycle(5)
+        C.setEdgeWeights([[0, 1], [1, 2], [2, 3], [3, 4], [0, 4]], [1, 1, 1, 10, 2])
+        hierarchy = ContractionHierarchy.fromGraph(C)
+        self.assertTrue(hierarchy.isComplete())
+        self.assertEqual(list(range(0, 5)), sorted(hierarchy.rank))
+        self.assertEqual([4, 0, 1, 2, 3], hierarchy.findLeastCostPath(4, 3))
+        self.assertEqual(5, hierarchy.findLeastCost(4, 3))
+        self.assertEqual([2], hierarchy.findLeastCostPath(2, 2))
+
+        D = Digraph(3)
+        D.addEdge(0, 1)
+        D.addEdge(1, 2)
+        hierarchy = ContractionHierarchy.fromGraph(D)
+        self.assertEqual([0, 1, 2], hierarchy.findLeastCostPath(0, 2))
+        self.assertEqual(None, hierarchy.findLeastCostPath(2, 0))
+
+    def testMatchesDijkstra(self):
+        for factory in [GraphFactory, DigraphFactory]:
+            G = factory.makeRandomWeighted(150, 400, 1, 20, seed=5)
+            hierarchy = ContractionHierarchy.fromGraph(G)
+            self.assertMatchesDijkstra(G, hierarchy, 100, 6)
+
+    def testGridSettlesFewVertices(self):
+        G = GraphFactory.makeEmpty(900)
+        edges = []
+        for r in range(0, 30):
+            for c in range(0, 30):
+                if c + 1 < 30:
+                    edges.append([r * 30 + c, r * 30 + c + 1])
+                if r + 1 < 30:
+                    edges.append([r * 30 + c, r * 30 + c + 30])
+        G.edges = edges
+        G.setEdgeWeights(None, np.random.default_rng(2).integers(1, 10, size=len(edges)))
+        hierarchy = ContractionHierarchy.fromGraph(G)
+        self.assertMatchesDijkstra(G, hierarchy, 40, 3)
+        djk = Dijkstra(G)
+        djk.findLeastCostPath(0, 899)
+        hierarchy.findLeastCost(0, 899)
+        self.assertTrue(hierarchy.settledCount * 4 < djk.settledCount)
+
+    def testResumeAndSerialize(self):
+        G = DigraphFactory.makeRandomWeighted(80, 200, 1, 20, seed=9)
+        hierarchy = ContractionHierarchy(G)
+        self.assertFalse(hierarchy.contract(maxVertices=30))
+        self.assertEqual(30, hierarchy.level)
+        with self.assertRaises(Exception):
+            hierarchy.findLeastCost(0, 1)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "graph.ch.npz")
+            hierarchy.save(path)
+            resumed = ContractionHierarchy.load(path, G)
+            self.assertEqual(30, resumed.level)
+            self.assertTrue(resumed.contract())
+            self.assertMatchesDijkstra(G, resumed, 60, 10)
+
+            resumed.save(path)
+            loaded = ContractionHierarchy.load(path, G)
+            self.assertTrue(loaded.isComplete())
+            self.assertEqual(resumed.rank, loaded.rank)
+            self.assertMatchesDijkstra(G, loaded, 60, 11)
+
+            G.setEdgeWeight(G.edges[0][0], G.edges[0][1], 1000)
+            with self.assertRaises(Exception):
+                ContractionHierarchy.load(path, G)
+
+
+if __name__ == "__main__":
+    contractiontests_main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 11:48:20 2026
+
+@author: mathaes
+"""
+
+import math
+import unittest
+
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.digraphfactory import DigraphFactory
+from graphoire.algorithm.dijkstra import Dijkstra
+from graphoire.algorithm.deltastepping import DeltaStepping, deltaStepping
+
+def RunAllDeltaSteppingTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestDeltaStepping))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+def deltasteppingtests_main():
+    unittest.main()
+
+class TestDeltaStepping(unittest.TestCase):
+
+    def assertMatchesDijkstra(self, G, search, sources):
+        for s in sources:
+            costs, parents = search.findAllLeastCosts(s)
+            expected = Dijkstra(G, 'heap').findAllLeastCostPaths(s)
+            self.assertEqual([expected[v] for v in range(0, G.order())], costs.tolist())
+            for v in range(0, G.order()):
+                if parents[v] >= 0:
+                    self.assertEqual(costs[v], costs[parents[v]] + G.getEdgeWeight(int(parents[v]), v))
+                else:
+                    self.assertTrue(v == s or math.inf == costs[v])
+
+    def testSmall(self):
+        C = GraphFactory.makeCycle(5)
+        C.setEdgeWeights([[0, 1], [1, 2], [2, 3], [3, 4], [0, 4]], [1, 1, 1, 10, 2])
+        costs, parents = deltaStepping(C, 4, delta=2)
+        self.assertEqual([2, 3, 4, 5, 0], costs.tolist())
+        search = DeltaStepping(C, delta=2)
+        search.findAllLeastCosts(4)
+        self.assertEqual([4, 0, 1, 2, 3], search.getPath(3))
+
+        D = Digraph(3)
+        D.addEdge(0, 1)
+        costs, parents = deltaStepping(D, 1)
+        self.assertEqual([math.inf, 0, math.inf], costs.tolist())
+        search = DeltaStepping(D)
+        search.findAllLeastCosts(0)
+        self.assertEqual([0, 1], search.getPath(1))
+        self.assertEqual(None, search.getPath(2))
+
+    def testMatchesDijkstra(self):
+        for factory in [GraphFactory, DigraphFactory]:
+            for integral, high in [(True, 30), (False, 10)]:
+                G = factory.makeRandomWeighted(150, 500, 0, high, integral, seed=3)
+                for delta in [None, 0.5, 5, 100]:
+                    self.assertMatchesDijkstra(G, DeltaStepping(G, delta), [0, 77])
+
+    def testPools(self):
+        G = DigraphFactory.makeRandomWeighted(200, 800, 0, 30, seed=12)
+        for pool in ['thread', 'process']:
+            search = DeltaStepping(G, 10, workers=2, pool=pool, chunkSize=8)
+            self.assertMatchesDijkstra(G, search, [5])
+        with self.assertRaises(Exception):
+            DeltaStepping(G, pool='fork')
+
+
+if __name__ == "__main__":
+    deltasteppingtests_main()
@@ -12,15 +12,16 @@ import unittest
 import copy
 
 from graphoire.graph import Graph
+from graphoire.digraph import Digraph
 from graphoire.graphfactory import GraphFactory
-from graphoire.algorithm.dfstree import dfstree, DFSTreeVisitor
+from graphoire.algorithm.dfstree import dfstree, dfsTreeParents, DFSTreeVisitor
 
 def dfstreetests_main():
     unittest.main()
     
 class TestDFSTree(unittest.TestCase):
     
-    def XtestSimplePathSearch(self):
+    def testSimplePathSearch(self):
         expectedEdges = [[0,1], [1,2], [2,3], [3,4]]
         
         P5 = GraphFactory.makePath(5)
@@ -42,7 +43,7 @@ class TestDFSTree(unittest.TestCase):
             self.assertTrue(edge in edges3)
         #print (edges3)
 
-    def XtestTreeSearch(self):
+    def testTreeSearch(self):
         tree = GraphFactory.makeRandomTree(12)
         #print (tree)
         edges = dfstree(tree, start=5)
@@ -51,7 +52,7 @@ class TestDFSTree(unittest.TestCase):
         for edge in tree.edges:
             self.assertTrue(edge in edges)
         
-    def XtestPetersenDFS(self):
+    def testPetersenDFS(self):
         pet = GraphFactory.makePetersen()
         #print (pet)
         edges = dfstree(pet)
@@ -84,7 +85,57 @@ class TestDFSTree(unittest.TestCase):
         self.assertEqual(23, len(vset))
         for n in range(0, 23):
             self.assertTrue(n in vset)
-        
+
+    def testParentArray(self):
+        G = GraphFactory.makeCycle(6)
+        G.addEdge(0, 3)
+        parent, order = dfsTreeParents(G, start=0)
+        self.assertEqual([-1, 0, 1, 2, 3, 4], parent.tolist())
+        self.assertEqual([0, 1, 2, 3, 4, 5], order.tolist())
+
+        G = Graph(5)
+        G.addEdge(0, 1)
+        G.addEdge(3, 4)
+        parent, order = dfsTreeParents(G, start=4)
+        self.assertEqual([-1, -1, -1, 4, -1], parent.tolist())
+        self.assertEqual([4, 3], order.tolist())
+
+    def testDirection(self):
+        D = Digraph(4)
+        D.addEdge(1, 0)
+        D.addEdge(1, 2)
+        D.addEdge(2, 3)
+        self.assertEqual([0], dfsTreeParents(D, 0, direction='out')[1].tolist())
+        self.assertEqual([0, 1], dfsTreeParents(D, 0, direction='in')[1].tolist())
+        self.assertEqual(3, len(dfstree(D)))
+
+    def testLongPath(self):
+        # deep enough to overflow a recursive search
+        P = GraphFactory.makePath(50000)
+        parent, order = dfsTreeParents(P, start=0)
+        self.assertEqual(list(range(0, 50000)), order.tolist())
+
+    def testVisitor(self):
+        class HighestFirst(DFSTreeVisitor):
+            def __init__(self):
+                super().__init__()
+                self.calls = 0
+
+            def visit(self, G, vertex, neighbors):
+                self.calls += 1
+                self.nextVertex = neighbors[-1]
+                self.stopSearch = self.calls > 3
+
+        visitor = HighestFirst()
+        edges = dfstree(GraphFactory.makeComplete(6), start=0, visitor=visitor)
+        self.assertEqual([[0, 5], [4, 5], [3, 4]], edges)
+
+        class Stubborn(DFSTreeVisitor):
+            def visit(self, G, vertex, neighbors):
+                self.nextVertex = None
+
+        self.assertEqual([], dfstree(GraphFactory.makePath(4), visitor=Stubborn()))
+
 
 if __name__ == "__main__":
     dfstreetests_main()
\ No newline at end of file
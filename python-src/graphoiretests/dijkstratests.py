@@ -6,10 +6,16 @@ Created on Tue Sep 14 10:10:59 2021
 @author: mathaes
 """
 
+import os
+import tempfile
 import unittest
 
+import numpy as np
+
 from graphoire.algorithm.dijkstra import *
 from graphoire.graphfactory import GraphFactory
+from graphoire.digraphfactory import DigraphFactory
+from graphoire.digraph import Digraph
 
 
 def RunAllDijkstraTests():
@@ -42,16 +48,321 @@ class TestDijkstra(unittest.TestCase):
             
     
     def testTrivial(self):
-        pass
+        g = GraphFactory.makeEmpty(1)
+        djk = Dijkstra(g)
+        self.assertEqual({0: 0}, djk.findAllLeastCostPaths(0))
+        self.assertEqual([0], djk.findLeastCostPath(0, 0))
     
     def testBasicGraph(self):
-        pass
+        g = GraphFactory.makeCycle(5)
+        g.setEdgeWeight(0, 1, 1)
+        g.setEdgeWeight(1, 2, 1)
+        g.setEdgeWeight(2, 3, 1)
+        g.setEdgeWeight(3, 4, 10)
+        g.setEdgeWeight(0, 4, 2)
+        djk = Dijkstra(g)
+        costs = djk.findAllLeastCostPaths(4)
+        self.assertEqual([2, 3, 4, 5, 0], [costs[v] for v in range(0, 5)])
+        self.assertEqual(5, djk.getPathCost(3))
+        self.assertEqual([4, 0, 1, 2, 3], djk.getPath(3))
+        # reverse orientation of each stored edge
+        self.assertEqual([3, 2, 1, 0, 4], Dijkstra(g).findLeastCostPath(3, 4))
     
     def testUniformGraph(self):
-        pass
+        g = GraphFactory.makePetersen()
+        djk = Dijkstra(g)
+        costs = djk.findAllLeastCostPaths(0)
+        self.assertEqual(2, max(costs.values()))
+        self.assertEqual(3, len([v for v in costs if costs[v] == 1]))
+        far = [v for v in costs if costs[v] == 2][0]
+        path = Dijkstra(g).findLeastCostPath(0, far)
+        self.assertEqual(3, len(path))
+        self.assertEqual(0, path[0])
+        self.assertEqual(far, path[-1])
     
     def testBasicDigraph(self):
-        pass
+        d = Digraph(4)
+        d.addEdge(0, 1)
+        d.addEdge(1, 2)
+        d.addEdge(0, 2)
+        d.addEdge(3, 0)
+        d.setEdgeWeight(0, 1, 1)
+        d.setEdgeWeight(1, 2, 1)
+        d.setEdgeWeight(0, 2, 5)
+        d.setEdgeWeight(3, 0, 1)
+        djk = Dijkstra(d)
+        costs = djk.findAllLeastCostPaths(0)
+        self.assertEqual([0, 1, 2, math.inf], [costs[v] for v in range(0, 4)])
+        self.assertEqual([0, 1, 2], djk.getPath(2))
+        self.assertEqual(None, Dijkstra(d).findLeastCostPath(2, 0))
+
+    def testBidirectional(self):
+        g = GraphFactory.makeCycle(5)
+        g.setEdgeWeights([[0, 1], [1, 2], [2, 3], [3, 4], [0, 4]], [1, 1, 1, 10, 2])
+        djk = Dijkstra(g)
+        self.assertEqual([4, 0, 1, 2, 3], djk.findLeastCostPath(4, 3, bidirectional=True))
+        self.assertEqual(5, djk.getPathCost(3))
+        self.assertEqual([2], Dijkstra(g).findLeastCostPath(2, 2, bidirectional=True))
+
+        d = Digraph(4)
+        d.addEdge(0, 1)
+        d.addEdge(1, 2)
+        d.addEdge(0, 2)
+        d.setEdgeWeights([[0, 1], [1, 2], [0, 2]], [1, 1, 5])
+        self.assertEqual([0, 1, 2], Dijkstra(d).findLeastCostPath(0, 2, bidirectional=True))
+        self.assertEqual(None, Dijkstra(d).findLeastCostPath(2, 0, bidirectional=True))
+        self.assertEqual(None, Dijkstra(d).findLeastCostPath(0, 3, bidirectional=True))
+
+    def testBidirectionalMatchesOneSided(self):
+        rand = np.random.default_rng(42)
+        for factory in [GraphFactory, DigraphFactory]:
+            n = 120
+            g = factory.makeRandomWeighted(n, 360, 1, 30, seed=rand)
+            for query in range(0, 30):
+                s, t = [int(v) for v in rand.integers(0, n, size=2)]
+                oneSided = Dijkstra(g)
+                path = oneSided.findLeastCostPath(s, t)
+                both = Dijkstra(g)
+                path2 = both.findLeastCostPath(s, t, bidirectional=True)
+                if None == path:
+                    self.assertEqual(None, path2)
+                    continue
+                self.assertEqual(oneSided.getPathCost(t), both.getPathCost(t))
+                self.assertEqual(s, path2[0])
+                self.assertEqual(t, path2[-1])
+                allCosts = Dijkstra(g).findAllLeastCostPaths(s)
+                for v in path2:
+                    self.assertEqual(allCosts[v], both.getPathCost(v))
+                self.assertTrue(both.settledCount <= n)
+
+    def makeWeightedGrid(self, rows, cols, seed):
+        rand = np.random.default_rng(seed)
+        g = GraphFactory.makeEmpty(rows * cols)
+        edges = []
+        for r in range(0, rows):
+            for c in range(0, cols):
+                v = r * cols + c
+                if c + 1 < cols:
+                    edges.append([v, v + 1])
+                if r + 1 < rows:
+                    edges.append([v, v + cols])
+        g.edges = edges
+        g.setEdgeWeights(None, rand.integers(1, 10, size=len(edges)))
+        return g
+
+    def testAStar(self):
+        g = GraphFactory.makeCycle(5)
+        g.setEdgeWeights([[0, 1], [1, 2], [2, 3], [3, 4], [0, 4]], [1, 1, 1, 10, 2])
+        djk = Dijkstra(g)
+        self.assertEqual([4, 0, 1, 2, 3], djk.findLeastCostPath(4, 3, heuristic=lambda v: 0))
+        self.assertEqual(5, djk.getPathCost(3))
+        # array heuristic; inf prunes
+        self.assertEqual(None, Dijkstra(g).findLeastCostPath(4, 3, heuristic=[0, 0, 0, math.inf, 0]))
+        # an inconsistent (but admissible) heuristic still finds the best path
+        bounds = [3, 0, 1, 0, 5]
+        self.assertEqual([4, 0, 1, 2, 3], Dijkstra(g).findLeastCostPath(4, 3, heuristic=bounds))
+
+    def testLandmarks(self):
+        g = self.makeWeightedGrid(30, 30, 7)
+        landmarks = Landmarks.fromGraph(g, 6)
+        self.assertEqual(6, len(set(landmarks.landmarks.tolist())))
+        self.assertEqual(np.int32, landmarks.forward.dtype)
+        self.assertEqual((900, 6), landmarks.forward.shape)
+        self.assertEqual(None, landmarks.backward)
+        self.assertTrue(findLandmarks(g, 6) is findLandmarks(g, 6))
+
+        rand = np.random.default_rng(3)
+        plainSettled = 0
+        altSettled = 0
+        for query in range(0, 20):
+            s, t = [int(v) for v in rand.integers(0, 900, size=2)]
+            plain = Dijkstra(g)
+            plain.findLeastCostPath(s, t)
+            alt = Dijkstra(g)
+            path = alt.findLeastCostPath(s, t, heuristic=landmarks)
+            self.assertEqual(plain.getPathCost(t), alt.getPathCost(t))
+            self.assertEqual(s, path[0])
+            self.assertEqual(t, path[-1])
+            bound = landmarks.heuristic(t)
+            self.assertTrue(bound(s) <= alt.getPathCost(t))
+            plainSettled += plain.settledCount
+            altSettled += alt.settledCount
+        self.assertTrue(altSettled * 2 < plainSettled)
+
+    def testLandmarksDigraph(self):
+        rand = np.random.default_rng(11)
+        n = 150
+        d = DigraphFactory.makeRandomWeighted(n, 600, 0, 5, integral=False, seed=rand)
+        landmarks = Landmarks.fromGraph(d, 4)
+        self.assertEqual(np.float64, landmarks.forward.dtype)
+        self.assertEqual((n, 4), landmarks.backward.shape)
+        for query in range(0, 30):
+            s, t = [int(v) for v in rand.integers(0, n, size=2)]
+            plain = Dijkstra(d)
+            path = plain.findLeastCostPath(s, t)
+            alt = Dijkstra(d)
+            path2 = alt.findLeastCostPath(s, t, heuristic=landmarks)
+            if None == path:
+                self.assertEqual(None, path2)
+                continue
+            self.assertAlmostEqual(plain.getPathCost(t), alt.getPathCost(t))
+
+    def testLandmarksSaveLoad(self):
+        g = self.makeWeightedGrid(8, 8, 1)
+        landmarks = Landmarks.fromGraph(g, 3)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "grid.landmarks.npz")
+            landmarks.save(path)
+            loaded = Landmarks.load(path, g)
+            self.assertEqual(landmarks.landmarks.tolist(), loaded.landmarks.tolist())
+            self.assertTrue(np.array_equal(landmarks.forward, loaded.forward))
+            self.assertEqual(landmarks.forward.dtype, loaded.forward.dtype)
+            g.setEdgeWeight(0, 1, 100)
+            with self.assertRaises(Exception):
+                Landmarks.load(path, g)
+
+    def testLeastCostMatrix(self):
+        n = 60
+        d = DigraphFactory.makeRandomWeighted(n, 200, 1, 9, seed=8)
+        matrix = findLeastCostMatrix(d, processes=1)
+        self.assertEqual((n, n), matrix.shape)
+        for s in range(0, n, 7):
+            costs = Dijkstra(d).findAllLeastCostPaths(s)
+            for v in range(0, n):
+                self.assertEqual(costs[v], matrix[s, v])
+        self.assertTrue(np.array_equal(matrix.T, findLeastCostMatrix(d, processes=1, direction='in')))
+
+        sources = [3, 1, 4, 1, 5]
+        pooled = findLeastCostMatrix(d, sources, processes=2, chunkSize=2)
+        self.assertTrue(np.array_equal(matrix[sources], pooled))
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "costs.npy")
+            mapped = findLeastCostMatrix(d, sources, processes=2, path=path, chunkSize=1)
+            self.assertTrue(isinstance(mapped, np.memmap))
+            self.assertTrue(np.array_equal(matrix[sources], mapped))
+            self.assertTrue(np.array_equal(matrix[sources], np.load(path)))
+            del mapped
+            path = os.path.join(folder, "serial.npy")
+            mapped = findLeastCostMatrix(d, processes=1, path=path, chunkSize=7)
+            self.assertTrue(isinstance(mapped, np.memmap))
+            self.assertTrue(np.array_equal(matrix, np.load(path)))
+            del mapped
+        self.assertEqual((0, n), findLeastCostMatrix(d, []).shape)
+
+    def testLeastCostWorkerSharesArrays(self):
+        g = self.makeWeightedGrid(5, 5, 2)
+        created = []
+        try:
+            specs = shareCSRArrays(g, 'out', created)
+            outBlock, outSpec = shareArray(np.zeros((1, 25)))
+            created.append(outBlock)
+            initializeLeastCostWorker(25, specs, np.array([0]), ('shared', outSpec))
+            matrix = leastCostWorkerState['matrix']
+            indptr, indices, weights = leastCostWorkerState['arrays']
+            self.assertTrue(np.shares_memory(matrix.indptr, indptr))
+            self.assertTrue(np.shares_memory(matrix.indices, indices))
+            self.assertTrue(np.shares_memory(matrix.data, weights))
+            runLeastCostTask((0, 1))
+            self.assertTrue(np.array_equal(findLeastCostMatrix(g, [0], processes=1),
+                                           leastCostWorkerState['out']))
+        finally:
+            matrix = indptr = indices = weights = None
+            attached = leastCostWorkerState.get('blocks', [])
+            leastCostWorkerState.clear()
+            for block in attached:
+                block.close()
+            for block in created:
+                block.close()
+                block.unlink()
+
+    def testShortestPathTreeCache(self):
+        g = self.makeWeightedGrid(6, 6, 4)
+        cache = ShortestPathTreeCache(g)
+        for s in [0, 14, 35]:
+            costs = Dijkstra(g).findAllLeastCostPaths(s)
+            for t in range(0, 36):
+                self.assertEqual(costs[t], cache.getPathCost(s, t))
+                path = cache.findLeastCostPath(s, t)
+                self.assertEqual(s, path[0])
+                self.assertEqual(t, path[-1])
+                self.assertEqual(costs[t], sum(g.getEdgeWeight(path[i], path[i + 1]) for i in range(0, len(path) - 1)))
+        self.assertEqual(3, cache.misses)
+        self.assertEqual(3, len(cache.trees))
+
+        # a weight change invalidates the cached trees
+        g.setEdgeWeight(0, 1, 100)
+        self.assertEqual(Dijkstra(g).findAllLeastCostPaths(0)[1], cache.getPathCost(0, 1))
+        self.assertEqual(4, cache.misses)
+        self.assertEqual(1, len(cache.trees))
+
+        # eviction keeps the most recently used trees within the bound
+        small = ShortestPathTreeCache(g, maxBytes=2 * 36 * 16)
+        small.tree(0)
+        small.tree(1)
+        small.tree(0)
+        small.tree(2)
+        self.assertEqual([0, 2], [key[1] for key in small.trees])
+        self.assertEqual(2 * 36 * 16, small.nbytes)
+
+        d = Digraph(3)
+        d.addEdge(0, 1)
+        d.addEdge(1, 2)
+        self.assertEqual([0, 1, 2], ShortestPathTreeCache(d).findLeastCostPath(0, 2))
+        self.assertEqual(None, ShortestPathTreeCache(d).findLeastCostPath(2, 0))
+        self.assertEqual([0, 1, 2], ShortestPathTreeCache(d, direction='in').findLeastCostPath(2, 0))
+
+    def testIntegerQueues(self):
+        rand = np.random.default_rng(21)
+        for factory in [GraphFactory, DigraphFactory]:
+            n = 120
+            g = factory.makeRandomWeighted(n, 400, seed=rand)
+            for high in [2, 20, 5000]:
+                g.setEdgeWeights(None, rand.integers(0, high, size=g.edgeCount()))
+                expected = Dijkstra(g, 'heap').findAllLeastCostPaths(0)
+                kinds = ['dial', 'radix']
+                self.assertEqual('dial' if high <= 256 else 'heap', Dijkstra(g).queueKind())
+                for kind in kinds:
+                    self.assertEqual(expected, Dijkstra(g, kind).findAllLeastCostPaths(0))
+                for query in range(0, 20):
+                    s, t = [int(v) for v in rand.integers(0, n, size=2)]
+                    plain = Dijkstra(g, 'heap')
+                    path = plain.findLeastCostPath(s, t)
+                    for kind in kinds:
+                        for bidirectional in [False, True]:
+                            djk = Dijkstra(g, kind)
+                            path2 = djk.findLeastCostPath(s, t, bidirectional=bidirectional)
+                            if None == path:
+                                self.assertEqual(None, path2)
+                            else:
+                                self.assertEqual(plain.getPathCost(t), djk.getPathCost(t))
+        g.setEdgeWeights(None, rand.random(g.edgeCount()))
+        self.assertEqual('heap', Dijkstra(g).queueKind())
+        with self.assertRaises(Exception):
+            Dijkstra(g, 'dial').findAllLeastCostPaths(0)
+
+    def testBucketQueueReinsertAfterEmpty(self):
+        for queue in [BucketQueue(10), RadixHeap()]:
+            queue.initialize(None, 0)
+            self.assertEqual((0, 0), queue.extract_min())
+            queue.insert(1, 7)
+            queue.insert(2, 3)
+            self.assertEqual(3, queue.min_cost())
+            self.assertEqual((2, 3), queue.extract_min())
+            self.assertEqual((1, 7), queue.extract_min())
+            self.assertTrue(queue.is_empty())
+
+    def testHeap(self):
+        heap = VertexCostHeap()
+        heap.insert(3, 7)
+        heap.insert(1, 4)
+        heap.insert(2, 9)
+        heap.decrease_key(2, 1)
+        self.assertEqual(math.inf, heap.cost(5))
+        self.assertEqual((2, 1), heap.extract_min())
+        self.assertEqual((1, 4), heap.extract_min())
+        self.assertEqual((3, 7), heap.extract_min())
+        self.assertTrue(heap.is_empty())
+        self.assertEqual(None, heap.extract_min())
     
     
 if __name__ == "__main__":
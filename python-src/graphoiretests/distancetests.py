@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:31:06 2026
+
+@author: mathaes
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+from graphoire.graph import Graph
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.digraphfactory import DigraphFactory
+from graphoire.component import componentLabels
+from graphoire.distance import bfsDistances, distance, findDistanceMetrics, bitParallelBFS
+from graphoire.distance import eccentricity, eccentricities, diameter, radius, center, wienerIndex
+from graphoire.distance import findEccentricityBounds, diameterBounds
+
+def RunAllDistanceTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestDistance))
+    suite.addTest(unittest.makeSuite(TestDistanceMetrics))
+    suite.addTest(unittest.makeSuite(TestEccentricityBounds))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+def distancetests_main():
+    unittest.main()
+
+class TestDistance(unittest.TestCase):
+
+    def testBFSDistances(self):
+        P = GraphFactory.makePath(5)
+        self.assertEqual([2, 1, 0, 1, 2], bfsDistances(P, 2).tolist())
+        self.assertEqual([0, 1, 2, 1, 0], bfsDistances(P, [0, 4]).tolist())
+        self.assertEqual(4, distance(P, 0, 4))
+        G = Graph(3)
+        G.addEdge(0, 1)
+        self.assertEqual(-1, distance(G, 0, 2))
+
+    def testBitParallelLevels(self):
+        C = GraphFactory.makeCycle(6)
+        levels = list(bitParallelBFS(C.adjacencyIndex(), [0, 3]))
+        self.assertEqual([1, 2, 3], [level[0] for level in levels])
+        self.assertEqual([1, 2, 4, 5], levels[0][1].tolist())
+        # at level 3 search 0 reaches 3 and search 1 reaches 0
+        self.assertEqual([0, 3], levels[2][1].tolist())
+        self.assertEqual([2, 1], levels[2][2].tolist())
+
+
+class TestDistanceMetrics(unittest.TestCase):
+
+    def bruteForce(self, G, direction='out'):
+        n = G.order()
+        dist = np.array([bfsDistances(G, v, direction) for v in range(0, n)])
+        reachable = dist >= 0
+        return (np.where(reachable, dist, 0).max(axis=1),
+                np.where(reachable, dist, 0).sum(axis=1),
+                reachable.sum(axis=1))
+
+    def testKnownGraphs(self):
+        P = GraphFactory.makePetersen()
+        metrics = findDistanceMetrics(P)
+        self.assertTrue(metrics.connected)
+        self.assertEqual(2, metrics.diameter)
+        self.assertEqual(2, metrics.radius)
+        self.assertEqual(75, metrics.wiener)
+        self.assertEqual(list(range(0, 10)), metrics.center.tolist())
+
+        P5 = GraphFactory.makePath(5)
+        self.assertEqual([4, 3, 2, 3, 4], eccentricities(P5).tolist())
+        self.assertEqual(4, diameter(P5))
+        self.assertEqual(2, radius(P5))
+        self.assertEqual([2], center(P5))
+        self.assertEqual(20, wienerIndex(P5))
+        self.assertEqual(27, wienerIndex(GraphFactory.makeCycle(6)))
+        self.assertEqual(3, eccentricity(P5, 1))
+
+    def testDisconnected(self):
+        G = Graph(5)
+        G.addEdge(0, 1)
+        G.addEdge(1, 2)
+        G.addEdge(3, 4)
+        metrics = findDistanceMetrics(G)
+        self.assertFalse(metrics.connected)
+        self.assertEqual(math.inf, metrics.diameter)
+        self.assertEqual(math.inf, metrics.radius)
+        self.assertEqual([2, 1, 2, 1, 1], metrics.eccentricity.tolist())
+        self.assertEqual([3, 3, 3, 2, 2], metrics.reach.tolist())
+        self.assertEqual(5, metrics.wiener)
+        self.assertEqual(math.inf, eccentricity(G, 0))
+
+    def testDigraph(self):
+        D = Digraph(4)
+        D.addEdge(0, 1)
+        D.addEdge(1, 2)
+        D.addEdge(2, 3)
+        D.addEdge(3, 0)
+        metrics = findDistanceMetrics(D)
+        self.assertEqual(3, metrics.diameter)
+        self.assertEqual(24, metrics.wiener)
+        self.assertEqual(2, findDistanceMetrics(D, 'both').diameter)
+
+    def testAgainstBruteForce(self):
+        rand = np.random.default_rng(38)
+        for trial in range(0, 6):
+            n = int(rand.integers(60, 150))
+            G = GraphFactory.makeRandomWeighted(n, 2 * n, seed=rand)
+            D = DigraphFactory.makeRandomWeighted(n, 2 * n, seed=rand)
+            for graph, direction in [(G, 'out'), (D, 'out'), (D, 'in')]:
+                metrics = findDistanceMetrics(graph, direction)
+                ecc, transmission, reach = self.bruteForce(graph, direction)
+                self.assertEqual(ecc.tolist(), metrics.eccentricity.tolist())
+                self.assertEqual(transmission.tolist(), metrics.transmission.tolist())
+                self.assertEqual(reach.tolist(), metrics.reach.tolist())
+
+
+class TestEccentricityBounds(unittest.TestCase):
+
+    def testPath(self):
+        P = GraphFactory.makePath(9)
+        bounds = findEccentricityBounds(P, maxBFS=None)
+        self.assertTrue(bounds.isExact())
+        self.assertEqual([8, 7, 6, 5, 4, 5, 6, 7, 8], bounds.lower.tolist())
+        self.assertEqual((8, 8), bounds.diameterBounds())
+        self.assertEqual((4, 4), bounds.radiusBounds())
+        self.assertEqual((8, 8), diameterBounds(P)[:2])
+
+    def testCertifiedUnderBudget(self):
+        rand = np.random.default_rng(39)
+        for trial in range(0, 8):
+            n = int(rand.integers(30, 200))
+            G = GraphFactory.makeRandomWeighted(n, n + n // 2, seed=rand)
+            exact = findDistanceMetrics(G).eccentricity
+            for budget in [1, 2, 5, None]:
+                bounds = findEccentricityBounds(G, maxBFS=budget)
+                self.assertTrue(np.all(bounds.lower <= exact))
+                self.assertTrue(np.all(exact <= bounds.upper))
+                self.assertTrue(None == budget or bounds.bfsCount <= budget)
+            self.assertTrue(bounds.isExact())
+
+    def testDiameterBounds(self):
+        rand = np.random.default_rng(139)
+        for trial in range(0, 8):
+            n = int(rand.integers(30, 200))
+            G = GraphFactory.makeRandomWeighted(n, n + n // 2, seed=rand)
+            labels = componentLabels(G)
+            largest = labels == np.argmax(np.bincount(labels))
+            exact = int(findDistanceMetrics(G).eccentricity[largest].max())
+            for budget in [3, 10, 70]:
+                lower, upper, count = diameterBounds(G, maxBFS=budget)
+                self.assertTrue(lower <= exact <= upper)
+                self.assertTrue(count <= budget)
+            self.assertEqual((exact, exact), diameterBounds(G)[:2])
+
+
+if __name__ == "__main__":
+    distancetests_main()
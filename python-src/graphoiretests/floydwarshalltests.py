@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:10:37 2026
+
+@author: mathaes
+"""
+
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import floyd_warshall
+
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.digraphfactory import DigraphFactory
+from graphoire.algorithm.floydwarshall import floydWarshall, nextHopPath, unreachableCost
+
+def RunAllFloydWarshallTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestFloydWarshall))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+def floydwarshalltests_main():
+    unittest.main()
+
+def referenceCosts(G):
+    edges = G.edgeArray()
+    matrix = csr_matrix((G.edgeWeightArray().astype(float), (edges[:, 0], edges[:, 1])),
+                        shape=(G.order(), G.order()))
+    return floyd_warshall(matrix, directed=G.directed)
+
+class TestFloydWarshall(unittest.TestCase):
+
+    def assertPathsMatch(self, G, costs, nextHops):
+        n = G.order()
+        for s in range(0, n, 3):
+            for t in range(0, n, 2):
+                path = nextHopPath(nextHops, s, t)
+                if math.inf == costs[s, t]:
+                    self.assertEqual(None, path)
+                    continue
+                self.assertEqual(s, path[0])
+                self.assertEqual(t, path[-1])
+                self.assertEqual(costs[s, t], sum(G.getEdgeWeight(path[i], path[i + 1]) for i in range(0, len(path) - 1)))
+
+    def testSmall(self):
+        D = Digraph(4)
+        D.edges = [[0, 1], [1, 2], [0, 2], [2, 3]]
+        D.setEdgeWeights(None, [1, 1, 5, 2])
+        costs, nextHops = floydWarshall(D, nextHop=True, blockSize=3)
+        self.assertEqual([0, 1, 2, 4], costs[0].tolist())
+        self.assertEqual([math.inf, math.inf, math.inf, 0], costs[3].tolist())
+        self.assertEqual([0, 1, 2, 3], nextHopPath(nextHops, 0, 3))
+        self.assertEqual(None, nextHopPath(nextHops, 3, 0))
+        self.assertEqual(np.int8, nextHops.dtype)
+        self.assertEqual((0, 0), floydWarshall(Digraph(0))[0].shape)
+
+    def testMatchesReference(self):
+        for factory in [GraphFactory, DigraphFactory]:
+            G = factory.makeRandomWeighted(70, 200, 1, 9, seed=6)
+            expected = referenceCosts(G)
+            for blockSize in [8, 13, 256]:
+                costs, nextHops = floydWarshall(G, nextHop=True, blockSize=blockSize)
+                self.assertTrue(np.array_equal(expected, costs))
+                self.assertPathsMatch(G, costs, nextHops)
+
+    def testNegativeWeights(self):
+        D = DigraphFactory.makeRandomWeighted(40, 120, -5, 9, acyclic=True, seed=2)
+        costs, nextHops = floydWarshall(D, nextHop=True, blockSize=16)
+        self.assertTrue(np.array_equal(referenceCosts(D), costs))
+        self.assertPathsMatch(D, costs, nextHops)
+
+        C = Digraph(3)
+        C.edges = [[0, 1], [1, 2], [2, 0]]
+        C.setEdgeWeights(None, [1, 1, -3])
+        with self.assertRaises(Exception):
+            floydWarshall(C)
+        with self.assertRaises(Exception):
+            floydWarshall(D, np.uint16)
+
+    def testCompactDtypes(self):
+        G = DigraphFactory.makeRandomWeighted(60, 150, 1, 9, seed=4)
+        expected = referenceCosts(G)
+        for dtype in [np.float32, np.uint8, np.uint16]:
+            costs, nextHops = floydWarshall(G, dtype, blockSize=16)
+            self.assertEqual(np.dtype(dtype), costs.dtype)
+            costs = costs.astype(np.float64)
+            costs[costs == unreachableCost(dtype)] = math.inf
+            self.assertTrue(np.array_equal(expected, costs))
+
+        P = GraphFactory.makePath(300)
+        costs, nextHops = floydWarshall(P, np.uint16, blockSize=64)
+        self.assertEqual(299, costs[0, 299])
+        with self.assertRaises(Exception):
+            floydWarshall(P, np.uint8)
+
+    def testMemoryMapped(self):
+        G = GraphFactory.makeRandomWeighted(50, 150, 1, 9, seed=8)
+        expected, expectedNext = floydWarshall(G, nextHop=True, blockSize=16)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "costs.npy")
+            nextPath = os.path.join(folder, "next.npy")
+            costs, nextHops = floydWarshall(G, path=path, nextPath=nextPath, blockSize=16)
+            self.assertTrue(isinstance(costs, np.memmap))
+            self.assertTrue(isinstance(nextHops, np.memmap))
+            self.assertTrue(np.array_equal(expected, np.load(path)))
+            self.assertTrue(np.array_equal(expectedNext, np.load(nextPath)))
+            del costs, nextHops
+
+
+if __name__ == "__main__":
+    floydwarshalltests_main()
@@ -140,6 +140,19 @@ class TestFordFulkerson(unittest.TestCase):
         cutFlow = ff.getMinimumCutFlow()
         self.assertEqual(5, cutFlow)  
     
+    def testMinimumCutEdges(self):
+        network = Network(5, 0, 4)
+        network.addNetworkEdge(0, 1, 3)
+        network.addNetworkEdge(1, 4, 1)
+        network.addNetworkEdge(0, 2, 2)
+        network.addNetworkEdge(2, 3, 1)
+        network.addNetworkEdge(3, 4, 3)
+
+        ff = FordFulkerson(network)
+        self.assertTrue(ff.run())
+        self.assertEqual([[1, 4], [2, 3]], ff.findMinimumCutEdges())
+        self.assertEqual(None, ff.findAugmentingPath())
+
     def testSetEdgeFlow(self):
         network = Network(4, 0, 3)
         network.addNetworkEdge(0, 1, 3)
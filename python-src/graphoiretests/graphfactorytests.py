@@ -10,8 +10,9 @@ import unittest
 
 from graphoire.graph import Graph
 from graphoire.graphfactory import GraphFactory
+from graphoire.digraphfactory import DigraphFactory
 from graphoire.component import isConnected
-from graphoire.tree import isTree
+from graphoire.tree import isTree, findAllLeaves
 from graphoire.labels import binaryStringDigitDiff
 import math
 
@@ -276,6 +277,46 @@ class TestGraphFactory(unittest.TestCase):
             deg = T25_max4.vertexDegree(vertex)
             self.assertTrue(deg > 0)
             self.assertTrue(deg <= 4)
+
+        Ta = GraphFactory.makeRandomTree(40, seed=34)
+        Tb = GraphFactory.makeRandomTree(40, seed=34)
+        self.assertEqual(Ta.edges, Tb.edges)
+        self.assertEqual(1, GraphFactory.makeRandomTree(1).order())
+
+    def testMakeRandomTrees(self):
+        trees = GraphFactory.makeRandomTrees(30, 50, maxDegree=3, seed=1)
+        self.assertEqual(50, len(trees))
+        for tree in trees:
+            self.assertEqual(30, tree.order())
+            self.assertTrue(isTree(tree))
+            self.assertEqual(sorted(tree.edges), tree.edges)
+            for vertex in range(0, tree.order()):
+                self.assertTrue(tree.vertexDegree(vertex) <= 3)
+        paths = GraphFactory.makeRandomTrees(12, 5, maxDegree=2, seed=2)
+        for path in paths:
+            self.assertEqual(2, len(findAllLeaves(path)))
+
+    def testMakeRandomWeighted(self):
+        G = GraphFactory.makeRandomWeighted(40, 100, 3, 7, seed=5)
+        self.assertFalse(G.directed)
+        self.assertTrue(0 < G.edgeCount() <= 100)
+        self.assertEqual(sorted(G.edges), G.edges)
+        for v1, v2 in G.edges:
+            self.assertTrue(v1 < v2)
+        weights = G.edgeWeightArray()
+        self.assertEqual('i', weights.dtype.kind)
+        self.assertTrue(3 <= weights.min() and weights.max() < 7)
+        self.assertEqual(G.edges, GraphFactory.makeRandomWeighted(40, 100, 3, 7, seed=5).edges)
+
+        D = DigraphFactory.makeRandomWeighted(40, 300, -2, 2, integral=False, acyclic=True, seed=6)
+        self.assertTrue(D.directed)
+        self.assertEqual(len(set(map(tuple, D.edges))), D.edgeCount())
+        for tail, head in D.edges:
+            self.assertTrue(tail < head)
+        weights = D.edgeWeightArray()
+        self.assertEqual('f', weights.dtype.kind)
+        self.assertTrue(-2 <= weights.min() and weights.max() < 2)
+        self.assertEqual(0, GraphFactory.makeRandomWeighted(0, 10).edgeCount())
             
         
 if __name__ == "__main__":
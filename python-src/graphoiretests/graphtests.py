@@ -11,12 +11,14 @@ import unittest
 import copy
 
 from graphoire.graph import Graph
+from graphoire.digraph import Digraph
 from graphoire.graphfactory import GraphFactory
 from graphoire.component import isConnected
 
 def RunAllGraphTests():
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(TestGraphBasics))
+    suite.addTest(unittest.makeSuite(TestGraphWeights))
     suite.addTest(unittest.makeSuite(TestGraphConstructions))
     suite.addTest(unittest.makeSuite(TestGraphMatrices))
 
@@ -391,6 +393,54 @@ class TestGraphBasics(unittest.TestCase):
         G = GraphFactory.makeRandomTree(12)
         self.assertFalse(G.isComplete())
     
+class TestGraphWeights(unittest.TestCase):
+
+    def testGetEdgeWeight(self):
+        G = GraphFactory.makePath(3)
+        G.setEdgeWeight(1, 0, 5)
+        self.assertEqual(5, G.getEdgeWeight(0, 1))
+        self.assertEqual(5, G.getEdgeWeight(1, 0))
+        self.assertEqual(None, G.getEdgeWeight(1, 2))
+        self.assertEqual(7, G.getEdgeWeight(1, 2, 7))
+
+    def testWeightArrays(self):
+        G = GraphFactory.makePath(4)
+        self.assertEqual([1, 1, 1], G.edgeWeightArray().tolist())
+        G.setEdgeWeight(1, 2, 2.5)
+        self.assertEqual([1.0, 2.5, 1.0], G.edgeWeightArray().tolist())
+        # index 'both' slots: 0->1, 1->0, 1->2, 2->1, 2->3, 3->2
+        self.assertEqual([1.0, 1.0, 2.5, 2.5, 1.0, 1.0], G.adjacencyWeights().tolist())
+
+    def testSetEdgeWeights(self):
+        G = GraphFactory.makeCycle(5)
+        G.edgeWeightArray()
+        G.setEdgeWeights([[1, 0], [3, 4], [0, 3]], [4, 6, 9])
+        self.assertEqual(4, G.getEdgeWeight(0, 1))
+        self.assertEqual(9, G.getEdgeWeight(3, 0))
+        weights = dict(zip(map(tuple, G.edges), G.edgeWeightArray().tolist()))
+        self.assertEqual(4, weights[(0, 1)])
+        self.assertEqual(6, weights[(3, 4)])
+        self.assertEqual(1, weights[(1, 2)])
+
+        G.setEdgeWeights(None, [0.5] * 5)
+        self.assertEqual([0.5] * 5, G.edgeWeightArray().tolist())
+        with self.assertRaises(Exception):
+            G.setEdgeWeights([[0, 1]], [1, 2])
+
+    def testDigraphWeights(self):
+        D = Digraph(3)
+        D.addEdge(0, 1)
+        D.addEdge(1, 0)
+        D.addEdge(1, 2)
+        D.setEdgeWeights([[1, 0], [1, 2]], [3, 4])
+        self.assertEqual(None, D.getEdgeWeight(0, 1))
+        self.assertEqual(3, D.getEdgeWeight(1, 0))
+        index = D.adjacencyIndex('in')
+        weights = D.adjacencyWeights('in')
+        self.assertEqual([3], weights[index.indptr[0]:index.indptr[1]].tolist())
+        D.deleteEdge([1, 0])
+        self.assertEqual([1, 4], D.edgeWeightArray().tolist())
+    
 class TestGraphConstructions(unittest.TestCase):
     
     def testComplement(self):
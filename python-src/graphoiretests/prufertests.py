@@ -7,13 +7,23 @@ Created on Mon Mar  8 12:22:21 2021
 """
 
 import unittest
+import random
 
+import numpy as np
+
+from graphoire.graph import Graph
 from graphoire.graphfactory import GraphFactory
-from graphoire.algorithm.prufer import createPruferCode
+from graphoire.algorithm.prufer import createPruferCode, pruferCodeToEdgeArray, graphFromPruferCode
+from graphoire.algorithm.prufer import pruferCodesToEdgeArrays, randomPruferCodes, randomTreeEdgeArrays
+from graphoire.algorithm.prufer import labeledTreeCount, pruferCodeFromIndex, pruferCodeIndex
+from graphoire.algorithm.prufer import labeledTreeIndexRanges, enumerateLabeledTrees
 
 def RunAllPruferTests():
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(TestCreatePruferCode))
+    suite.addTest(unittest.makeSuite(TestDecodePruferCode))
+    suite.addTest(unittest.makeSuite(TestRandomPruferCodes))
+    suite.addTest(unittest.makeSuite(TestEnumerateLabeledTrees))
 
     runner = unittest.TextTestRunner()
     runner.run(suite)
@@ -33,10 +43,141 @@ class TestCreatePruferCode(unittest.TestCase):
         pcode = createPruferCode(tree)
         #print (pcode)
         
-        self.assertEqual([2, 3, 4, 6, 7, 7, 9], pcode)
+        # one-based tree edges 1-2, 2-3, 3-4, 5-6, 6-7, 7-8, 3-6, 7-9;
+        # leaves are removed in the order 1, 2, 4, 3, 5, 6, 8
+        self.assertEqual([2, 3, 3, 6, 6, 7, 7], pcode)
         # check that original tree is not changed
         self.assertEqual(9, tree.order())
-        
-        
+        self.assertEqual(8, tree.edgeCount())
+
+    def testArrayOutput(self):
+        tree = GraphFactory.makeBipartiteComplete(1, 5)
+        pcode = createPruferCode(tree, asArray=True)
+        self.assertTrue(isinstance(pcode, np.ndarray))
+        self.assertEqual([1, 1, 1, 1], pcode.tolist())
+
+    def testSmallTrees(self):
+        self.assertEqual([], createPruferCode(GraphFactory.makePath(2)))
+
+    def testNotATree(self):
+        with self.assertRaises(Exception):
+            createPruferCode(GraphFactory.makeCycle(5))
+        G = Graph(4)
+        G.addEdge(0, 1)
+        G.addEdge(2, 3)
+        with self.assertRaises(Exception):
+            createPruferCode(G)
+
+
+class TestDecodePruferCode(unittest.TestCase):
+
+    def testKnownCode(self):
+        tree = graphFromPruferCode([2, 3, 3, 6, 6, 7, 7])
+        self.assertEqual(9, tree.order())
+        self.assertEqual([[0, 1], [1, 2], [2, 3], [2, 5], [4, 5], [5, 6],
+                          [6, 7], [6, 8]], tree.edges)
+
+    def testEdgeArray(self):
+        edges = pruferCodeToEdgeArray(np.array([4, 4, 4]))
+        self.assertEqual((4, 2), edges.shape)
+        self.assertEqual([[0, 3], [1, 3], [2, 3], [3, 4]],
+                         sorted(edges.tolist()))
+        self.assertEqual([[0, 1]], pruferCodeToEdgeArray([]).tolist())
+
+    def testBadLabel(self):
+        with self.assertRaises(Exception):
+            pruferCodeToEdgeArray([0, 1])
+        with self.assertRaises(Exception):
+            pruferCodeToEdgeArray([5, 1])
+
+    def testRoundTrip(self):
+        rand = random.Random(33)
+        for n in [3, 4, 7, 20, 101]:
+            for trial in range(0, 10):
+                code = [rand.randint(1, n) for i in range(0, n - 2)]
+                tree = graphFromPruferCode(code)
+                self.assertEqual(n - 1, tree.edgeCount())
+                self.assertEqual(code, createPruferCode(tree))
+
+    def testBatchDecode(self):
+        codes = np.random.default_rng(3).integers(1, 13, size=(100, 10))
+        edges = pruferCodesToEdgeArrays(codes)
+        self.assertEqual((100, 11, 2), edges.shape)
+        for t in range(0, 100):
+            self.assertEqual(pruferCodeToEdgeArray(codes[t]).tolist(), edges[t].tolist())
+
+
+class TestRandomPruferCodes(unittest.TestCase):
+
+    def testSeed(self):
+        a = randomPruferCodes(20, 10, seed=5)
+        self.assertEqual((10, 18), a.shape)
+        self.assertEqual(a.tolist(), randomPruferCodes(20, 10, seed=5).tolist())
+        self.assertTrue(a.min() >= 1 and a.max() <= 20)
+
+    def testUniform(self):
+        # all 5^3 = 125 labeled trees on 5 vertices should appear about equally
+        edges = randomTreeEdgeArrays(5, 25000, seed=6)
+        counts = {}
+        for tree in edges:
+            key = tree.tobytes()
+            counts[key] = counts.get(key, 0) + 1
+        self.assertEqual(125, len(counts))
+        self.assertTrue(min(counts.values()) > 120)
+        self.assertTrue(max(counts.values()) < 280)
+
+    def testMaxDegree(self):
+        for maxDegree in [2, 3, 4]:
+            codes = randomPruferCodes(40, 60, seed=maxDegree, maxDegree=maxDegree)
+            self.assertEqual((60, 38), codes.shape)
+            for code in codes:
+                self.assertTrue(np.bincount(code).max() < maxDegree)
+        # 60 of the 125 trees on 5 vertices are paths
+        edges = randomTreeEdgeArrays(5, 6000, seed=7, maxDegree=2)
+        self.assertEqual(60, len(set(tree.tobytes() for tree in edges)))
+
+
+class TestEnumerateLabeledTrees(unittest.TestCase):
+
+    def testCounts(self):
+        self.assertEqual([1, 1, 3, 16, 125, 1296],
+                         [labeledTreeCount(n) for n in range(1, 7)])
+        for n in range(1, 7):
+            trees = set()
+            for first, edges in enumerateLabeledTrees(n, batchSize=100):
+                for tree in edges:
+                    trees.add(tree.tobytes())
+            self.assertEqual(labeledTreeCount(n), len(trees))
+
+    def testIndexing(self):
+        self.assertEqual([1, 1, 1], pruferCodeFromIndex(5, 0))
+        self.assertEqual([1, 2, 5], pruferCodeFromIndex(5, 9))
+        self.assertEqual(9, pruferCodeIndex([1, 2, 5]))
+        big = 10 ** 30
+        self.assertEqual(big, pruferCodeIndex(pruferCodeFromIndex(25, big)))
+        with self.assertRaises(Exception):
+            pruferCodeFromIndex(5, 125)
+
+    def testBlocksMatchDecoding(self):
+        for first, edges in enumerateLabeledTrees(7, 1000, 1300, batchSize=64):
+            self.assertEqual(np.uint8, edges.dtype)
+            for t in range(0, len(edges)):
+                expected = pruferCodeToEdgeArray(pruferCodeFromIndex(7, first + t))
+                self.assertEqual(expected.tolist(), edges[t].tolist())
+
+    def testRanges(self):
+        ranges = labeledTreeIndexRanges(6, 5)
+        self.assertEqual(5, len(ranges))
+        self.assertEqual(0, ranges[0][0])
+        self.assertEqual(1296, ranges[-1][1])
+        total = 0
+        for start, stop in ranges:
+            self.assertEqual(total, start)
+            for first, edges in enumerateLabeledTrees(6, start, stop):
+                self.assertEqual(total, first)
+                total += len(edges)
+        self.assertEqual(1296, total)
+
+
 if __name__ == "__main__":
     prufertests_main()
\ No newline at end of file
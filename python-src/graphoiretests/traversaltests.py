@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 16:48:30 2026
+
+@author: mathaes
+"""
+
+import unittest
+
+from graphoire.graph import Graph
+from graphoire.digraph import Digraph
+from graphoire.graphfactory import GraphFactory
+from graphoire.traversal import Traversal, traverse, reachableVertices
+
+def RunAllTraversalTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestTraversal))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+def traversaltests_main():
+    unittest.main()
+
+class TestTraversal(unittest.TestCase):
+
+    def testDepthFirstEvents(self):
+        G = GraphFactory.makeCycle(4)
+        events = list(traverse(G, 0))
+        self.assertEqual([('discover', 0, -1),
+                          ('tree', 0, 1), ('discover', 1, 0),
+                          ('tree', 1, 2), ('discover', 2, 1),
+                          ('tree', 2, 3), ('discover', 3, 2),
+                          ('back', 3, 0),
+                          ('finish', 3, 2), ('finish', 2, 1),
+                          ('finish', 1, 0), ('finish', 0, -1)], events)
+
+    def testBreadthFirstEvents(self):
+        G = GraphFactory.makeCycle(4)
+        traversal = traverse(G, 0, order='bfs', events=['tree', 'cross'])
+        events = list(traversal)
+        self.assertEqual([('tree', 0, 1), ('tree', 0, 3),
+                          ('tree', 1, 2), ('cross', 3, 2)], events)
+        self.assertEqual([0, 1, 2, 1], traversal.depth)
+        self.assertEqual([-1, 0, 1, 0], traversal.parent)
+
+    def testDigraphEdgeKinds(self):
+        D = Digraph(4)
+        D.addEdge(0, 1)
+        D.addEdge(1, 2)
+        D.addEdge(2, 0)
+        D.addEdge(0, 2)
+        D.addEdge(3, 1)
+        kinds = {}
+        for kind, u, v in traverse(D):
+            kinds.setdefault(kind, []).append((u, v))
+        self.assertEqual([(0, 1), (1, 2)], kinds['tree'])
+        self.assertEqual([(2, 0)], kinds['back'])
+        self.assertEqual([(0, 2)], kinds['forward'])
+        self.assertEqual([(3, 1)], kinds['cross'])
+        self.assertEqual([(0, -1), (1, 0), (2, 1), (3, -1)], kinds['discover'])
+
+        reverse = [v for kind, v, p in traverse(D, 1, direction='in', events=['discover'])]
+        self.assertEqual([1, 0, 2, 3], reverse)
+
+    def testNonTreeEdgesOnce(self):
+        G = GraphFactory.makePetersen()
+        for order in ['dfs', 'bfs']:
+            tree = 0
+            nontree = 0
+            for kind, u, v in traverse(G, order=order):
+                if kind == 'tree':
+                    tree += 1
+                elif kind in ['back', 'forward', 'cross']:
+                    nontree += 1
+            self.assertEqual(9, tree)
+            self.assertEqual(6, nontree)
+
+    def testForestAndSources(self):
+        G = Graph(6)
+        G.addEdge(0, 1)
+        G.addEdge(2, 3)
+        G.addEdge(3, 4)
+        roots = [v for kind, v, p in traverse(G, events=['discover']) if p == -1]
+        self.assertEqual([0, 2, 5], roots)
+        traversal = traverse(G, [4, 1], order='bfs')
+        discovered = [v for kind, v, p in traversal if kind == 'discover']
+        self.assertEqual([4, 1, 3, 0, 2], discovered)
+        self.assertFalse(traversal.isDiscovered(5))
+
+    def testDepthLimitAndStop(self):
+        P = GraphFactory.makePath(10)
+        self.assertEqual([2, 3, 4, 5, 6], reachableVertices(P, 4, maxDepth=2))
+        traversal = Traversal(P, 0, order='dfs')
+        seen = []
+        for kind, v, p in traversal:
+            if kind == 'discover':
+                seen.append(v)
+                if v == 3:
+                    traversal.stop()
+        self.assertEqual([0, 1, 2, 3], seen)
+
+    def testEdgeFilterAndEdgeIds(self):
+        G = GraphFactory.makeCycle(6)
+        # drop the edge [2, 3]: the cycle becomes a path 3 - 4 - 5 - 0 - 1 - 2
+        blocked = G.edges.index([2, 3])
+        traversal = traverse(G, 0, order='bfs', events=['tree'],
+                             edgeFilter=lambda u, v, e: e != blocked)
+        treeEdges = []
+        for kind, u, v in traversal:
+            self.assertEqual(sorted([u, v]), sorted(G.edges[traversal.edge]))
+            treeEdges.append((u, v))
+        self.assertEqual([(0, 1), (0, 5), (1, 2), (5, 4), (4, 3)], treeEdges)
+        self.assertEqual(3, traversal.depth[3])
+        self.assertEqual(G.edges.index([3, 4]), traversal.parentEdge[3])
+
+    def testIndexInput(self):
+        G = GraphFactory.makePetersen()
+        fromGraph = [event for event in traverse(G, 0)]
+        fromIndex = [event for event in traverse(G.adjacencyIndex('both'), 0)]
+        self.assertEqual(fromGraph, fromIndex)
+
+    def testLongPath(self):
+        P = GraphFactory.makePath(30000)
+        finish = [v for kind, v, p in traverse(P, 0, events=['finish'])]
+        self.assertEqual(list(range(29999, -1, -1)), finish)
+
+
+if __name__ == "__main__":
+    traversaltests_main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:02:51 2026
+
+@author: mathaes
+"""
+
+import unittest
+
+import copy
+
+import numpy as np
+
+from graphoire.graph import Graph
+from graphoire.graphfactory import GraphFactory
+from graphoire.distance import bfsDistances
+from graphoire.component import findComponents
+from graphoire.tree import *
+
+def RunAllTreeTests():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestLeaves))
+    suite.addTest(unittest.makeSuite(TestRootedTree))
+    suite.addTest(unittest.makeSuite(TestTreeMetrics))
+
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+    
+def treetests_main():
+    unittest.main()
+    
+def slowAncestors(parent, v):
+    ancestors = [v]
+    while parent[v] >= 0:
+        v = parent[v]
+        ancestors.append(v)
+    return ancestors
+    
+class TestLeaves(unittest.TestCase):
+    
+    def testFindLeaves(self):
+        claw = GraphFactory.makeClaw()
+        self.assertEqual([0, 1, 2], findAllLeaves(claw))
+        self.assertEqual(0, findLeaf(claw))
+        self.assertEqual([], findAllLeaves(GraphFactory.makeCycle(5)))
+        self.assertEqual(-1, findLeaf(GraphFactory.makeCycle(5)))
+        
+class TestRootedTree(unittest.TestCase):
+    
+    def makeTree(self):
+        #        0
+        #      / | \\
+        #     1  2  3
+        #    / \\     \\
+        #   4   5     6
+        #       |
+        #       7
+        G = Graph(8)
+        for edge in [[0, 1], [0, 2], [0, 3], [1, 4], [1, 5], [3, 6], [5, 7]]:
+            G.addEdge(edge[0], edge[1])
+        return G
+    
+    def testFromGraph(self):
+        T = RootedTree.fromGraph(self.makeTree())
+        self.assertEqual([-1, 0, 0, 0, 1, 1, 3, 5], T.parent.tolist())
+        self.assertEqual([0, 1, 1, 1, 2, 2, 2, 3], T.depth.tolist())
+        self.assertEqual(3, T.height())
+        with self.assertRaises(Exception):
+            RootedTree.fromGraph(GraphFactory.makeCycle(4))
+            
+    def testQueries(self):
+        T = RootedTree.fromGraph(self.makeTree())
+        self.assertEqual(1, T.lowestCommonAncestor(4, 7))
+        self.assertEqual(0, T.lowestCommonAncestor(7, 6))
+        self.assertEqual(5, T.lowestCommonAncestor(5, 7))
+        self.assertEqual(2, T.lowestCommonAncestor(2, 2))
+        self.assertEqual(5, T.distance(7, 6))
+        self.assertEqual([7, 5, 1, 0, 3, 6], T.path(7, 6))
+        self.assertEqual(1, T.kthAncestor(7, 2))
+        self.assertEqual(7, T.kthAncestor(7, 0))
+        self.assertEqual(-1, T.kthAncestor(7, 4))
+        self.assertEqual(4, T.subtreeSize(1))
+        self.assertEqual(8, T.subtreeSize(0))
+        self.assertEqual([1, 2, 1], T.subtreeSize([4, 3, 2]).tolist())
+        
+    def testBatchAgainstBruteForce(self):
+        G = GraphFactory.makeRandomTree(60)
+        T = RootedTree.fromGraph(G, root=17)
+        rng = np.random.default_rng(3)
+        us = rng.integers(0, 60, size=200)
+        vs = rng.integers(0, 60, size=200)
+        lcas = T.lowestCommonAncestor(us, vs)
+        dists = T.distance(us, vs)
+        for i in range(0, len(us)):
+            au = slowAncestors(T.parent, us[i])
+            av = set(slowAncestors(T.parent, vs[i]))
+            expected = next(a for a in au if a in av)
+            self.assertEqual(expected, lcas[i])
+            self.assertEqual(bfsDistances(G, us[i])[vs[i]], dists[i])
+            
+        ks = rng.integers(0, 8, size=200)
+        ancestors = T.kthAncestor(us, ks)
+        for i in range(0, len(us)):
+            au = slowAncestors(T.parent, us[i])
+            self.assertEqual(au[ks[i]] if ks[i] < len(au) else -1, ancestors[i])
+            
+    def testFromParentArray(self):
+        T = RootedTree.fromGraph(self.makeTree(), root=5)
+        T2 = RootedTree.fromParentArray(T.parent)
+        self.assertEqual(5, T2.root)
+        self.assertEqual(T.depth.tolist(), T2.depth.tolist())
+        self.assertEqual(self.makeTree().edges, T2.toGraph().edges)
+        with self.assertRaises(Exception):
+            RootedTree.fromParentArray([-1, -1, 0])
+        
+        
+class TestTreeMetrics(unittest.TestCase):
+    
+    def testPaths(self):
+        P7 = GraphFactory.makePath(7)
+        self.assertEqual(6, treeDiameter(P7))
+        self.assertEqual(3, treeRadius(P7))
+        self.assertEqual([3], treeCenter(P7))
+        self.assertEqual([3], treeCentroid(P7))
+        self.assertEqual([6, 5, 4, 3, 4, 5, 6], treeEccentricities(P7).tolist())
+        self.assertEqual([6, 5, 4, 3, 2, 1, 0], treeDiameterPath(P7))
+        
+        P6 = GraphFactory.makePath(6)
+        self.assertEqual([2, 3], treeCenter(P6))
+        self.assertEqual([2, 3], treeCentroid(P6))
+        self.assertEqual(3, treeRadius(P6))
+        
+        self.assertEqual([0], treeCenter(Graph(1)))
+        with self.assertRaises(Exception):
+            treeCenter(GraphFactory.makeCycle(5))
+            
+    def testCenterAndCentroidDiffer(self):
+        # a long path 0-1-2-3-4 with a broom of leaves on vertex 4
+        G = Graph(11)
+        for v in range(0, 4):
+            G.addEdge(v, v + 1)
+        for leaf in range(5, 11):
+            G.addEdge(4, leaf)
+        self.assertEqual([2, 3], treeCenter(G))
+        self.assertEqual([4], treeCentroid(G))
+        self.assertEqual(5, treeDiameter(G))
+        
+    def testForestAgainstBruteForce(self):
+        forest = Graph(0)
+        for size in [1, 2, 9, 14, 5]:
+            tree = GraphFactory.makeRandomTree(size) if size > 1 else Graph(1)
+            offset = forest.n
+            forest.n += size
+            for edge in tree.edges:
+                forest.edges.append([edge[0] + offset, edge[1] + offset])
+        forest.clearCaches()
+        
+        metrics = findTreeMetrics(forest)
+        self.assertEqual(5, metrics.treeCount())
+        for tree, component in enumerate(findComponents(forest)):
+            eccs = [int(bfsDistances(forest, v).max()) for v in component]
+            self.assertEqual(eccs, metrics.eccentricity[component].tolist())
+            self.assertEqual(max(eccs), metrics.diameter[tree])
+            self.assertEqual(min(eccs), metrics.radius[tree])
+            self.assertEqual([v for v in component if bfsDistances(forest, v).max() == min(eccs)], metrics.centers(tree))
+            path = metrics.diameterPath(tree)
+            self.assertEqual(max(eccs) + 1, len(path))
+            
+            centroids = []
+            for v in component:
+                H = copy.deepcopy(forest)
+                H.deleteVertex(v)
+                shifted = [w - 1 if w > v else w for w in component if w != v]
+                parts = [len(set(c) & set(shifted)) for c in findComponents(H)]
+                if 2 * max(parts + [0]) <= len(component):
+                    centroids.append(v)
+            self.assertEqual(centroids, metrics.centroids(tree))
+        
+        
+if __name__ == "__main__":
+    treetests_main()